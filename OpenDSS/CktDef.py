@@ -38,6 +38,10 @@ class CKTProperty(Enum):
     PA = 7
     PB = 8
     PC = 9
+
+class CKTSolveMode(Enum):
+    SNAP = 0
+    DUTY = 6
     
     
     
\ No newline at end of file
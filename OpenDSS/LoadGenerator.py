@@ -47,6 +47,10 @@ class LoadGenerator(object):
         Sine frequency
     _PhaseShift : float
         Sine phase shift
+    _homeNode : numpy array
+        node index (node with load file order) of each home
+    _loadMat : dict
+        load profile files already read, key(test flag)
 
     '''
     
@@ -68,6 +72,8 @@ class LoadGenerator(object):
         self._nodewithload     = None
         self._nNodes           = 0
         self._time             = 0
+        self._homeNode         = None
+        self._loadMat          = {}
         
         self._PFLimInf = PFLimInf
         self._PFLimSup = PFLimSup
@@ -156,16 +162,50 @@ class LoadGenerator(object):
     #- Public Methods -#
     #------------------#
 
-    def createLoads(self):
+    def reset(self, seed=1):
         '''
-        Generate loads for a list of nodes with true power 
-        random uniform distribution and power factor also a 
-        random uniform distribution
+        Restart the load sequence and seed the random generator, so the
+        same seed always generates the same sequence of loads
+
+        The loads come from the global numpy random state (np.random), so
+        reset also reseeds it for all the other users of np.random in the
+        process. This is harmless in the SimDSSPool workers, which only run
+        the generator, but in the main process it changes the random
+        sequence seen by the rest of the program
+        
+        Parameters
+        ----------
+        seed : int
+            Seed of the numpy random generator
+        '''
+        
+        self._time = 0
+        np.random.seed(seed)
+
+    def getNodeNames(self):
+        '''
+        Get the node order of the load vectors of createLoadVector, the
+        order of the node with load file
         
         Returns
         -------
-        loads : numpy array [node_name, P(true power), Q(reactive power)]
-                It returns a list of tuples of 'node name', P and Q
+        nodeNames : list
+        '''
+        
+        return [self._nodewithload[j][0] for j in range(len(self._nodewithload))]
+
+    def createLoadVector(self):
+        '''
+        Generate loads for the nodes with true power random uniform
+        distribution and power factor also a random uniform distribution,
+        as arrays aligned to getNodeNames
+        
+        Returns
+        -------
+        P : numpy array
+            true power of each node
+        Q : numpy array
+            reactive power of each node
         '''
     
         #-- create artificial samples of random uniform distribution with sinusoidal aspect    
@@ -177,26 +217,72 @@ class LoadGenerator(object):
         sPF    = np.random.uniform(self._PFLimInf,   self._PFLimSup,   self._totalNumberHomes)       
         sLoadQ = np.sqrt(1/(sPF*sPF)-1)*sLoadP
         
-        #-- create collection to return
-        loadsPQ = []
+        #-- add the homes of each node, in the order of the homes
+        if self._homeNode is None:
+            nHomes = [int(self._nodewithload[j][1]) for j in range(len(self._nodewithload))]
+            self._homeNode = np.repeat(np.arange(len(nHomes)), nHomes)
+        P = np.bincount(self._homeNode, weights=sLoadP, minlength=len(self._nodewithload))
+        Q = np.bincount(self._homeNode, weights=sLoadQ, minlength=len(self._nodewithload))
         
-        i = 0
-        for j in range(len(self._nodewithload)):
-            #-- clean variable for new node load
-            ndLoad = [self._nodewithload[j][0], 0, 0]
-            for k in range(int(self._nodewithload[j][1])):
-                #-- add true power
-                ndLoad[1] +=  sLoadP[i]
-                #-- add reactive power
-                ndLoad[2] += sLoadQ[i]
-                i += 1
-                k += 1
-            #-- append to the list to return
-            loadsPQ.append((ndLoad[0], ndLoad[1], ndLoad[2]))
+        return P, Q
+
+    def skipLoadVectors(self, n):
+        '''
+        Skip n samples of createLoadVector: the time and the random generator
+        advance as if createLoadVector was called n times, so the next sample
+        is the same, without generating the loads of the skipped ones
         
-        return loadsPQ
+        Parameters
+        ----------
+        n : int
+            Number of samples to skip
+        '''
+        
+        #-- each sample takes one uniform value for P and one for PF per home
+        remaining = 2 * int(n) * self._totalNumberHomes
+        while remaining > 0:
+            chunk = min(remaining, 1 << 20)
+            np.random.random_sample(chunk)
+            remaining -= chunk
+        self._time += int(n)
 
-    def readLoads(self, test):
+    def createLoads(self):
+        '''
+        Generate loads for a list of nodes with true power 
+        random uniform distribution and power factor also a 
+        random uniform distribution
+        
+        Returns
+        -------
+        loads : numpy array [node_name, P(true power), Q(reactive power)]
+                It returns a list of tuples of 'node name', P and Q
+        '''
+        
+        P, Q = self.createLoadVector()
+        
+        #-- create collection to return
+        return list(zip(self.getNodeNames(), P.tolist(), Q.tolist()))
+
+    def _readLoadMat(self, test):
+        '''
+        Read the load profile file
+        
+        Parameters
+        ----------
+        test : bool
+            True for the test version configuration
+        
+        Returns
+        -------
+        loadNode : numpy array
+            name of the nodes
+        p : numpy array
+            P per node (rows) and step (columns)
+        q : numpy array
+            Q per node (rows) and step (columns)
+        '''
+        if test in self._loadMat:
+            return self._loadMat[test]
         #For testing version configuration
         if(test):
             mat = spio.loadmat('config/loadHour933.mat', squeeze_me=True)
@@ -216,13 +302,72 @@ class LoadGenerator(object):
         # There are 1320 load values per node
         # print("Load Generator: P node 1 load size:", len(p[0]))
         # print("Load Generator: Q node 1 load size:", len(q[0]))
-        loadNode = mat['loadNode']
+        self._loadMat[test] = (mat['loadNode'], p, q)
+        return self._loadMat[test]
+
+    def readLoads(self, test):
+        loadNode, p, q = self._readLoadMat(test)
         loadsPQ = []
         for row in range(0, len(p[:, 0])):
             loadsPQ.append((str(loadNode[row]), p[row, self._time], q[row, self._time]))
         self._time += 1
         return loadsPQ
 
+    def readLoadVector(self, test):
+        '''
+        Read the loads of the next step of the load profile, as arrays
+        aligned to the nodeNames of readLoadProfiles
+        
+        Parameters
+        ----------
+        test : bool
+            True for the test version configuration
+        
+        Returns
+        -------
+        P : numpy array
+            P of each node
+        Q : numpy array
+            Q of each node
+        '''
+        loadNode, p, q = self._readLoadMat(test)
+        P, Q = p[:, self._time].astype(np.float64), q[:, self._time].astype(np.float64)
+        self._time += 1
+        return P, Q
+
+    def skipLoadProfile(self, n):
+        '''
+        Skip n steps of the load profile of readLoadVector
+        
+        Parameters
+        ----------
+        n : int
+            Number of steps to skip
+        '''
+        self._time += int(n)
+
+    def readLoadProfiles(self, test):
+        '''
+        Read the whole load profile at once, in the format of SimDSS.setLoadShapes
+        
+        Parameters
+        ----------
+        test : bool
+            True for the test version configuration
+        
+        Returns
+        -------
+        nodeNames : list
+            name of the nodes
+        P : numpy array
+            P per node (rows) and step (columns)
+        Q : numpy array
+            Q per node (rows) and step (columns)
+        '''
+        loadNode, p, q = self._readLoadMat(test)
+        nodeNames = [str(loadNode[row]) for row in range(len(p[:, 0]))]
+        return nodeNames, p, q
+
 
 if __name__ == '__main__':
     print('LoadGenerator class file')
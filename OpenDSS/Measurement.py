@@ -0,0 +1,167 @@
+'''
+ # Compact measurement records of the sensor models
+'''
+
+import base64
+import math
+import struct
+
+
+class Measurement(object):
+
+    '''
+    One sample of a Sensor, Phasor or Smartmeter
+
+    The record has a fixed binary layout, sent between the simulators as an
+    ASCII string (prefix + base64), so it goes unchanged through the mosaik
+    JSON messages and the NS-3 transporters
+
+    Layout (little endian)
+    ----------------------
+    version u1, kind u1, phase mask u1, idt length u2, ts f8, idt (utf-8),
+    then for each phase in the mask (A, B, C) the values of the kind:
+        Phasor     : vmag, vang, imag, iang
+        Smartmeter : vmag, sp
+        Sensor     : vmag
+
+    Attributes
+    ----------
+    idt            : str
+        id of the sensor
+    kind           : str
+        'Phasor', 'Smartmeter' or 'Sensor'
+    mask           : int
+        phases measured, bit 0 for A, bit 1 for B, bit 2 for C
+    ts             : float
+        time of the sample
+    vmag, vang     : tuple
+        voltage magnitude and angle of the phases A, B and C, nan for the
+        phases not measured, vang None if not measured by the kind
+    imag, iang     : tuple
+        current magnitude and angle (Phasor), None for the other kinds
+    sp             : tuple
+        real power (Smartmeter), None for the other kinds
+    '''
+
+    __slots__ = ('idt', 'kind', 'mask', 'ts', 'vmag', 'vang', 'imag', 'iang', 'sp')
+
+    VERSION = 1
+    PREFIX  = 'M1:'
+    KINDS   = ('Phasor', 'Smartmeter', 'Sensor')
+    _FIELDS = {'Phasor'     : ('vmag', 'vang', 'imag', 'iang'),
+               'Smartmeter' : ('vmag', 'sp'),
+               'Sensor'     : ('vmag',)}
+    _HEADER = struct.Struct('<BBBHd')
+
+
+    def __init__(self, idt, kind, mask, ts, vmag, vang=None, imag=None, iang=None, sp=None):
+        if kind not in self.KINDS:
+            raise Exception('Unknown measurement kind: {}'.format(kind))
+        self.idt  = idt
+        self.kind = kind
+        self.mask = int(mask)
+        self.ts   = ts
+        self.vmag = vmag
+        self.vang = vang
+        self.imag = imag
+        self.iang = iang
+        self.sp   = sp
+
+
+    def __repr__(self):
+        values = ', '.join('{}={}'.format(name, getattr(self, name)) for name in self._FIELDS[self.kind])
+        return 'Measurement({}, {}, ts={}, {})'.format(self.idt, self.kind, self.ts, values)
+
+
+    def phases(self):
+        '''
+        Get the phases measured
+
+        Returns
+        -------
+        phases : list
+            Indexes of the phases, 0 for A, 1 for B, 2 for C
+        '''
+        return [j for j in range(3) if self.mask & (1 << j)]
+
+
+    def scalar(self):
+        '''
+        Get the voltage magnitude of the first phase measured, the value of
+        a Sensor
+
+        Returns
+        -------
+        vmag : float
+        '''
+        return self.vmag[self.phases()[0]]
+
+
+    def encode(self):
+        '''
+        Encode the record for the simulator messages
+
+        Returns
+        -------
+        msg : str
+            PREFIX followed by the base64 of the binary layout
+        '''
+        idt = self.idt.encode('utf-8')
+        fields = [getattr(self, name) for name in self._FIELDS[self.kind]]
+        values = [float(field[j]) for j in self.phases() for field in fields]
+        data = self._HEADER.pack(self.VERSION, self.KINDS.index(self.kind), self.mask, len(idt), self.ts) \
+               + idt + struct.pack('<{}d'.format(len(values)), *values)
+
+        return self.PREFIX + base64.b64encode(data).decode('ascii')
+
+
+    @classmethod
+    def isEncoded(cls, msg):
+        '''
+        Check if a message is an encoded record. The message may be quoted,
+        as it is after an NS-3 transporter
+        '''
+        return isinstance(msg, str) and msg.strip().strip('"').startswith(cls.PREFIX)
+
+
+    @classmethod
+    def decode(cls, msg):
+        '''
+        Decode a record encoded by encode
+
+        Parameters
+        ----------
+        msg : str
+            Encoded record, possibly quoted
+
+        Returns
+        -------
+        record : Measurement
+        '''
+        msg = msg.strip().strip('"')
+        if not msg.startswith(cls.PREFIX):
+            raise Exception('Not a measurement record: {}'.format(msg[:20]))
+        data = base64.b64decode(msg[len(cls.PREFIX):])
+        (version, kind, mask, nIdt, ts) = cls._HEADER.unpack_from(data)
+        if version != cls.VERSION:
+            raise Exception('Unknown measurement record version: {}'.format(version))
+        kind = cls.KINDS[kind]
+        pos = cls._HEADER.size
+        idt = data[pos:pos + nIdt].decode('utf-8')
+        pos += nIdt
+
+        record = cls(idt, kind, mask, ts, None)
+        names = cls._FIELDS[kind]
+        phases = record.phases()
+        values = struct.unpack_from('<{}d'.format(len(phases) * len(names)), data, pos)
+        for (f, name) in enumerate(names):
+            field = [math.nan] * 3
+            for (k, j) in enumerate(phases):
+                field[j] = values[k * len(names) + f]
+            setattr(record, name, tuple(field))
+
+        return record
+
+
+if __name__ == '__main__':
+    print('Measurement class file')
@@ -14,6 +14,7 @@ smartmeter, prober
 import numpy as np
 import random
 from CktDef import CKTTerm, CKTPhase
+from SensorNoise import NoiseStream
 
 class Sensor:
     def __init__(self, 
@@ -22,7 +23,8 @@ class Sensor:
                  objDSS,  
                  cktElement, 
                  error, 
-                 verbose):
+                 verbose,
+                 seed = 0):
         self.idt        = idt
         self.step_size  = int(step_size)
         self.objDSS     = objDSS
@@ -33,6 +35,8 @@ class Sensor:
         self.priorTime  = None
         self.time_diff_resolution = 1e-9
         self.randomTime = random.randint(0, 1)
+        #--- own noise stream: reproducible for a seed and independent of the other sensors
+        self.noise      = NoiseStream(idt, self.error, seed)
         
     def getLastValue(self):
         if(self.priorValue != None):
@@ -43,10 +47,7 @@ class Sensor:
         return np.abs(x), np.angle(x)
     
     def addNoise(self, x):
-        noiseReal = np.random.normal(0, self.error, 1)
-        noiseImag = np.random.normal(0, self.error, 1)
-        noise = complex(noiseReal, noiseImag)
-        return x + noise
+        return self.noise.addNoise(x)
     
 
 class Phasor(Sensor):
@@ -58,9 +59,10 @@ class Phasor(Sensor):
                  objDSS,  
                  cktElement, 
                  error,
-                 verbose):
+                 verbose,
+                 seed = 0):
         
-        super().__init__(idt, step_size, objDSS, cktElement, error, verbose)
+        super().__init__(idt, step_size, objDSS, cktElement, error, verbose, seed)
         self.cktTerminal = cktTerminal
         self.cktPhase = cktPhase
         
@@ -88,13 +90,15 @@ class Phasor(Sensor):
             elif (self.cktPhase == 'PHASE_123'):
                 phases = ['PHASE_1', 'PHASE_2', 'PHASE_3']
 
-            for ph in phases:
-                (VComp, IComp, _) = self.objDSS.getCktElementState(self.cktElement, 
-                                                     CKTTerm[self.cktTerminal].value, 
-                                                     CKTPhase[ph].value)
+            #--- noise of all the phases drawn at once: V of each phase, then I
+            state = [self.objDSS.getCktElementState(self.cktElement, 
+                                                    CKTTerm[self.cktTerminal].value, 
+                                                    CKTPhase[ph].value) for ph in phases]
+            VI = self.addNoise([s[0] for s in state] + [s[1] for s in state])
 
-                VComp = self.addNoise(VComp)
-                IComp = self.addNoise(IComp)
+            for (k, ph) in enumerate(phases):
+                VComp = VI[k]
+                IComp = VI[len(phases) + k]
                 (VMag, VAng) = self.R2P(VComp)
                 (IMag, IAng) = self.R2P(IComp)
                 
@@ -127,9 +131,10 @@ class Smartmeter(Sensor):
                  objDSS,  
                  cktElement, 
                  error, 
-                 verbose):
+                 verbose,
+                 seed = 0):
         
-        super().__init__(idt, step_size, objDSS, cktElement, error, verbose)
+        super().__init__(idt, step_size, objDSS, cktElement, error, verbose, seed)
         self.cktTerminal = cktTerminal
         self.cktPhase    = cktPhase
         
@@ -159,13 +164,15 @@ class Smartmeter(Sensor):
             elif (self.cktPhase == 'PHASE_123'):
                 phases = ['PHASE_1', 'PHASE_2', 'PHASE_3']
 
-            for ph in phases:
-                (VComp, IComp, _) = self.objDSS.getCktElementState(self.cktElement,                               
-                                                     CKTTerm[self.cktTerminal].value, 
-                                                     CKTPhase[ph].value)
-                
-                VComp = self.addNoise(VComp)
-                IComp = self.addNoise(IComp)                
+            #--- noise of all the phases drawn at once: V of each phase, then I
+            state = [self.objDSS.getCktElementState(self.cktElement, 
+                                                    CKTTerm[self.cktTerminal].value, 
+                                                    CKTPhase[ph].value) for ph in phases]
+            VI = self.addNoise([s[0] for s in state] + [s[1] for s in state])
+
+            for (k, ph) in enumerate(phases):
+                VComp = VI[k]
+                IComp = VI[len(phases) + k]
                 (VMag, _) = self.R2P(VComp)
                 SP = (VComp * np.conj(-IComp)).real
                 
@@ -200,9 +207,10 @@ class Prober(Sensor):
                  objDSS,  
                  cktElement, 
                  error, 
-                 verbose):
+                 verbose,
+                 seed = 0):
         
-        super().__init__(idt, step_size, objDSS, cktElement, error, verbose)
+        super().__init__(idt, step_size, objDSS, cktElement, error, verbose, seed)
         self.cktTerminal = cktTerminal
         self.cktPhase    = cktPhase
         self.cktProperty = cktProperty
@@ -218,9 +226,7 @@ class Prober(Sensor):
             (VComp, IComp, PComp) = self.objDSS.getCktElementState(self.cktElement, 
                                                      CKTTerm[self.cktTerminal].value, 
                                                      CKTPhase[self.cktPhase].value)
-            VComp = self.addNoise(VComp)
-            IComp = self.addNoise(IComp)
-            PComp = self.addNoise(PComp)
+            (VComp, IComp, PComp) = self.addNoise([VComp, IComp, PComp])
             if ((self.cktProperty == 'V')):
                 val['V'] = self.R2P(VComp)
             elif  ((self.cktProperty == 'I')):
@@ -0,0 +1,445 @@
+'''
+ # Array backed collections of the sensors sampled from the SimDSS snapshot
+'''
+
+import heapq
+import numpy as np
+from CktDef import CKTTerm
+from SensorNoise import NoiseStream
+from Measurement import Measurement
+
+
+class SamplingWheel(object):
+
+    '''
+    Sampling schedule of items with fixed periods. The items are grouped in
+    buckets by (period, offset), and a heap keeps the next due time of each
+    bucket, so a step only touches the items due at that time and the next
+    sampling time is the top of the heap
+
+    Attributes
+    ----------
+    _buckets       : dict
+        items of each (period, offset)
+    _heap          : list
+        (next due time, period, offset) of each bucket
+    _lastTime      : int
+        time of the last advance
+    _lastDue       : list
+        items due at _lastTime
+    '''
+
+
+    def __init__(self):
+        self._buckets  = {}
+        self._heap     = []
+        self._lastTime = None
+        self._lastDue  = []
+
+
+    def add(self, item, period, offset=0):
+        '''
+        Add an item sampled at the times t with (t - offset) % period == 0
+
+        Parameters
+        ----------
+        item : object
+            Item to be returned by advance when it is due
+        period : int
+            Sampling period
+        offset : int
+            Sampling phase offset
+        '''
+        key = (int(period), int(offset) % int(period))
+        if key not in self._buckets:
+            self._buckets[key] = []
+            heapq.heappush(self._heap, (key[1], key[0], key[1]))
+        self._buckets[key].append(item)
+
+
+    def advance(self, time):
+        '''
+        Advance the schedule to time. A second call at the same time returns
+        the same items
+
+        Parameters
+        ----------
+        time : int
+            Current time
+
+        Returns
+        -------
+        due : list
+            Items due at time
+        '''
+        if time == self._lastTime:
+            return self._lastDue
+        due = []
+        while self._heap and self._heap[0][0] <= time:
+            (_, period, offset) = heapq.heappop(self._heap)
+            phase = (time - offset) % period
+            if phase == 0:
+                due.extend(self._buckets[(period, offset)])
+            heapq.heappush(self._heap, (time + period - phase, period, offset))
+        self._lastTime = time
+        self._lastDue  = due
+
+        return due
+
+
+    def next(self):
+        '''
+        Get the next sampling time
+
+        Returns
+        -------
+        time : int
+            Earliest due time after the last advance, None if there are no items
+        '''
+        return self._heap[0][0] if self._heap else None
+
+
+class SensorBank(object):
+
+    '''
+    All the sensors of one model type, kept as parallel numpy arrays and
+    sampled from the SimDSS snapshot with one vectorized pass per step
+
+    Models
+    ------
+    Phasor     : V and I phasors (magnitude, angle) of each phase
+    Smartmeter : V magnitude and real power of each phase
+    Sensor     : V magnitude of one phase, without noise
+
+    Each sensor has up to three phases. The noise of a sensor comes from its
+    own NoiseStream, so the values are the ones of a sensor sampled alone.
+    The streams are read _noiseWidth values at a time into a per-sensor row
+    of _noise, and a sample takes the values of all the due sensors at once
+
+    Attributes
+    ----------
+    _model         : str
+        model type of the sensors
+    _objDSS        : SimDSS
+        circuit sampled by the sensors
+    _seed          : int
+        seed of the noise streams
+    _eids          : list
+        eid of each sensor
+    _rows          : dict
+        row of each eid
+    _pending       : list
+        sensors added and not yet in the arrays
+    _wheel         : SamplingWheel
+        sampling schedule of the rows
+    _probes        : numpy array (nSensors x 3)
+        snapshot probe of each phase, 0 for the phases not measured
+    _mask          : numpy array (nSensors x 3)
+        phases measured by each sensor
+    _noiseCol      : numpy array (nSensors x 6)
+        position of the V and I noise of each phase in a sample
+    _nNoise        : numpy array
+        noise values taken by each sample of a sensor
+    _period        : numpy array
+        sampling period of each sensor
+    _error         : numpy array
+        noise standard deviation of each sensor
+    _streams       : list
+        noise stream of each sensor, None without noise
+    _noise         : numpy array (nSensors x _noiseWidth)
+        noise read from the streams
+    _noisePos      : numpy array
+        next unused position in each row of _noise
+    _VMag, _VAng   : numpy array (nSensors x 3)
+        last voltage magnitude and angle of each phase
+    _IMag, _IAng   : numpy array (nSensors x 3)
+        last current magnitude and angle of each phase (Phasor)
+    _SP            : numpy array (nSensors x 3)
+        last real power of each phase (Smartmeter)
+    _time          : numpy array
+        time of the last value of each sensor, nan before the first sample
+    '''
+
+    #-- multiple of the noise values of a sample (2, 4 or 6)
+    _noiseWidth = 60
+    time_diff_resolution = 1e-9
+
+
+    def __init__(self, model, objDSS, seed=0):
+        '''
+        Create an empty bank
+
+        Parameters
+        ----------
+        model : str
+            'Phasor', 'Smartmeter' or 'Sensor'
+        objDSS : SimDSS
+            Circuit sampled by the sensors
+        seed : int
+            Seed of the noise streams
+        '''
+
+        if model not in ('Phasor', 'Smartmeter', 'Sensor'):
+            raise Exception('Unknown sensor model: {}'.format(model))
+        self._model   = model
+        self._objDSS  = objDSS
+        self._seed    = seed
+        self._eids    = []
+        self._rows    = {}
+        self._pending = []
+        self._wheel   = SamplingWheel()
+        self._streams = []
+
+        self._probes   = np.zeros((0, 3), dtype=np.intp)
+        self._mask     = np.zeros((0, 3), dtype=bool)
+        self._noiseCol = np.zeros((0, 6), dtype=np.intp)
+        self._nNoise   = np.zeros(0, dtype=np.intp)
+        self._period   = np.zeros(0, dtype=np.int64)
+        self._error    = np.zeros(0)
+        self._noise    = np.zeros((0, self._noiseWidth), dtype=np.complex128)
+        self._noisePos = np.zeros(0, dtype=np.intp)
+        self._VMag     = np.zeros((0, 3))
+        self._VAng     = np.zeros((0, 3))
+        self._IMag     = np.zeros((0, 3))
+        self._IAng     = np.zeros((0, 3))
+        self._SP       = np.zeros((0, 3))
+        self._time     = np.zeros(0)
+
+
+    #-------------------#
+    #- Private Methods -#
+    #-------------------#
+
+    def _build(self):
+        '''
+        Append the pending sensors to the arrays
+        '''
+        n = len(self._pending)
+        probes   = np.zeros((n, 3), dtype=np.intp)
+        mask     = np.zeros((n, 3), dtype=bool)
+        noiseCol = np.zeros((n, 6), dtype=np.intp)
+        for (k, (phases, probeIdx, period, error)) in enumerate(self._pending):
+            #-- noise of a sample: V of each phase, then I of each phase
+            for (rank, (ph, probe)) in enumerate(zip(phases, probeIdx)):
+                probes[k, ph - 1]       = probe
+                mask[k, ph - 1]         = True
+                noiseCol[k, ph - 1]     = rank
+                noiseCol[k, ph - 1 + 3] = len(phases) + rank
+        period = np.array([p[2] for p in self._pending], dtype=np.int64)
+        error  = np.array([p[3] for p in self._pending], dtype=np.float64)
+
+        self._probes   = np.concatenate((self._probes, probes))
+        self._mask     = np.concatenate((self._mask, mask))
+        self._noiseCol = np.concatenate((self._noiseCol, noiseCol))
+        self._nNoise   = np.concatenate((self._nNoise, 2 * mask.sum(axis=1)))
+        self._period   = np.concatenate((self._period, period))
+        self._error    = np.concatenate((self._error, error))
+        self._noise    = np.concatenate((self._noise, np.zeros((n, self._noiseWidth), dtype=np.complex128)))
+        #-- the rows are read from the streams on their first sample
+        self._noisePos = np.concatenate((self._noisePos, np.full(n, self._noiseWidth, dtype=np.intp)))
+        for name in ('_VMag', '_VAng', '_IMag', '_IAng', '_SP'):
+            setattr(self, name, np.concatenate((getattr(self, name), np.zeros((n, 3)))))
+        self._time     = np.concatenate((self._time, np.full(n, np.nan)))
+        self._pending  = []
+
+
+    def _nextNoise(self, rows):
+        '''
+        Take the noise of one sample of each row
+
+        Parameters
+        ----------
+        rows : numpy array
+            Rows of the sensors sampled
+
+        Returns
+        -------
+        noise : numpy array (len(rows) x 6)
+            Noise of V and I of each phase
+        '''
+        nNoise = self._nNoise[rows]
+        for r in rows[self._noisePos[rows] + nNoise > self._noiseWidth]:
+            if self._streams[r] is not None:
+                self._noise[r] = self._streams[r].next(self._noiseWidth)
+            self._noisePos[r] = 0
+        pos = self._noisePos[rows]
+        noise = self._noise[rows[:, None], pos[:, None] + self._noiseCol[rows]]
+        self._noisePos[rows] = pos + nNoise
+
+        return noise
+
+
+    #------------------#
+    #- Public Methods -#
+    #------------------#
+
+    def add(self, eid, cktTerminal, cktPhase, step_size, cktElement, error):
+        '''
+        Add a sensor to the bank
+
+        Parameters
+        ----------
+        eid : str
+            Id of the sensor
+        cktTerminal : str
+            'BUS1' or 'BUS2'
+        cktPhase : str
+            Phases measured, 'PHASE_1' to 'PHASE_123'
+        step_size : int
+            Sampling period
+        cktElement : str
+            Circuit element measured
+        error : float
+            Noise standard deviation, not used by Sensor
+
+        Returns
+        -------
+        row : int
+            Row of the sensor in the bank
+        '''
+
+        if eid in self._rows:
+            raise Exception('Sensor already in the bank: {}'.format(eid))
+        phases = [int(ph) for ph in cktPhase.split('_')[1]]
+        probeIdx = [self._objDSS.addProbe(cktElement, CKTTerm[cktTerminal].value, ph)
+                    for ph in phases]
+        error = 0.0 if self._model == 'Sensor' else float(error)
+
+        row = len(self._eids)
+        self._eids.append(eid)
+        self._rows[eid] = row
+        self._pending.append((phases, probeIdx, int(step_size), error))
+        self._streams.append(NoiseStream(eid, error, self._seed, blockSize=self._noiseWidth)
+                             if error != 0 else None)
+        self._wheel.add(row, int(step_size))
+
+        return row
+
+
+    def getEids(self, rows):
+        '''
+        Get the eids of a list of rows
+
+        Returns
+        -------
+        eids : list
+        '''
+
+        return [self._eids[r] for r in rows]
+
+
+    def step(self, time):
+        '''
+        Sample the sensors due at time
+
+        Parameters
+        ----------
+        time : int
+            Current time
+
+        Returns
+        -------
+        rows : list
+            Rows of the sensors sampled
+        '''
+
+        rows = self._wheel.advance(time)
+        self.sample(time, rows)
+
+        return rows
+
+
+    def next(self):
+        '''
+        Get the next sampling time of the bank
+
+        Returns
+        -------
+        time : int
+            None for an empty bank
+        '''
+
+        return self._wheel.next()
+
+
+    def sample(self, time, rows):
+        '''
+        Sample a set of sensors from the snapshot of the circuit
+
+        Parameters
+        ----------
+        time : int
+            Current time
+        rows : list
+            Rows of the sensors to sample
+        '''
+
+        if self._pending:
+            self._build()
+        rows = np.asarray(rows, dtype=np.intp)
+        if len(rows) == 0:
+            return
+
+        (V, I, _) = self._objDSS.getSnapshot()
+        probes = self._probes[rows]
+        VComp = V[probes]
+        IComp = I[probes]
+        if self._model != 'Sensor':
+            noise = self._nextNoise(rows)
+            VComp = VComp + noise[:, :3]
+            IComp = IComp + noise[:, 3:]
+
+        self._VMag[rows] = np.abs(VComp)
+        if self._model == 'Phasor':
+            self._VAng[rows] = np.angle(VComp)
+            self._IMag[rows] = np.abs(IComp)
+            self._IAng[rows] = np.angle(IComp)
+        elif self._model == 'Smartmeter':
+            #-- real part of V * conj(-I), in the operation order of the scalar product
+            self._SP[rows] = VComp.real * -IComp.real - VComp.imag * IComp.imag
+        self._time[rows] = time + self.time_diff_resolution
+
+
+    def getLastValue(self, eid):
+        '''
+        Get the last value of a sensor
+
+        Parameters
+        ----------
+        eid : str
+            Id of the sensor
+
+        Returns
+        -------
+        value : Measurement
+            Last sample of the sensor, None before the first sample
+        time : float
+            Time of the value, None before the first sample
+        '''
+
+        row = self._rows[eid]
+        if self._pending and row >= len(self._time):
+            return None, None
+        ts = float(self._time[row])
+        if np.isnan(ts):
+            return None, None
+
+        mask = self._mask[row]
+        bits = int(mask[0]) | int(mask[1]) << 1 | int(mask[2]) << 2
+        vmag = tuple(np.where(mask, self._VMag[row], np.nan).tolist())
+        if self._model == 'Phasor':
+            value = Measurement(eid, self._model, bits, ts, vmag,
+                                vang=tuple(np.where(mask, self._VAng[row], np.nan).tolist()),
+                                imag=tuple(np.where(mask, self._IMag[row], np.nan).tolist()),
+                                iang=tuple(np.where(mask, self._IAng[row], np.nan).tolist()))
+        elif self._model == 'Smartmeter':
+            value = Measurement(eid, self._model, bits, ts, vmag,
+                                sp=tuple(np.where(mask, self._SP[row], np.nan).tolist()))
+        else:
+            value = Measurement(eid, self._model, bits, ts, vmag)
+
+        return value, ts
+
+
+if __name__ == '__main__':
+    print('SensorBank class file')
@@ -0,0 +1,114 @@
+'''
+ # Reproducible measurement noise streams for the sensor models
+'''
+
+import hashlib
+import numpy as np
+
+
+class NoiseStream(object):
+
+    '''
+    Complex gaussian measurement noise of one sensor
+
+    Each sensor has its own numpy Generator, seeded from the run seed and
+    the sensor id, so the noise of a sensor does not depend on the other
+    sensors of the run nor on the order they were created. The noise is
+    drawn in blocks with one vectorized call, and each sample takes the
+    values it needs from the block
+
+    Attributes
+    ----------
+    _error         : float
+        standard deviation of the real and of the imaginary part of the noise
+    _rng           : numpy Generator
+        random generator of the sensor
+    _blockSize     : int
+        number of complex values drawn at once
+    _block         : numpy array
+        complex noise values drawn and not yet used from _pos on
+    _pos           : int
+        position of the next unused value in _block
+    '''
+
+
+    def __init__(self, idt, error, seed=0, blockSize=1024):
+        '''
+        Create the random generator of the sensor
+
+        Parameters
+        ----------
+        idt : str
+            Id of the sensor, key of its stream
+        error : float
+            Standard deviation of the real and of the imaginary part of the noise
+        seed : int
+            Seed of the run
+        blockSize : int
+            Number of complex values drawn at once
+        '''
+
+        key = int.from_bytes(hashlib.sha256(str(idt).encode()).digest()[:8], 'little')
+        self._error     = float(error)
+        self._rng       = np.random.default_rng(np.random.SeedSequence([int(seed), key]))
+        self._blockSize = max(1, int(blockSize))
+        self._block     = np.zeros(0, dtype=np.complex128)
+        self._pos       = 0
+
+
+    def next(self, n=1):
+        '''
+        Get the noise of the next n values of the sensor
+
+        Parameters
+        ----------
+        n : int
+            Number of complex values
+
+        Returns
+        -------
+        noise : numpy array
+            n complex noise values
+        '''
+
+        if self._error == 0:
+            return np.zeros(n, dtype=np.complex128)
+        if self._pos + n > len(self._block):
+            #-- the values left are kept, so the stream does not depend on how it is read
+            size = max(self._blockSize, n)
+            block = self._error * self._rng.standard_normal(2 * size).view(np.complex128)
+            self._block = np.concatenate((self._block[self._pos:], block))
+            self._pos = 0
+        noise = self._block[self._pos:self._pos + n]
+        self._pos += n
+        if self._pos == len(self._block):
+            #-- do not keep a used block alive
+            self._block = np.zeros(0, dtype=np.complex128)
+            self._pos = 0
+
+        return noise
+
+
+    def addNoise(self, x):
+        '''
+        Add noise to a value or to an array of values of the sensor
+
+        Parameters
+        ----------
+        x : complex or numpy array
+            Values measured by the sensor
+
+        Returns
+        -------
+        complex or numpy array
+            Values with noise, with the shape of x
+        '''
+
+        x = np.asarray(x, dtype=np.complex128)
+        noisy = x + self.next(x.size).reshape(x.shape)
+
+        return noisy[()] if noisy.ndim == 0 else noisy
+
+
+if __name__ == '__main__':
+    print('SensorNoise class file')
@@ -13,9 +13,70 @@ import os
 import sys
 import csv
 import json
+import time
+import functools
+import hashlib
+import pickle
 import opendssdirect as dss
 import numpy as np
+import scipy.sparse as sp
 import logging
+from collections import deque
+from CktDef import CKTSolveMode
+
+
+def _inContext(method):
+    '''
+    Decorator to run a SimDSS method with the engine context of the instance
+    as the active (prime) context of opendssdirect. The previous context is
+    restored on return. Instances without their own context run unchanged
+    '''
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._isolated:
+            return method(self, *args, **kwargs)
+        if self._ctx is None:
+            raise Exception('The engine context of the instance was released')
+        prevCtx = dss.dss_lib.ctx_Get_Prime()
+        if prevCtx == self._ctx:
+            return method(self, *args, **kwargs)
+        dss.dss_lib.ctx_Set_Prime(self._ctx)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            dss.dss_lib.ctx_Set_Prime(prevCtx)
+    return wrapper
+
+
+def loadAdjMatrix(fname):
+    '''
+    Load the sparse topology saved by SimDSS.createAdjMatrix
+
+    Parameters
+    ----------
+    fname : str
+        Name of the .npz file
+
+    Returns
+    -------
+    busNames : list
+        bus names, in the row/column order of the adjacency matrix
+    adjMatrix : scipy.sparse csr_matrix
+        symmetric boolean adjacency matrix (nBuses x nBuses)
+    edges : numpy array
+        (nEdges x 2) bus indexes (from, to) of each element
+    edgeNames : list
+        element name of each edge
+    edgeIdx : numpy array
+        edge of each stored entry of adjMatrix (aligned with adjMatrix.indices)
+    '''
+    with np.load(fname) as data:
+        busNames = data['busNames'].tolist()
+        nBuses = len(busNames)
+        adjMatrix = sp.csr_matrix((np.ones(len(data['indices']), dtype=bool),
+                                   data['indices'], data['indptr']),
+                                  shape=(nBuses, nBuses))
+        return busNames, adjMatrix, data['edges'], data['edgeNames'].tolist(), data['edgeIdx']
 
 
 class SimDSS(object):
@@ -24,19 +85,55 @@ class SimDSS(object):
     Class that encapsulates opendssdirect.py library and provides
     easy way to calculate/update the circuit system state
 
+    By default the instance drives the global opendssdirect engine, so only
+    one circuit exists per process. With isolated=True the instance owns a
+    dedicated engine context, and several circuits can live side by side.
+    Their public methods activate the context of the instance on entry
+
     Attributes
     ----------
+    _isolated      : boolean
+        set True if the instance owns a dedicated engine context
+    _ctx           : cffi pointer
+        dedicated engine context of the instance, None for the global engine
+        or after close
+    _cacheDir      : str
+        directory of the compiled-topology cache, or None to disable the cache
+    _cacheFile     : str
+        cache file of the loaded files, None if the cache is disabled
+    _cacheVersion  : tuple
+        (_topoVersion, _tapVersion) of the circuit as loaded, the state the
+        cached tables and admittance matrix belong to
+    _cacheNodeOrder : list
+        lowercase YNodeOrder of the circuit as loaded
+    _ilpqCommands  : list
+        commands that create the inelastic loads of the ilpq file
     _nNodes        : int
         number of nodes in the circuit
     _NodeList      : list
         name of the nodes
     _terminal2node : dict
         mapping of: key(node name), value(node index according YNodeOrder)
-    _YMatrix       = numpy array
+    _YNodeList     : list
+        lowercase YNodeOrder of the engine, the labels of the rows and columns
+        of the admittance matrix
+    _YNode2idx     : dict
+        mapping of: key(node name), value(position in _YNodeList)
+    _YNodeMapVersion : int
+        value of _topoVersion when _YNodeList and _YNode2idx were built
+    _YMatrix       = scipy.sparse csc_matrix
         complex values of the admittance matrix of the last solution 
-        with dimension (nNode x nNodes)
-    _YMatrixPrev
-        same as _YMatrix, but from the previous solution
+        with dimension (nNode x nNodes), rows and columns in YNodeOrder
+    _YMatrixDiff   = scipy.sparse csc_matrix
+        difference between _YMatrix and the admittance matrix of the
+        previous solution (new YMatrix - previous YMatrix)
+    _YMatrixDense  = numpy array
+        dense copy of _YMatrix, created only when requested
+    _YMatrixVersion : tuple
+        (_topoVersion, _tapVersion) for which _YMatrix was built
+    _YIncremental  : boolean
+        set True to patch _YMatrix with the primitive Y change of the
+        transformer, instead of rebuilding it, after a tap change
     _nodewithload  : list
         0/1 list meaning the absence or presence of load in the nodes (YNodeOrder)
     _iPQ           = numpy array
@@ -55,10 +152,104 @@ class SimDSS(object):
         complex values of the node output current of the last solution
     _I_outPrev
         same as _I_out, but from the previous solution
+    _VMagAnglePu   = numpy array
+        voltage magnitude (p.u.) and angle (degrees) of the nodes of the last
+        solution, with dimension (nNodes x 2), rows in YNodeOrder
+    _VBase         = numpy array
+        voltage base (V, L-N) of the nodes, in YNodeOrder
+    _busNodes      : dict
+        mapping of: key(bus name), value(list of tuples (node number, node index
+        according YNodeOrder)) in the bus node order
+    _busPhase2slot : dict
+        mapping of: key((bus name, node number)), value(node index according
+        the YNodeOrder of the last solution)
+    _busMapVersion : int
+        value of _topoVersion when _busNodes, _busPhase2slot and _VBase were built
+    _VDirty        : boolean
+        set True when _Vckt has to be recalculated for the last solution
+    _IDirty        : boolean
+        set True when _I_in and _I_out have to be recalculated for the last solution
+    _VMagAnglePuDirty : boolean
+        set True when _VMagAnglePu has to be recalculated for the last solution
+    _loadNames     : list
+        node names, in the order received by setLoads, used to build the load index
+    _loadHandles   : list
+        Loads interface index (Loads.Idx) of each node with load, in _loadNames order
+    _loadBatch     : opendssdirect.utils.ElementBatch
+        batch of the loads of _loadHandles, in the same order, used to push
+        the load vectors with one engine call per property
+    _loadSel       : numpy array
+        position in _loadNames of each entry of _loadHandles
+    _loadNodeIdx   : numpy array
+        node index (YNodeOrder) of each entry of _loadHandles
+    _solveDeadband : float
+        norm (kVA) of the load change below which setLoads keeps the last
+        solution. 0 disables the deadband
+    _solvedkW      : numpy array
+        P (kW) of the indexed loads in the last solution, in _loadHandles order
+    _solvedkvar    : numpy array
+        Q (kvar) of the indexed loads in the last solution, in _loadHandles order
+    _skippedSolves : int
+        number of solutions skipped by the deadband
+    _solveStats    : collections.deque
+        ring buffer with one record per solution: solution number, purpose,
+        iterations, convergence, Solve wall time and post-processing time
+        per quantity
+    _solveCallback : callable
+        function called with the record of each solution, or None
+    _nSolves       : int
+        number of solutions since the creation of the object
+    _nNotConverged : int
+        number of solutions that did not converge
+    _topoVersion   : int
+        counter incremented every time the circuit topology changes
+    _tapVersion    : int
+        counter incremented every time a transformer tap changes
+    _sndCurrIdx    : numpy array
+        positions, in the PDElements.AllCurrents complex buffer, of the
+        sender-end (terminal 1) currents of lines and transformers
+    _sndNodeIdx    : numpy array
+        node index (YNodeOrder) receiving each current in _sndCurrIdx
+    _rcvCurrIdx    : numpy array
+        same as _sndCurrIdx, for the receiver-end (terminal 2) currents
+    _rcvNodeIdx    : numpy array
+        same as _sndNodeIdx, for the receiver-end (terminal 2) currents
+    _currBufLen    : int
+        number of complex values expected in PDElements.AllCurrents
+    _currMapVersion : int
+        value of _topoVersion when the current index tables were built
+    _elemIndex     : dict
+        mapping of: key(lowercase element name), value(tuple with the number
+        of terminals, number of phases, node order and a dict with the position
+        of each (terminal, phase) in the element Voltages/Currents/Powers arrays)
+    _elemMapVersion : int
+        value of _topoVersion when _elemIndex was built
+    _probes        : list
+        (element, terminal, phase) of each probe registered by addProbe
+    _probeIndex    : dict
+        mapping of: key(lowercase element, terminal, phase), value(probe index)
+    _probeGroups   : dict
+        mapping of: key(lowercase element name), value(list with the probe indexes of the element)
+    _snapshot      : tuple
+        (V, I, S) complex arrays with one value per probe for the last solution
+    _snapshotDirty : boolean
+        set True when _snapshot has to be recalculated for the last solution
+    _shapekW       : numpy array
+        P (kW) of the indexed loads in each step of the registered LoadShapes,
+        with dimension (len(_loadHandles) x nSteps), None if there is no profile
+    _shapekvar     : numpy array
+        same as _shapekW, for Q (kvar)
+    _shapeStepSize : float
+        time step (s) of the registered LoadShapes
+    _tsMonitors    : list
+        (monitor name, voltage channel columns, node index) of the monitors
+        that record the node voltages of runTimeSeries
+    _tsMonitorVersion : int
+        value of _topoVersion when _tsMonitors were created
     '''
 
 
-    def __init__(self, topofile, nwlfile, ilpqfile = ""):
+    def __init__(self, topofile, nwlfile, ilpqfile = "", isolated = False, cachedir = None):
         '''
         Initialize class and and obtain initial solution given by the initial parameters
         
@@ -70,13 +261,31 @@ class SimDSS(object):
             Name of the node with load file
         ilpqfile : str
             Name of the inelastic load file
+        isolated : bool
+            If True, the circuit is loaded in a new engine context owned by the instance
+        cachedir : str
+            Directory of the compiled-topology cache. If given, the tables derived
+            from the files are saved there and reused by the next start
         '''
 
+        self._isolated      = bool(isolated)
+        self._ctx           = dss.dss_lib.ctx_New() if isolated else None
+        self._cacheDir      = cachedir
+        self._cacheFile     = None
+        self._cacheVersion  = None
+        self._cacheNodeOrder = None
+        self._ilpqCommands  = []
         self._nNodes        = None
         self._NodeList      = []
         self._terminal2node = []
+        self._YNodeList     = []
+        self._YNode2idx     = {}
+        self._YNodeMapVersion = -1
         self._YMatrix       = None
-        self._YMatrixPrev   = None
+        self._YMatrixDiff   = None
+        self._YMatrixDense  = None
+        self._YMatrixVersion = None
+        self._YIncremental  = False
         self._nodewithload  = None
         self._iPQ           = None
         self._hasIPQ        = False
@@ -84,25 +293,112 @@ class SimDSS(object):
         self._I_in          = None
         self._I_out         = None   
         self._VMagAnglePu   = None
+        self._VBase         = None
+        self._busNodes      = {}
+        self._busPhase2slot = {}
+        self._busMapVersion = -1
+        self._VDirty        = True
+        self._IDirty        = True
+        self._VMagAnglePuDirty = True
+        self._loadNames     = None
+        self._loadHandles   = []
+        self._loadBatch     = None
+        self._loadSel       = None
+        self._loadNodeIdx   = None
+        self._solveDeadband = 0.0
+        self._solvedkW      = None
+        self._solvedkvar    = None
+        self._skippedSolves = 0
+        self._solveStats    = deque(maxlen=1000)
+        self._solveCallback = None
+        self._nSolves       = 0
+        self._nNotConverged = 0
+        self._topoVersion   = 0
+        self._tapVersion    = 0
+        self._sndCurrIdx    = None
+        self._sndNodeIdx    = None
+        self._rcvCurrIdx    = None
+        self._rcvNodeIdx    = None
+        self._currBufLen    = 0
+        self._currMapVersion = -1
+        self._elemIndex     = {}
+        self._elemMapVersion = -1
+        self._probes        = []
+        self._probeIndex    = {}
+        self._probeGroups   = {}
+        self._snapshot      = None
+        self._snapshotDirty = True
+        self._shapekW       = None
+        self._shapekvar     = None
+        self._shapeStepSize = None
+        self._tsMonitors    = []
+        self._tsMonitorVersion = -1
 
         logging.disable(logging.NOTSET)
         logging.basicConfig(format='%(asctime)s %(message)s', stream=sys.stderr, level=logging.ERROR)  
-      
+
+        self._loadCircuit(topofile, nwlfile, ilpqfile)
+
+
+    def close(self):
+        '''
+        Release the dedicated engine context of the instance. The instance
+        cannot be used afterwards. Nothing is done for the global engine
+        '''
+        if self._isolated and (self._ctx is not None):
+            if dss.dss_lib.ctx_Get_Prime() == self._ctx:
+                raise Exception('The engine context of the instance is active')
+            if self._loadBatch is not None:
+                self._loadBatch.dispose()
+                self._loadBatch = None
+            dss.dss_lib.ctx_Dispose(self._ctx)
+            self._ctx = None
+
+    #-------------------#
+    #- Private Methods -#
+    #-------------------#
+
+    @_inContext
+    def _loadCircuit(self, topofile, nwlfile, ilpqfile):
+        '''
+        Load the circuit and the load files, and prepare the initial state
+        
+        Parameters
+        ----------
+        topofile : str
+            Name of the topology file
+        nwlfile : str
+            Name of the node with load file
+        ilpqfile : str
+            Name of the inelastic load file
+        '''
         self._readTopo(topofile)
-        self._nNodes = dss.Circuit.NumNodes()
-        self._mapTerminal2Node()
-        #--- Remove Ymatrix calculation because slows down too much for large circuits
-        #self._YMatrix = self._constructYMatrix()
-        self._readNodeWithLoad(nwlfile)
-        if (ilpqfile != ""):
-            self._iPQ = self._readInelasticLoadPQ(ilpqfile)
-            self._hasIPQ = True
+        cache = None
+        if self._cacheDir is not None:
+            self._cacheFile = self._getCacheFile(topofile, nwlfile, ilpqfile)
+            cache = self._readCache(topofile)
+        if cache is None:
+            self._nNodes = dss.Circuit.NumNodes()
+            self._mapTerminal2Node()
+            #--- Remove Ymatrix calculation because slows down too much for large circuits
+            #self._YMatrix = self._constructYMatrix()
+            self._readNodeWithLoad(nwlfile)
+            if (ilpqfile != ""):
+                self._iPQ = self._readInelasticLoadPQ(ilpqfile)
+                self._hasIPQ = True
+        self._cacheVersion = (self._topoVersion, self._tapVersion)
+        if (self._cacheFile is not None) and (cache is None):
+            self._cacheNodeOrder = [name.lower() for name in dss.Circuit.YNodeOrder()]
+            #-- build the tables now to save them
+            self._mapElements()
+            self._mapCurrent2Node()
+            self._mapBusNodes()
+            self._writeCache()
         self._Vckt  = np.zeros((self._nNodes), dtype=complex)
         self._I_in  = np.zeros((self._nNodes), dtype=complex)
         self._I_out = np.zeros((self._nNodes), dtype=complex)
-        self._calcVComplex()
-        self._calcInOutCurrent()
-        self._calcVMagAnglePu()
+        #-- the initial state is calculated on first access
+        self._invalidateSystemState()
 
         logging.debug('Start SimDSS Class')
         logging.debug('Topology file: %s', topofile)
@@ -113,9 +409,171 @@ class SimDSS(object):
         logging.debug('NodeWithLoad File: %s', nwlfile) 
         logging.debug('NodeWithLoad %s', self._nodewithload)                 
 
-    #-------------------#
-    #- Private Methods -#
-    #-------------------#
+
+    def _getCacheFile(self, topofile, nwlfile, ilpqfile):
+        '''
+        Name of the cache file of a set of files. The name is the content hash
+        of the topology file, the files it loads with Redirect or Compile, and
+        the node with load and inelastic load files
+        
+        Returns
+        -------
+        cacheFile : str
+        '''
+        current_directory = os.path.dirname(os.path.realpath(__file__))
+        topoFiles = self._getTopoFiles(os.path.abspath(os.path.join(current_directory, topofile)))
+        h = hashlib.sha256(b'SimDSS cache 2')
+        for fname in topoFiles + [nwlfile, ilpqfile]:
+            h.update(b'\0')
+            if fname != "":
+                fname = os.path.abspath(os.path.join(current_directory, fname))
+                if os.path.isfile(fname):
+                    with open(fname, 'rb') as f:
+                        h.update(f.read())
+
+        return os.path.join(self._cacheDir, h.hexdigest() + '.pkl')
+
+
+    def _getTopoFiles(self, pathTopoFile, found=None):
+        '''
+        List a script file and the files it loads with Redirect or Compile,
+        recursively, in the order they are loaded. The names are relative to
+        the directory of the file that loads them, as in the engine
+        
+        Parameters
+        ----------
+        pathTopoFile : str
+            Absolute name of the script file
+        found : list
+            Files already listed, used by the recursive calls
+        
+        Returns
+        -------
+        files : list
+            Absolute file names
+        '''
+        if found is None:
+            found = []
+        if pathTopoFile in found:
+            return found
+        found.append(pathTopoFile)
+        if not os.path.isfile(pathTopoFile):
+            return found
+        directory = os.path.dirname(pathTopoFile)
+        with open(pathTopoFile, 'r', errors='replace') as f:
+            for line in f:
+                words = line.split(None, 1)
+                if (len(words) < 2) or (words[0].lower() not in ('redirect', 'compile')):
+                    continue
+                fname = words[1].split('!')[0].strip()
+                if fname.lower().startswith('file='):
+                    fname = fname[5:]
+                fname = fname.strip('"\'()[]{} \t')
+                if fname != "":
+                    self._getTopoFiles(os.path.abspath(os.path.join(directory, fname)), found)
+
+        return found
+
+
+    def _readCache(self, topofile):
+        '''
+        Restore the state derived from the files from the cache file, after the
+        circuit was compiled. The inelastic loads are created from the cached
+        commands. The cache is only used if the circuit has the cached nodes,
+        checked before and after the inelastic loads are created. If the
+        second check fails, the topology is compiled again, so the cold start
+        does not create the inelastic loads twice
+        
+        Parameters
+        ----------
+        topofile : str
+            Name of the topology file
+        
+        Returns
+        -------
+        cache : dict
+            The cache content, or None if there is no valid cache
+        '''
+        if not os.path.isfile(self._cacheFile):
+            return None
+        try:
+            with open(self._cacheFile, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            logging.warning('Cache file %s not readable: %s', self._cacheFile, e)
+            return None
+        if ((dss.Circuit.NumNodes() != cache['nNodes']) or
+            ([name.lower() for name in dss.Circuit.YNodeOrder()] != cache['NodeList'])):
+            logging.warning('Cache file %s does not match the circuit', self._cacheFile)
+            return None
+
+        if cache['iPQ'] is not None:
+            self._runCommands(cache['ilpqCommands'])
+            self._solve('startup')
+        if [name.lower() for name in dss.Circuit.YNodeOrder()] != cache['YNodeOrder']:
+            logging.warning('Cache file %s does not match the circuit', self._cacheFile)
+            #-- start again from the topology, without the inelastic loads
+            dss.run_command('Clear')
+            self._readTopo(topofile)
+            return None
+        self._cacheNodeOrder = cache['YNodeOrder']
+
+        self._nNodes        = cache['nNodes']
+        self._NodeList      = list(cache['NodeList'])
+        self._terminal2node = dict(zip(self._NodeList, range(self._nNodes)))
+        self._nodewithload  = dict(cache['nodewithload'])
+        self._ilpqCommands  = list(cache['ilpqCommands'])
+        if cache['iPQ'] is not None:
+            self._iPQ    = cache['iPQ']
+            self._hasIPQ = True
+        self._elemIndex     = cache['elemIndex']
+        self._busNodes      = cache['busNodes']
+        self._busPhase2slot = cache['busPhase2slot']
+        self._VBase         = cache['VBase']
+        (self._sndCurrIdx, self._sndNodeIdx, self._rcvCurrIdx, self._rcvNodeIdx) = cache['currIdx']
+        self._currBufLen    = cache['currBufLen']
+        self._elemMapVersion = self._topoVersion
+        self._currMapVersion = self._topoVersion
+        self._busMapVersion  = self._topoVersion
+        if cache['YMatrix'] is not None:
+            self._YMatrix = cache['YMatrix']
+            self._YMatrixVersion = (self._topoVersion, self._tapVersion)
+
+        return cache
+
+
+    def _writeCache(self):
+        '''
+        Save the state derived from the files, and the admittance matrix if it
+        was built for the circuit as loaded, in the cache file
+        '''
+        #-- new loads may have renumbered the nodes of the matrix
+        YMatrix = None
+        if ((self._YMatrixVersion == self._cacheVersion) and
+            ([name.lower() for name in dss.Circuit.YNodeOrder()] == self._cacheNodeOrder)):
+            YMatrix = self._YMatrix
+        cache = {
+            'nNodes'        : self._nNodes,
+            'NodeList'      : self._NodeList,
+            'nodewithload'  : self._nodewithload,
+            'ilpqCommands'  : self._ilpqCommands,
+            'iPQ'           : self._iPQ if self._hasIPQ else None,
+            'YNodeOrder'    : self._cacheNodeOrder,
+            'elemIndex'     : self._elemIndex,
+            'busNodes'      : self._busNodes,
+            'busPhase2slot' : self._busPhase2slot,
+            'VBase'         : self._VBase,
+            'currIdx'       : (self._sndCurrIdx, self._sndNodeIdx, self._rcvCurrIdx, self._rcvNodeIdx),
+            'currBufLen'    : self._currBufLen,
+            'YMatrix'       : YMatrix
+        }
+        os.makedirs(self._cacheDir, exist_ok=True)
+        #-- write and rename, so a reader never sees a partial file
+        tmpFile = self._cacheFile + '.' + str(os.getpid())
+        with open(tmpFile, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpFile, self._cacheFile)
+
 
     def _mapTerminal2Node(self):
         '''
@@ -152,7 +610,8 @@ class SimDSS(object):
             if areg:
                 print('Config file error: ' + areg)
                 sys.exit()
-            dss.Solution.Solve()
+            self._solve('startup')
+            self._topoVersion += 1
 
     def _read_json(self, file_path: str):
         """
@@ -249,46 +708,382 @@ class SimDSS(object):
                                   ' Bus1='    + nodeName +
                                   ' kW='      + data[i][1] +
                                   ' kvar='    + data[i][2])                  
-                    dss.run_command(
-                        'New Load.' + nodeName + 
-                        ' Bus1='    + nodeName +
-                        ' kW='      + data[i][1] +
-                        ' kvar='    + data[i][2])
+                    command = ('New Load.' + nodeName + 
+                               ' Bus1='    + nodeName +
+                               ' kW='      + data[i][1] +
+                               ' kvar='    + data[i][2])
+                    self._ilpqCommands.append(command)
+            #-- all the loads are created in one batch
+            self._runCommands(self._ilpqCommands)
             #-- after loading a new solution is necessary
-            dss.Solution.Solve()
+            self._solve('startup')
                     
         return PQ
 
         
+    def _mapLoads(self, nodeNames, kW, kvar):
+        '''
+        Create the loads of the nodes with load that are not yet in the circuit,
+        and index the loads by the order of nodeNames. A load already in the
+        circuit with the name of the node, but on other terminals, is moved to
+        the node as if it were defined again: a load of the topology between
+        two nodes (e.g. 646.2.3 on IEEE13) becomes a load of the node. This
+        is done only once, the later updates go through a batch of the
+        indexed loads
+        
+        Parameters
+        ----------
+        nodeNames : list
+            Name of the nodes, in the order the loads will be given
+        kW : numpy array
+            Initial P (kW) for each node in nodeNames
+        kvar : numpy array
+            Initial Q (kvar) for each node in nodeNames
+        '''
+        loadNames = set(name.lower() for name in dss.Loads.AllNames())
+        commands = []
+        for k in range(len(nodeNames)):
+            nodeName = nodeNames[k]
+            if self._nodewithload[nodeName] <= 0:
+                continue
+            if nodeName.lower() not in loadNames:
+                command = 'New Load.'
+            else:
+                dss.Loads.Name(nodeName)
+                if dss.CktElement.BusNames()[0].lower() == nodeName.lower():
+                    continue
+                command = 'Edit Load.'
+            logging.debug(command + nodeName +
+                          ' Bus1='    + nodeName +
+                          ' kW='      + str(kW[k]) +
+                          ' kvar='    + str(kvar[k]))
+            commands.append(
+                command   + nodeName +
+                ' Bus1='  + nodeName +
+                ' kW='    + str(kW[k]) +
+                ' kvar='  + str(kvar[k]))
+        if commands:
+            self._runCommands(commands)
+            #-- new or moved loads may renumber the nodes of the solution
+            self._topoVersion += 1
+
+        handles, sel, nodeIdx = [], [], []
+        for k in range(len(nodeNames)):
+            nodeName = nodeNames[k]
+            if self._nodewithload[nodeName] <= 0:
+                continue
+            dss.Loads.Name(nodeName)
+            handles.append(dss.Loads.Idx())
+            sel.append(k)
+            nodeIdx.append(self._terminal2node[nodeName])
+
+        if self._loadBatch is not None:
+            self._loadBatch.dispose()
+        self._loadNames   = list(nodeNames)
+        self._loadHandles = handles
+        self._loadBatch   = dss.utils.ElementBatch('Load', handles)
+        self._loadSel     = np.array(sel, dtype=np.intp)
+        self._loadNodeIdx = np.array(nodeIdx, dtype=np.intp)
+        self._solvedkW    = None
+        self._solvedkvar  = None
+        #-- a registered profile follows the previous load index
+        self._shapekW     = None
+        self._shapekvar   = None
+
+
+    def _runCommands(self, commands):
+        '''
+        Run a batch of commands with one call to the engine, logging the
+        commands that failed. Engine warnings, such as a redefined element,
+        are logged at debug level
+        
+        Parameters
+        ----------
+        commands : list
+            Commands to run, in order
+        
+        Returns
+        -------
+        errors : list
+            (index, command, error number, error description) of each failed command
+        '''
+        errors = dss.run_commands(commands)
+        for (index, command, number, description) in errors:
+            if description.startswith('Warning'):
+                logging.debug('Command %s (%s): %s', command, number, description)
+            else:
+                logging.error('Command %s failed (%s): %s', command, number, description)
+
+        return errors
+
+
+    def _pushLoads(self, kW, kvar):
+        '''
+        Set P and Q of all the indexed loads with one batch call per
+        property, without building and parsing command strings
+        
+        Parameters
+        ----------
+        kW : numpy array
+            P (kW) for each load, in _loadHandles order
+        kvar : numpy array
+            Q (kvar) for each load, in _loadHandles order
+        '''
+        self._loadBatch.set_float64('kW', kW)
+        self._loadBatch.set_float64('kvar', kvar)
+        #-- as an edit command would do, have the engine rebuild the system Y
+        #-- with the new load admittances before the next solution
+        dss.YMatrix.SystemYChanged(True)
+
+
+    def _applyLoads(self, P, Q):
+        '''
+        Add the inelastic load to the elastic load of the indexed nodes, push
+        the loads and calculate the new system state
+        
+        Parameters
+        ----------
+        P : numpy array
+            P (kW) of the elastic load, in _loadNames order
+        Q : numpy array
+            Q (kvar) of the elastic load, in _loadNames order
+        '''
+        #-- only nodes with homes receive load
+        kW   = P[self._loadSel]
+        kvar = Q[self._loadSel]
+        if (self._hasIPQ == True):
+            kW   = self._iPQ[self._loadNodeIdx, 0] + kW
+            kvar = self._iPQ[self._loadNodeIdx, 1] + kvar
+
+        #-- keep the last solution if the loads barely changed
+        if (self._solveDeadband > 0) and (self._solvedkW is not None):
+            dS = np.sqrt(np.sum((kW - self._solvedkW)**2) + np.sum((kvar - self._solvedkvar)**2))
+            if dS < self._solveDeadband:
+                self._skippedSolves += 1
+                return
+
+        self._pushLoads(kW, kvar)
+                
+        #-- after setting a new load, a new system state has to be calculated
+        self._updateSystemState()
+        self._solvedkW   = kW
+        self._solvedkvar = kvar
+
+
     def _constructYMatrix(self):
         '''
         Calculate the nodal admittance matrix YMatrix
+        
+        The matrix is extracted directly in compressed sparse column format
+        from the engine, without going through the dense SystemY
             
         Returns
         -------
-        numpy array
-                It returns a complex array of Y admittance matrix        
+        scipy.sparse csc_matrix
+                It returns a complex sparse Y admittance matrix in YNodeOrder
         '''
         #- disconnect vsources and loads
-        dss.run_command('vsource.source.enabled = no')
-        dss.run_command('batchedit load..* enabled=no')
+        self._runCommands(['vsource.source.enabled = no',
+                           'batchedit load..* enabled=no'])
         #- extract YMatrix
-        dss.Solution.Solve()
-        Ybus   = dss.Circuit.SystemY()  #--- slow
-        Yres   = np.reshape(Ybus, (self._nNodes, self._nNodes*2)) #--- slow
-        #- populate complex polyphase nodal Y
-        Y = np.zeros((self._nNodes, self._nNodes), dtype=complex)
-        for i in range(self._nNodes):   #--- very very slow
-            Y[:, i] = Yres[:, 2*i] + 1j*Yres[:, 2*i + 1]
-        self._YMatrixPrev = self._YMatrix
+        self._solve('ymatrix')
+        (data, indices, indptr) = dss.YMatrix.getYsparse(False)
+        nY = len(indptr) - 1
+        Y = sp.csc_matrix((data, indices, indptr), shape=(nY, nY))
+        Y.sort_indices()
+        if (self._YMatrix is not None) and (self._YMatrix.shape == Y.shape):
+            self._YMatrixDiff = Y - self._YMatrix
+        else:
+            self._YMatrixDiff = None
         self._YMatrix = Y
+        self._YMatrixDense = None
         #- reconnect vsources and loads
-        dss.run_command('vsource.source.enabled = yes')
-        dss.run_command('batchedit load..* enabled=yes')
+        self._runCommands(['vsource.source.enabled = yes',
+                           'batchedit load..* enabled=yes'])
         #- return to the previous solution
-        dss.Solution.Solve()    
+        self._solve('ymatrix')
+        self._invalidateSystemState()
     
         return Y    
+
+
+    def _updateYMatrix(self):
+        '''
+        Return the admittance matrix, building it only if the topology or
+        a transformer tap has changed since the last time it was built
+            
+        Returns
+        -------
+        scipy.sparse csc_matrix
+                It returns a complex sparse Y admittance matrix in YNodeOrder
+        '''
+        version = (self._topoVersion, self._tapVersion)
+        if self._YMatrixVersion != version:
+            self._constructYMatrix()
+            self._YMatrixVersion = version
+            #-- the matrix of the circuit as loaded goes to the cache
+            if (self._cacheFile is not None) and (version == self._cacheVersion):
+                self._writeCache()
+
+        return self._YMatrix
+
+
+    def _mapTimeSeriesMonitors(self):
+        '''
+        Create the monitors that record the node voltages during runTimeSeries.
+        Terminals are taken element by element until every node has one, and
+        each monitor records the (re, im) voltages of its terminal conductors.
+        The monitors are created disabled, once per topology version, and
+        only enabled while runTimeSeries solves
+        '''
+        if self._YNodeMapVersion != self._topoVersion:
+            self._mapYNodes()
+        nNodes  = int(self._nNodes)
+        covered = np.zeros(nNodes, dtype=bool)
+        monitors, commands = [], []
+        for name in dss.Circuit.AllElementNames():
+            if covered.all():
+                break
+            if name.lower().startswith('monitor.'):
+                continue
+            dss.Circuit.SetActiveElement(name)
+            blist  = dss.CktElement.BusNames()
+            nCond  = dss.CktElement.NumConductors()
+            OArray = dss.CktElement.NodeOrder()
+            for term in range(len(blist)):
+                bus = blist[term].split('.')[0].lower()
+                cols, slots = [], []
+                for k in range(nCond):
+                    slot = self._YNode2idx.get(bus + '.' + str(OArray[term*nCond + k]))
+                    if (slot is not None) and (slot < nNodes) and not covered[slot]:
+                        #-- hour and seconds come before the channels
+                        cols.append(2 + 2*k)
+                        slots.append(slot)
+                        covered[slot] = True
+                if cols:
+                    monitor = 'simdss_v{}_{}'.format(self._topoVersion, len(monitors))
+                    commands.append('New Monitor.{} Element={} Terminal={} Mode=0 VIPolar=no enabled=no'.format(monitor, name, term + 1))
+                    monitors.append((monitor, np.array(cols, dtype=np.intp), np.array(slots, dtype=np.intp)))
+        if not covered.all():
+            raise Exception('Nodes without a terminal to monitor: {}'.format(
+                [self._YNodeList[k] for k in np.flatnonzero(~covered)]))
+
+        self._runCommands(commands)
+        self._tsMonitors = monitors
+        self._tsMonitorVersion = self._topoVersion
+        #-- the monitors are circuit elements, index them with the others
+        self._elemMapVersion = -1
+
+
+    def _enableTimeSeriesMonitors(self, enabled):
+        '''
+        Enable or disable the monitors of runTimeSeries. Enabled monitors
+        start empty
+        
+        Parameters
+        ----------
+        enabled : bool
+        '''
+        for (monitor, _, _) in self._tsMonitors:
+            dss.Circuit.SetActiveElement('Monitor.' + monitor)
+            dss.CktElement.Enabled(enabled)
+            if enabled:
+                dss.Monitors.Name(monitor)
+                dss.Monitors.Reset()
+
+
+    def _mapYNodes(self):
+        '''
+        Build the node map of the admittance matrix from the current
+        YNodeOrder of the engine, which is the order of YMatrix.getYsparse.
+        The map is built once per topology version
+        '''
+        self._YNodeList = [name.lower() for name in dss.Circuit.YNodeOrder()]
+        self._YNode2idx = dict(zip(self._YNodeList, range(len(self._YNodeList))))
+        self._YNodeMapVersion = self._topoVersion
+
+
+    def _getYPrim(self, cktElement):
+        '''
+        Get the primitive admittance matrix of a circuit element and the
+        nodes (YNodeOrder) of its conductors
+        
+        Parameters
+        ----------
+        cktElement : str
+            Full name of the circuit element
+            
+        Returns
+        -------
+        YPrim : numpy array
+            complex primitive Y matrix (nCond*nTerm x nCond*nTerm)
+        nodes : numpy array
+            node index of each conductor, -1 for ground
+        '''
+        dss.Circuit.SetActiveElement(cktElement)
+        blist  = dss.CktElement.BusNames()
+        nCond  = dss.CktElement.NumConductors()
+        OArray = dss.CktElement.NodeOrder()
+        YPrim  = np.ascontiguousarray(dss.CktElement.YPrim(), dtype=np.float64).view(np.complex128)
+        nY     = len(OArray)
+        nodes  = np.full(nY, -1, dtype=np.intp)
+        if self._YNodeMapVersion != self._topoVersion:
+            self._mapYNodes()
+        for k in range(nY):
+            bus = blist[k // nCond].split('.')[0]
+            nodes[k] = self._YNode2idx.get(bus + '.' + str(OArray[k]), -1)
+
+        return YPrim.reshape((nY, nY)), nodes
+
+
+    def _patchYMatrix(self, dYPrim, nodes):
+        '''
+        Add the change of a primitive admittance matrix to the cached YMatrix.
+        The matrices returned by getYMatrix are not changed: if the sparsity
+        pattern has room for the change, a new matrix shares the structure
+        and gets a patched copy of the values, otherwise it is rebuilt
+        through a sparse sum
+        
+        Parameters
+        ----------
+        dYPrim : numpy array
+            complex change of the primitive Y matrix
+        nodes : numpy array
+            node index of each conductor of the element, -1 for ground
+        '''
+        #-- remove ground conductors and zero entries
+        keep = nodes >= 0
+        dYPrim = dYPrim[np.ix_(keep, keep)]
+        nodes  = nodes[keep]
+        (r, c) = np.nonzero(dYPrim)
+        dY = sp.csc_matrix((dYPrim[r, c], (nodes[r], nodes[c])), shape=self._YMatrix.shape)
+        dY.sum_duplicates()
+
+        #-- locate the entries in the compressed column structure
+        Y = self._YMatrix
+        (rows, cols, vals) = sp.find(dY)
+        pos = np.empty(len(rows), dtype=np.intp)
+        inPlace = True
+        for k in range(len(rows)):
+            st  = Y.indptr[cols[k]]
+            end = Y.indptr[cols[k] + 1]
+            pos[k] = st + np.searchsorted(Y.indices[st:end], rows[k])
+            if (pos[k] >= end) or (Y.indices[pos[k]] != rows[k]):
+                inPlace = False
+                break
+
+        if inPlace:
+            data = Y.data.copy()
+            data[pos] += vals
+            self._YMatrix = sp.csc_matrix((data, Y.indices, Y.indptr), shape=Y.shape, copy=False)
+        else:
+            self._YMatrix = Y + dY
+            self._YMatrix.sort_indices()
+        if self._YMatrixDense is not None:
+            YDense = self._YMatrixDense.copy()
+            YDense[rows, cols] += vals
+            self._YMatrixDense = YDense
+        self._YMatrixDiff = dY
     
 
     def _calcVComplex(self):
@@ -300,120 +1095,362 @@ class SimDSS(object):
         numpy array
             It returns an array of Voltage for each node
         '''
-        vckt = dss.Circuit.YNodeVArray()
-        V = np.zeros(int(self._nNodes), dtype=complex)
-        
-        for i in range(int(self._nNodes)):
-            V[i] = vckt[2*i] + 1j*vckt[2*i + 1]
-            self._Vckt[i] = V[i]
-        
+        #-- YNodeVArray is interleaved (re, im) per node: reinterpret the
+        #-- float64 buffer as complex128 instead of copying node by node.
+        #-- np.array copies: in numpy buffer mode the getter array is reused
+        vckt = np.array(dss.Circuit.YNodeVArray(), dtype=np.float64)
+        V = vckt[:2*int(self._nNodes)].view(np.complex128)
+
+        #-- _Vckt and the returned array are the same object
+        self._Vckt = V
+        self._VDirty = False
+
         return V
    
 
-    def _calcVMagAnglePu(self):
+    def _mapBusNodes(self):
         '''
-        Calculate BusMagAnglePu: the voltage magnitude and angle in p.u. for each bus node. BusVMagAngle[bus][node][property]
-        '''        
-        BusNames = dss.Circuit.AllBusNames()
-        self._VMagAnglePu = {}
-        for bus in BusNames:
-            self._VMagAnglePu[bus] = {}
+        Build the (bus, node) to node index map and the voltage base of the nodes
+
+        The node index is the position in the YNodeOrder of the last solution,
+        which is the order of Circuit.YNodeVArray. The map and the voltage bases
+        only depend on the topology, so they are built once per topology version
+        '''
+        ynode2slot = {}
+        for (slot, name) in enumerate(dss.Circuit.YNodeOrder()[:self._nNodes]):
+            ynode2slot[name.lower()] = slot
+        self._busNodes      = {}
+        self._busPhase2slot = {}
+        self._VBase = np.ones(self._nNodes)
+        for bus in dss.Circuit.AllBusNames():
             dss.Circuit.SetActiveBus(bus)
-            puVmagAngle = dss.Bus.puVmagAngle()
-            Nodes = dss.Bus.Nodes()
-            for j in range(len(Nodes)):
-                self._VMagAnglePu[bus][Nodes[j]] = {}
-                self._VMagAnglePu[bus][Nodes[j]]['VMag']  = puVmagAngle[2*j]
-                self._VMagAnglePu[bus][Nodes[j]]['Angle'] = puVmagAngle[2*j + 1]        
+            #-- as OpenDSS, without a voltage base the magnitude is in V
+            VBase = dss.Bus.kVBase() * 1000
+            if VBase <= 0:
+                VBase = 1.0
+            self._busNodes[bus] = []
+            for nd in dss.Bus.Nodes():
+                slot = ynode2slot.get(bus + '.' + str(nd))
+                if slot is None:
+                    continue
+                self._busNodes[bus].append((nd, slot))
+                self._busPhase2slot[(bus, nd)] = slot
+                self._VBase[slot] = VBase
+        self._busMapVersion = self._topoVersion
+
+
+    def _calcVMagAnglePu(self):
+        '''
+        Calculate VMagAnglePu: the voltage magnitude (p.u.) and angle (degrees)
+        for each node, from the node voltages and the cached voltage bases
+
+        Returns
+        -------
+        VMagAnglePu : numpy array
+            (nNodes x 2) array, with VMag in column 0 and Angle in column 1
+        '''
+        if self._busMapVersion != self._topoVersion:
+            self._mapBusNodes()
+        V = self._getVckt()
+        VMagAnglePu = np.empty((self._nNodes, 2))
+        np.divide(np.abs(V), self._VBase, out=VMagAnglePu[:, 0])
+        VMagAnglePu[:, 1] = np.angle(V, deg=True)
+
+        self._VMagAnglePu = VMagAnglePu
+        self._VMagAnglePuDirty = False
+
+        return VMagAnglePu
+
+
+    def _mapCurrent2Node(self):
+        '''
+        Build the index tables used by _calcInOutCurrent
+
+        For every conductor of the lines and transformers, find its position
+        in the PDElements.AllCurrents buffer and the node (YNodeOrder) it is
+        connected to. Sender-end currents come from terminal 1 and receiver-end
+        currents from terminal 2. The neutral conductor of transformers and
+        conductors connected to ground are not mapped.
+        The tables only depend on the topology, so they are built once per
+        topology version.
+        '''
+        elemNames = dss.PDElements.AllNames()
+        nConds    = dss.PDElements.AllNumConductors()
+        nTerms    = dss.PDElements.AllNumTerminals()
+
+        #-- first position of each element in the currents buffer
+        elemPos = []
+        pos = 0
+        for k in range(len(elemNames)):
+            elemPos.append(pos)
+            pos += nConds[k] * nTerms[k]
+
+        sndCurr, sndNode, rcvCurr, rcvNode = [], [], [], []
+        #-- keep the same order (lines first) as the sums were done before
+        for (prefix, skipNeutral) in (('line.', 0), ('transformer.', 1)):
+            for k in range(len(elemNames)):
+                if not elemNames[k].lower().startswith(prefix):
+                    continue
+                (st, nc) = (elemPos[k], nConds[k])
+                dss.Circuit.SetActiveElement(elemNames[k])
+                blist   = dss.CktElement.BusNames()
+                OArray  = dss.CktElement.NodeOrder()
+                for (term, currList, nodeList) in ((0, sndCurr, sndNode),
+                                                   (1, rcvCurr, rcvNode)):
+                    bus = blist[term].split('.')[0]
+                    for p in range(nc - skipNeutral):
+                        idx = self._terminal2node.get(bus + '.' + str(OArray[term*nc + p]))
+                        if idx is None:
+                            continue
+                        currList.append(st + term*nc + p)
+                        nodeList.append(idx)
+
+        self._sndCurrIdx = np.array(sndCurr, dtype=np.intp)
+        self._sndNodeIdx = np.array(sndNode, dtype=np.intp)
+        self._rcvCurrIdx = np.array(rcvCurr, dtype=np.intp)
+        self._rcvNodeIdx = np.array(rcvNode, dtype=np.intp)
+        self._currBufLen = pos
+        self._currMapVersion = self._topoVersion
+
+
+    def _mapElements(self):
+        '''
+        Build the element index used to validate and locate element probes
+
+        For every circuit element, keep the number of terminals, number of
+        phases, node order and the position of each (terminal, phase) in the
+        Voltages/Currents/Powers arrays. The index only depends on the
+        topology, so it is built once per topology version.
+        '''
+        self._elemIndex = {}
+        for name in dss.Circuit.AllElementNames():
+            dss.Circuit.SetActiveElement(name)
+            nTerm   = dss.CktElement.NumTerminals()
+            nPhases = dss.CktElement.NumPhases()
+            ndOrder = tuple(dss.CktElement.NodeOrder())
+            offsets = {}
+            for term in range(1, nTerm + 1):
+                st = 0 if term == 1 else int(len(ndOrder) / 2)
+                #-- the first conductor found for the phase is used
+                for idx in range(min(nPhases, len(ndOrder) - st) - 1, -1, -1):
+                    offsets[(term, ndOrder[st+idx])] = (st+idx)*2
+            self._elemIndex[name.lower()] = (nTerm, nPhases, ndOrder, offsets)
+        self._elemMapVersion = self._topoVersion
+
+
+    def _getElement(self, cktElement):
+        '''
+        Return the index entry of a circuit element and set it as active
+
+        Parameters
+        ----------
+        cktElement : str
+            Name of the circuit element
+
+        Returns
+        -------
+        elem : tuple
+            (number of terminals, number of phases, node order, offsets)
+        '''
+        if self._elemMapVersion != self._topoVersion:
+            self._mapElements()
+        elem = self._elemIndex.get(cktElement.lower())
+        if elem is None and len(self._elemIndex) != dss.Circuit.NumCktElements():
+            #-- elements were added outside this class
+            self._topoVersion += 1
+            self._mapElements()
+            elem = self._elemIndex.get(cktElement.lower())
+        if elem is None:
+            raise Exception('cktElement:', cktElement, ' not in the circuit')
+
+        dss.Circuit.SetActiveElement(cktElement)
+        return elem
 
 
     def _calcInOutCurrent(self):
         '''
         Calculate input/output current for the circuit
+        
+        All the currents are read at once from the engine and scattered into
+        the nodes using the tables built by _mapCurrent2Node
          
         Returns
         -------
         numpy arrays
             It returns two arrays, one for I_in and other for I_out, for each node
         ''' 
+        CArray = np.ascontiguousarray(dss.PDElements.AllCurrents(), dtype=np.float64)
+        CArray = CArray.view(np.complex128)
+
+        #-- a different buffer size means elements were added or removed
+        if (self._currMapVersion == self._topoVersion) and (len(CArray) != self._currBufLen):
+            self._topoVersion += 1
+        if self._currMapVersion != self._topoVersion:
+            self._mapCurrent2Node()
+
         # sender-end currents
         I_1 = np.zeros(self._nNodes, dtype=complex)
+        np.add.at(I_1, self._sndNodeIdx, CArray[self._sndCurrIdx])
         # receiving-end currents
         I_2 = np.zeros(self._nNodes, dtype=complex)
-        
-        #-- get current for the line elements
-        line_elem = dss.Lines.First()
-        while line_elem > 0:
-            dss.Circuit.SetActiveElement('Line.' + dss.Lines.Name())
-            # get buses that are connected by a given line
-            blist = dss.CktElement.BusNames()
-            # extract the sender node name
-            senderBus = blist[0].split('.')[0]
-            # extract the receiver node name
-            receiverBus = blist[1].split('.')[0]
-            # extract currents passing through the line (real and img components)
-            CArray = dss.CktElement.Currents()
-            CArray = np.array(CArray)
-            # this returns real and img parts of current flow for each phase in A
-            OArray = dss.CktElement.NodeOrder()
-
-            for p in range(int(len(CArray)/4)):
-                # get complex current at the sending-end
-                idx = self._terminal2node[senderBus + '.' + str(OArray[p])]
-                I_1[idx] = I_1[idx] + CArray[2*p] + CArray[2*p+1]*1j
-
-            for p in range(int(len(CArray)/4), int(len(CArray)/2)):
-                # get complex current at the receiving-end
-                idx = self._terminal2node[receiverBus + '.' + str(OArray[p])]
-                I_2[idx] = I_2[idx] + CArray[2*p] + CArray[2*p+1]*1j             
- 
-            line_elem = dss.Lines.Next()        
-  
-        #-- get current for the transformer elements
-        line_elem = dss.Transformers.First()
-        while line_elem > 0:
-            dss.Circuit.SetActiveElement('Transformer.' + dss.Transformers.Name())
-            # get buses that are connected by a given line
-            blist = dss.CktElement.BusNames()
-            # extract the sender node name
-            senderBus = blist[0].split('.')[0]
-            # extract the receiver node name
-            receiverBus = blist[1].split('.')[0]
-            # extract currents passing through the line (real and img components)
-            CArray = dss.CktElement.Currents()
-            CArray = np.array(CArray)
-            # this returns real and img parts of current flow for each phase in A
-            OArray = dss.CktElement.NodeOrder()
-
-            for p in range(int(len(CArray)/4)-1):
-                # get complex current at the sending-end
-                idx = self._terminal2node[senderBus + '.' + str(OArray[p])]
-                I_1[idx] = I_1[idx] + CArray[2*p] + CArray[2*p+1]*1j
-
-            for p in range(int(len(CArray)/4), int(len(CArray)/2)-1):
-                # get complex current at the receiving-end
-                idx = self._terminal2node[receiverBus + '.' + str(OArray[p])]
-                I_2[idx] = I_2[idx] + CArray[2*p] + CArray[2*p+1]*1j                
- 
-            line_elem = dss.Transformers.Next()                
+        np.add.at(I_2, self._rcvNodeIdx, CArray[self._rcvCurrIdx])
         
         self._I_in  = I_1
         self._I_out = I_2
+        self._IDirty = False
         
         return I_1, I_2
 
 
+    def _calcSnapshot(self):
+        '''
+        Calculate V, I and S of all the registered probes
+
+        The Voltages, Currents and Powers arrays of each element are read
+        only once, no matter how many probes are registered on it
+
+        Returns
+        -------
+        V : numpy array
+        I : numpy array
+        S : numpy array
+        '''
+        nProbes = len(self._probes)
+        V = np.zeros(nProbes, dtype=complex)
+        I = np.zeros(nProbes, dtype=complex)
+        S = np.zeros(nProbes, dtype=complex)
+        for (cktElement, probeIdx) in self._probeGroups.items():
+            (_, _, _, offsets) = self._getElement(cktElement)
+            pos = [offsets[self._probes[k][1:]] // 2 for k in probeIdx]
+            VArray = np.ascontiguousarray(dss.CktElement.Voltages(), dtype=np.float64).view(np.complex128)
+            CArray = np.ascontiguousarray(dss.CktElement.Currents(), dtype=np.float64).view(np.complex128)
+            PArray = np.ascontiguousarray(dss.CktElement.Powers(), dtype=np.float64).view(np.complex128)
+            V[probeIdx] = VArray[pos]
+            I[probeIdx] = CArray[pos]
+            S[probeIdx] = PArray[pos]
+
+        self._snapshot = (V, I, S)
+        self._snapshotDirty = False
+
+        return V, I, S
+
+
+    def _invalidateSystemState(self):
+        '''
+        Mark all the quantities derived from the solution as outdated.
+        Each one is recalculated only when it is accessed
+        '''
+        self._VDirty = True
+        self._IDirty = True
+        self._VMagAnglePuDirty = True
+        self._snapshotDirty = True
+
+
+    def _getVckt(self):
+        '''
+        Return the node voltages of the last solution, calculating them if outdated
+        '''
+        if self._VDirty:
+            start = time.perf_counter()
+            self._calcVComplex()
+            self._recordPostTime('V', start)
+        return self._Vckt
+
+
+    def _getIinout(self):
+        '''
+        Return the input/output node currents of the last solution, calculating them if outdated
+        '''
+        if self._IDirty:
+            start = time.perf_counter()
+            self._calcInOutCurrent()
+            self._recordPostTime('I', start)
+        return self._I_in, self._I_out
+
+
+    def _getVMagAnglePuMap(self):
+        '''
+        Return the per node VMag and Angle of the last solution, calculating them if outdated
+        '''
+        if self._VMagAnglePuDirty:
+            #-- V is timed on its own
+            self._getVckt()
+            start = time.perf_counter()
+            self._calcVMagAnglePu()
+            self._recordPostTime('VMagAnglePu', start)
+        return self._VMagAnglePu
+
+
+    @_inContext
     def _updateSystemState(self):
         '''
         Method for execute all the operation necessary to update the system state after a change has happened
+        
+        Only the solution is calculated here. V, I_in/I_out and VMagAnglePu are
+        calculated on their first access after the solution
         '''
         #self._YMatrix = self._constructYMatrix()
+        self._solve()
+        self._invalidateSystemState()
+
+
+    def _solve(self, purpose='step'):
+        '''
+        Solve the circuit and record the solution statistics in the ring buffer
+
+        Parameters
+        ----------
+        purpose : str
+            'step' for the solutions of the simulation, 'startup' for the
+            solutions of the circuit loading, 'ymatrix' for the solutions
+            that extract the admittance matrix
+
+        Returns
+        -------
+        converged : boolean
+        '''
+        start = time.perf_counter()
         dss.Solution.Solve()
-        self.Vckt = self._calcVComplex()
-        (self._In, self._I_out) = self._calcInOutCurrent()
-        self._calcVMagAnglePu()
+        solveTime = time.perf_counter() - start
+
+        converged = dss.Solution.Converged()
+        self._nSolves += 1
+        if not converged:
+            self._nNotConverged += 1
+            logging.warning('Solution %s did not converge', self._nSolves)
+        record = {
+            'solve'      : self._nSolves,
+            'purpose'    : purpose,
+            'iterations' : dss.Solution.Iterations(),
+            'converged'  : converged,
+            'solveTime'  : solveTime,
+            'postTime'   : {}
+        }
+        self._solveStats.append(record)
+        if self._solveCallback is not None:
+            self._solveCallback(record)
+
+        return converged
+
+
+    def _recordPostTime(self, quantity, start):
+        '''
+        Add the time spent calculating a quantity derived from the solution
+        to the record of the last solution
+
+        Parameters
+        ----------
+        quantity : str
+            Name of the quantity
+        start : float
+            time.perf_counter() value when the calculation started
+        '''
+        if self._solveStats:
+            postTime = self._solveStats[-1]['postTime']
+            postTime[quantity] = postTime.get(quantity, 0.0) + time.perf_counter() - start
         
 
+    @_inContext
     def _runPF(self, ePQ=[]):
         '''
         Recalculate the system state
@@ -434,6 +1471,7 @@ class SimDSS(object):
         I_out   - Output current per node
         YMatrix - Admittance matrix
         '''
+        commands = []
         if ePQ == []:
             logging.debug('Running *runPF* for Inelastic load')
             #-- set system load using only inelastic load
@@ -442,7 +1480,7 @@ class SimDSS(object):
                                   ' Bus1='     + self._nodewithload[i][0] +
                                   ' kW='       + str(self._iPQ[i][0]) +
                                   ' kvar='     + str(self._iPQ[i][1]))       
-                dss.run_command(
+                commands.append(
                     'Edit Load.' + format(self._nodewithload[i][0]) + 
                     ' Bus1='     + self._nodewithload[i][0] +
                     ' kW='       + str(self._iPQ[i][0]) +
@@ -456,7 +1494,7 @@ class SimDSS(object):
                                   ' Bus1='     + self._nodewithload[i][0] +
                                   ' kW='       + str(self._iPQ[i][0] + ePQ[i][0]/1000) +
                                   ' kvar='     + str(self._iPQ[i][1] + ePQ[i][1]/1000))       
-                    dss.run_command(
+                    commands.append(
                         'Edit Load.' + format(self._nodewithload[i][0]) + 
                         ' Bus1='     + self._nodewithload[i][0] +
                         ' kW='       + str(self._iPQ[i][0] + ePQ[i][0]/1000) +
@@ -466,17 +1504,20 @@ class SimDSS(object):
                                   ' Bus1='     + self._nodewithload[i][0] +
                                   ' kW='       + str(self._iPQ[i][0]) +
                                   ' kvar='     + str(self._iPQ[i][1]))       
-                    dss.run_command(
+                    commands.append(
                         'Edit Load.' + format(self._nodewithload[i][0]) + 
                         ' Bus1='     + self._nodewithload[i][0] +
                         ' kW='       + str(self._iPQ[i][0]) +
-                        ' kvar='     + str(self._iPQ[i][1]))                                           
+                        ' kvar='     + str(self._iPQ[i][1]))
+
+        #-- all the loads are edited in one batch
+        self._runCommands(commands)
                     
         #-- solve circuit
-        dss.Solution.Solve()     
+        converged = self._solve()
         
         #-- if circuit converge
-        if dss.Solution.Converged():
+        if converged:
             
             #-- calculate V in the nodes
             V = self._calcVComplex()
@@ -485,8 +1526,8 @@ class SimDSS(object):
             (I_in, I_out) = self._calcInOutCurrent()
             
             #-- caculate YMatrix
-            #-- maybe not necessary because there was no topology change
-            YMatrix = self._constructYMatrix()
+            #-- only rebuilt if there was a topology change
+            YMatrix = self._updateYMatrix()
             
             #-- return Y, V, I1, I2
             return V, I_in, I_out, YMatrix
@@ -504,6 +1545,7 @@ class SimDSS(object):
     #--- GET ---#
     #-----------#
 
+    @_inContext
     def getnNodes(self):
         '''
         Return the number of nodes of the current circuit
@@ -516,6 +1558,7 @@ class SimDSS(object):
         return self._nNodes      
     
 
+    @_inContext
     def getNodeWithLoad(self):
         '''
         Retruns the list of nodes that have load
@@ -526,8 +1569,50 @@ class SimDSS(object):
         '''
         
         return self._nodewithload
+
+
+    @_inContext
+    def getLoadOrder(self):
+        '''
+        Get the node order of the load vectors of setLoadVector
+        
+        Returns
+        -------
+        nodeNames : list
+            Name of the nodes, None if the order was not set
+        '''
+        
+        return None if self._loadNames is None else list(self._loadNames)
+
+
+    @_inContext
+    def getVNodes(self):
+        '''
+        Return the complex voltage of each node (YNodeOrder) of the last solution
+        
+        Returns
+        -------
+        Vckt : numpy array
+        '''
+
+        return self._getVckt()
+
+
+    @_inContext
+    def getIinout(self):
+        '''
+        Return the complex input/output current of each node (YNodeOrder) of the last solution
+        
+        Returns
+        -------
+        I_in  : numpy array
+        I_out : numpy array
+        '''
+
+        return self._getIinout()
     
     
+    @_inContext
     def getCktElementState(self, cktElement, cktTerminal, cktPhase):
         '''
         Method to retrieve V and I from a circuit element.
@@ -550,24 +1635,19 @@ class SimDSS(object):
         IComp : Current complex number value for the specific, circuit element, terminal and phase 
         ''' 
         
-        #-- set element as active
-        dss.Circuit.SetActiveElement(cktElement)
-        
-        #-- get the number of terminals, conductors and phases           
-        nTerm   = dss.CktElement.NumTerminals()
-        nPhases = dss.CktElement.NumPhases()  
-        ndOrder = dss.CktElement.NodeOrder()             
-        elemNames = dss.Circuit.AllElementNames()
+        #-- set element as active and get the number of terminals and positions
+        (nTerm, _, _, offsets) = self._getElement(cktElement)
 
         #-- Verify if parameters are fine for the circuit
-        if cktElement.lower() not in (name.lower() for name in elemNames):
-            raise Exception('cktElement:', cktElement, ' not in the circuit')
         if cktTerminal > nTerm:
             raise Exception('ckTerminal value', cktTerminal, ' exceeds the number of terminals on this circuit element: {}'.format(nTerm))
         if cktTerminal < 1:
             raise Exception('ckTerminal value is invalid: {}'.format(cktTerminal))
         if cktPhase < 1:
             raise Exception('ckPhase value is invalid: {}'.format(cktPhase)) 
+        pos = offsets.get((cktTerminal, cktPhase))
+        if pos is None:
+            raise Exception('ckPhase value', cktPhase, ' not connected to terminal {}'.format(cktTerminal))
                      
        
         #-- Get voltages and currents
@@ -577,19 +1657,7 @@ class SimDSS(object):
         CArray = np.array(CArray)
         PArray = dss.CktElement.Powers()
         PArray = np.array(PArray)
-            
-        #-- calculate the position in the array
-        if cktTerminal == 1:
-            st = 0
-        else:
-            st = int(len(ndOrder) / 2)
-        idx = 0
-        while (idx < nPhases):
-            if (ndOrder[st+idx] == cktPhase):
-                pos = (st+idx)*2
-                break
-            idx = idx + 1
-        
+
         #-- extract values
         VComp = VArray[pos] + VArray[pos+1]*1j
         IComp = CArray[pos] + CArray[pos+1]*1j
@@ -598,20 +1666,134 @@ class SimDSS(object):
         return VComp, IComp, PComp
 
 
-    def getYMatrix(self):
+    @_inContext
+    def getSnapshot(self):
+        '''
+        Method to retrieve V, I and S of all the probes registered by addProbe.
+        The values are calculated once per solution
+
+        Returns
+        -------
+        V : numpy array
+            Voltage complex values, indexed by the probe index
+        I : numpy array
+            Current complex values, indexed by the probe index
+        S : numpy array
+            Power complex values, indexed by the probe index
+        '''
+
+        if self._snapshotDirty:
+            start = time.perf_counter()
+            self._calcSnapshot()
+            self._recordPostTime('snapshot', start)
+        return self._snapshot
+
+
+    @_inContext
+    def getSkippedSolves(self):
+        '''
+        Return the number of solutions skipped by the solve deadband
+        
+        Returns
+        -------
+        skippedSolves : int
+        '''
+
+        return self._skippedSolves
+
+
+    @_inContext
+    def getSolveStats(self):
+        '''
+        Return summary statistics of the solutions. The counters cover all the
+        solutions, the remaining statistics the solutions in the ring buffer.
+        The solutions made while loading the circuit and extracting the
+        admittance matrix are included, the purpose of each record tells
+        them apart from the simulation steps
+
+        Returns
+        -------
+        stats : dict
+            solves, notConverged, buffered, iterations (mean, max),
+            solveTime (total, mean, max) and postTime (total per quantity)
+        '''
+
+        iterations = np.array([rec['iterations'] for rec in self._solveStats], dtype=np.float64)
+        solveTime  = np.array([rec['solveTime'] for rec in self._solveStats], dtype=np.float64)
+        postTime = {}
+        for rec in self._solveStats:
+            for (quantity, value) in rec['postTime'].items():
+                postTime[quantity] = postTime.get(quantity, 0.0) + value
+
+        stats = {
+            'solves'       : self._nSolves,
+            'notConverged' : self._nNotConverged,
+            'buffered'     : len(self._solveStats),
+            'iterations'   : {
+                'mean' : float(iterations.mean()) if len(iterations) else 0.0,
+                'max'  : int(iterations.max()) if len(iterations) else 0
+            },
+            'solveTime'    : {
+                'total' : float(solveTime.sum()),
+                'mean'  : float(solveTime.mean()) if len(solveTime) else 0.0,
+                'max'   : float(solveTime.max()) if len(solveTime) else 0.0
+            },
+            'postTime'     : postTime
+        }
+
+        return stats
+
+
+    @_inContext
+    def getYMatrix(self, sparse=False):
         '''
         Return the admittance matrix
         
+        The matrix is cached and only recalculated after a topology or
+        transformer tap change. Rows and columns follow getYNodeOrder().
+        The matrix is shared with the cache, so it is read-only: a later
+        change of the circuit gives a new matrix, the returned one is kept
+
+        Parameters
+        ----------
+        sparse : bool
+            If True, return the scipy.sparse csc_matrix instead of a dense array
         
         Returns
         -------
-        YMatrix : numpy array
+        YMatrix : numpy array or scipy.sparse csc_matrix
                 It returns a complex array of Y admittance matrix in node order
         '''        
 
-        return self._constructYMatrix()
+        YMatrix = self._updateYMatrix()
+        if sparse:
+            for array in (YMatrix.data, YMatrix.indices, YMatrix.indptr):
+                array.setflags(write=False)
+            return YMatrix
+        if self._YMatrixDense is None:
+            self._YMatrixDense = YMatrix.toarray()
+            self._YMatrixDense.setflags(write=False)
+
+        return self._YMatrixDense
+
+
+    @_inContext
+    def getYNodeOrder(self):
+        '''
+        Return the node names labelling the rows and columns of the admittance matrix
+        
+        Returns
+        -------
+        NodeList : list
+        '''
+
+        if self._YNodeMapVersion != self._topoVersion:
+            self._mapYNodes()
+
+        return self._YNodeList
     
     
+    @_inContext
     def getTrafoTap(self, cktTrafo):
         '''
         Get the TAP of the tranformer cktTrafo
@@ -635,6 +1817,7 @@ class SimDSS(object):
         return dss.Transformers.Tap()   
  
     
+    @_inContext
     def getPQ(self, cktElement):
         '''
         Method to retrieve P and Q from a element
@@ -662,6 +1845,7 @@ class SimDSS(object):
         return dss.Loads.kW(), dss.Loads.kvar()        
         
         
+    @_inContext
     def getSwitch(self,cktElement, cktTerminal, cktPhase):
         '''
         Get postion of a specified terminal conductor switch. All conductors in the terminals of all circuit
@@ -684,21 +1868,13 @@ class SimDSS(object):
         ''' 
         
         #-- Verify if parameters are fine for the circuit
-        nameLines = cktElement.split('.')[1]
-        LineList = dss.Lines.AllNames()
-        if nameLines.lower() not in LineList:
+        if not cktElement.lower().startswith('line.'):
             raise Exception('cktTrafo:', cktElement, ' not in the circuit')
         
-        #-- set element as active
-        dss.Circuit.SetActiveElement(cktElement)            
-
-        #-- get the number of terminals, conductors and phases
-        nTerm   = dss.CktElement.NumTerminals()   
-        elemNames = dss.Circuit.AllElementNames()
+        #-- set element as active and get the number of terminals
+        (nTerm, _, _, _) = self._getElement(cktElement)
 
         #-- Verify if parameters are fine for the circuit
-        if cktElement.lower() not in (name.lower() for name in elemNames):
-            raise Exception('cktElement:', cktElement, ' not in the circuit')
         if cktTerminal > nTerm:
             raise Exception('ckTerminal value', cktTerminal, ' exceeds the number of terminals on this circuit element: {}'.format(nTerm))
         if cktTerminal < 1:
@@ -711,6 +1887,7 @@ class SimDSS(object):
         return pos 
  
 
+    @_inContext
     def getVMagAnglePu(self, cktElement, cktPhase):
         '''
         Method to retrieve VMag and Angle from a node in a bus
@@ -729,15 +1906,17 @@ class SimDSS(object):
         Angle : Angle of voltage 
         ''' 
         
+        VMagAnglePu = self._getVMagAnglePuMap()
+
         #-- Verify if parameters are fine for the circuit
-        BusNames = dss.Circuit.AllBusNames()
-        if (cktElement.lower() not in BusNames):
+        if (cktElement.lower() not in self._busNodes):
             raise Exception('cktElement:', cktElement, ' not in the circuit')
         if cktPhase < 1:
             raise Exception('ckPhase value is invalid: {}'.format(cktPhase)) 
         
-        if (cktPhase in (self._VMagAnglePu[cktElement.lower()]).keys()):
-            return self._VMagAnglePu[cktElement.lower()][cktPhase]['VMag'], self._VMagAnglePu[cktElement.lower()][cktPhase]['Angle']
+        slot = self._busPhase2slot.get((cktElement.lower(), cktPhase))
+        if (slot is not None):
+            return VMagAnglePu[slot, 0], VMagAnglePu[slot, 1]
         else:
             raise Exception('ckPhase does not exist for this node bus')
 
@@ -747,6 +1926,7 @@ class SimDSS(object):
     #--- SET ---#
     #-----------#
 
+    @_inContext
     def setLoads(self, ePQ):
         '''
         Update circuit state with new set of loads. Add new load set to the 
@@ -758,41 +1938,291 @@ class SimDSS(object):
             Array with <nodeName, P, Q> tuples for each node in the system        
         '''
         
-        #-- for each load record received
-        for i in range(len(ePQ)):
-            #-- extract the node 
-            nodeName = ePQ[i][0]
-            #-- find the index according to terminal2node map
-            idx = self._terminal2node[nodeName]
-            #-- if the number of homes in the load is greater than zero 
-            if self._nodewithload[nodeName] > 0:
-                if (self._hasIPQ == True):
-                    logging.debug('New Load.' + nodeName +
-                                  ' Bus1='    + nodeName +
-                                  ' kW='      + str(self._iPQ[idx][0] + ePQ[i][1]) +
-                                  ' kvar='    + str(self._iPQ[idx][1] + ePQ[i][2]))                  
-                    
-                    dss.run_command(
-                        'New Load.' + nodeName + 
-                        ' Bus1='    + nodeName +
-                        ' kW='      + str(self._iPQ[idx][0] + ePQ[i][1]) +
-                        ' kvar='    + str(self._iPQ[idx][1] + ePQ[i][2]))
-                else:
-                    logging.debug('New Load.' + nodeName +
-                                  ' Bus1='    + nodeName +
-                                  ' kW='      + str(ePQ[i][1]) +
-                                  ' kvar='    + str(ePQ[i][2]))                  
-                    
-                    dss.run_command(
-                        'New Load.' + nodeName + 
-                        ' Bus1='    + nodeName +
-                        ' kW='      + str(ePQ[i][1]) +
-                        ' kvar='    + str(ePQ[i][2]))                    
-                
-        #-- after setting a new load, a new system state has to be calculated
-        self._updateSystemState()
+        nodeNames = [rec[0] for rec in ePQ]
+        P = np.array([rec[1] for rec in ePQ], dtype=np.float64)
+        Q = np.array([rec[2] for rec in ePQ], dtype=np.float64)
 
+        #-- loads are created and indexed only once for the same set of nodes
+        if nodeNames != self._loadNames:
+            self._mapLoads(nodeNames, P, Q)
 
+        self._applyLoads(P, Q)
+
+
+    @_inContext
+    def setLoadOrder(self, nodeNames):
+        '''
+        Fix the node order of the load vectors given to setLoadVector. The
+        loads of the nodes are created and indexed here, once
+
+        Parameters
+        ----------
+        nodeNames : list
+            Name of the nodes, in the order of the load vectors
+        '''
+
+        nodeNames = list(nodeNames)
+        if nodeNames != self._loadNames:
+            zeros = np.zeros(len(nodeNames))
+            self._mapLoads(nodeNames, zeros, zeros)
+
+
+    @_inContext
+    def setLoadVector(self, P, Q):
+        '''
+        Update circuit state with new set of loads given as arrays aligned to
+        the node order fixed by setLoadOrder (or by the last setLoads). Same as
+        setLoads, without building and matching the <nodeName, P, Q> tuples
+
+        Parameters
+        ----------
+        P : numpy array
+            P (kW) of the elastic load of each node
+        Q : numpy array
+            Q (kvar) of the elastic load of each node
+        '''
+
+        if self._loadNames is None:
+            raise Exception('There is no node order, use setLoadOrder first')
+        P = np.asarray(P, dtype=np.float64)
+        Q = np.asarray(Q, dtype=np.float64)
+        if (P.shape != (len(self._loadNames),)) or (Q.shape != P.shape):
+            raise Exception('P/Q size is invalid: {} {} (expected {})'.format(P.shape, Q.shape, len(self._loadNames)))
+
+        self._applyLoads(P, Q)
+
+
+    @_inContext
+    def setLoadShapes(self, nodeNames, P, Q, stepSize=1.0):
+        '''
+        Register a whole load profile as OpenDSS LoadShapes, to be solved by
+        runTimeSeries. Each node with load gets a LoadShape with the actual
+        P and Q (elastic load plus inelastic load) of every step, assigned as
+        the duty cycle shape of its load
+
+        Parameters
+        ----------
+        nodeNames : list
+            Name of the nodes, in the row order of P and Q
+        P : numpy array
+            P (kW) of the elastic load, with dimension (len(nodeNames) x nSteps)
+        Q : numpy array
+            Q (kvar) of the elastic load, with dimension (len(nodeNames) x nSteps)
+        stepSize : float
+            Time step (s) between two points of the profile
+        '''
+
+        nodeNames = list(nodeNames)
+        P = np.atleast_2d(np.asarray(P, dtype=np.float64))
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float64))
+        if (P.shape != Q.shape) or (P.shape[0] != len(nodeNames)) or (P.shape[1] == 0):
+            raise Exception('P/Q profile shape is invalid: {} {}'.format(P.shape, Q.shape))
+        if stepSize <= 0:
+            raise Exception('stepSize value is invalid: {}'.format(stepSize))
+
+        #-- the loads are created and indexed as setLoads does
+        if nodeNames != self._loadNames:
+            self._mapLoads(nodeNames, P[:, 0], Q[:, 0])
+
+        kW   = P[self._loadSel]
+        kvar = Q[self._loadSel]
+        if (self._hasIPQ == True):
+            kW   = self._iPQ[self._loadNodeIdx, 0][:, None] + kW
+            kvar = self._iPQ[self._loadNodeIdx, 1][:, None] + kvar
+
+        shapeNames = set(name.lower() for name in dss.LoadShape.AllNames())
+        for k in range(len(self._loadHandles)):
+            shapeName = 'simdss_{}'.format(self._loadHandles[k])
+            if shapeName in shapeNames:
+                dss.LoadShape.Name(shapeName)
+            else:
+                dss.LoadShape.New(shapeName)
+            dss.LoadShape.Npts(kW.shape[1])
+            dss.LoadShape.HrInterval(stepSize / 3600.0)
+            dss.LoadShape.UseActual(True)
+            dss.LoadShape.PMult(kW[k])
+            dss.LoadShape.QMult(kvar[k])
+            dss.Loads.Idx(self._loadHandles[k])
+            dss.Loads.Duty(shapeName)
+
+        self._shapekW       = kW
+        self._shapekvar     = kvar
+        self._shapeStepSize = float(stepSize)
+
+
+    @_inContext
+    def runTimeSeries(self, nSteps=None, start=0):
+        '''
+        Solve a span of steps of the load profile registered by setLoadShapes
+        in the duty cycle mode of the engine. The whole span is solved by one
+        Solve call: the loads of each step are taken by the engine from the
+        LoadShapes, and the node voltages of each step are recorded by
+        monitors and read once at the end. At the end, also on an error, the
+        circuit is back in snapshot mode and the monitors are disabled, with
+        the loads and the solution of the last step
+
+        The monitors keep the values in single precision, so the voltages
+        have about 7 significant digits. The solution statistics get one
+        record for the whole span, with the iterations of the last step
+
+        Parameters
+        ----------
+        nSteps : int
+            Number of steps to solve, up to the end of the profile if None
+        start : int
+            Index of the first step in the profile
+
+        Returns
+        -------
+        V : numpy array
+            complex node voltages with dimension (nSteps x nNodes), columns in YNodeOrder
+        '''
+
+        if self._shapekW is None:
+            raise Exception('There is no load profile, use setLoadShapes first')
+        nPoints = self._shapekW.shape[1]
+        if nSteps is None:
+            nSteps = nPoints - start
+        if (start < 0) or (nSteps < 1) or (start + nSteps > nPoints):
+            raise Exception('steps are invalid: start={} nSteps={} (profile with {} steps)'.format(start, nSteps, nPoints))
+
+        if self._tsMonitorVersion != self._topoVersion:
+            self._mapTimeSeriesMonitors()
+
+        V = np.empty((nSteps, int(self._nNodes)), dtype=np.complex128)
+        try:
+            self._enableTimeSeriesMonitors(True)
+            #-- each step advances the time before solving: the engine time of
+            #-- point k of the shapes is (k + 1) * stepSize
+            dss.Solution.Mode(CKTSolveMode.DUTY.value)
+            dss.Solution.StepSize(self._shapeStepSize)
+            dss.Solution.Number(nSteps)
+            dss.Solution.Hour(0)
+            dss.Solution.Seconds(start * self._shapeStepSize)
+            self._solve()
+            #-- read the monitors before leaving the mode, a mode change
+            #-- resets them. Monitor stream: 272 bytes of header, then the
+            #-- float32 records of hour, seconds and the channels
+            for (monitor, cols, slots) in self._tsMonitors:
+                dss.Monitors.Name(monitor)
+                stream = np.array(dss.Monitors.ByteStream(), dtype=np.int8)
+                recordSize = int(stream[:12].view(np.int32)[2]) + 2
+                data = stream[272:].view(np.float32).reshape((-1, recordSize))
+                if data.shape[0] != nSteps:
+                    raise Exception('Monitor {} has {} samples for {} steps'.format(monitor, data.shape[0], nSteps))
+                V[:, slots] = data[:, cols] + 1j*data[:, cols + 1]
+        finally:
+            #-- leave the circuit as before the run: snapshot mode and no
+            #-- active monitor of this class
+            dss.Solution.Mode(CKTSolveMode.SNAP.value)
+            dss.Solution.Number(1)
+            self._enableTimeSeriesMonitors(False)
+
+        #-- the time modes take the load from the shapes: leave the loads
+        #-- as set by the last step, so the next snapshot solution agrees
+        last = start + nSteps - 1
+        self._pushLoads(self._shapekW[:, last], self._shapekvar[:, last])
+        self._solvedkW   = self._shapekW[:, last].copy()
+        self._solvedkvar = self._shapekvar[:, last].copy()
+        self._invalidateSystemState()
+
+        return V
+
+
+    @_inContext
+    def setYMatrixIncremental(self, enable=True):
+        '''
+        Enable/disable the incremental update of the admittance matrix.
+        When enabled, a tap change patches the cached YMatrix with the change
+        of the transformer primitive Y, instead of rebuilding the whole matrix
+        
+        Parameters
+        ----------
+        enable : bool
+            True to enable the incremental update
+        '''
+        
+        self._YIncremental = bool(enable)
+
+
+    @_inContext
+    def addProbe(self, cktElement, cktTerminal, cktPhase):
+        '''
+        Register a probe to be sampled by getSnapshot.
+        cktTerminal must be 1 or 2
+        cktPhase must be 1, 2 or 3. The case of ground conductor is not addressed
+
+        Parameters
+        ----------
+        cktElement : str
+            Name of the circuit element to probe
+        cktTerminal : int
+            Number to designate the terminal of the element to probe
+            1 - BUS1, 2 - BUS2
+        cktPhase : int
+            Phase number
+
+        Returns
+        -------
+        probeIdx : int
+            Position of the probe in the arrays returned by getSnapshot
+        '''
+
+        key = (cktElement.lower(), cktTerminal, cktPhase)
+        if key in self._probeIndex:
+            return self._probeIndex[key]
+
+        #-- Verify if parameters are fine for the circuit
+        self.getCktElementState(cktElement, cktTerminal, cktPhase)
+
+        probeIdx = len(self._probes)
+        self._probes.append((cktElement, cktTerminal, cktPhase))
+        self._probeIndex[key] = probeIdx
+        self._probeGroups.setdefault(key[0], []).append(probeIdx)
+        self._snapshotDirty = True
+
+        return probeIdx
+
+
+    @_inContext
+    def setSolveDeadband(self, deadband=0.0):
+        '''
+        Set the solve deadband. When the norm of the change of the loads, since
+        the last solution, is below the deadband, setLoads keeps the last solution
+        and the circuit loads. A tap operation that does not move the tap does not
+        solve either. The skipped solutions are counted by getSkippedSolves
+
+        Parameters
+        ----------
+        deadband : float
+            Norm (kVA) of the change of the loads. 0 disables the deadband
+        '''
+
+        if deadband < 0:
+            raise Exception('deadband value is invalid: {}'.format(deadband))
+        self._solveDeadband = float(deadband)
+
+
+    @_inContext
+    def setSolveStats(self, size=1000, callback=None):
+        '''
+        Configure the solution statistics. The ring buffer is cleared
+
+        Parameters
+        ----------
+        size : int
+            Number of solution records kept in the ring buffer
+        callback : callable
+            Function called with the record (dict) of each solution, or None
+        '''
+
+        if size < 1:
+            raise Exception('size value is invalid: {}'.format(size))
+        self._solveStats    = deque(maxlen=int(size))
+        self._solveCallback = callback
+
+
+    @_inContext
     def setSwitch(self, operation, cktElement, cktTerminal, cktPhase):
         '''
         Open/Close a specified terminal conductor switch. All conductors in the terminals of all circuit
@@ -815,16 +2245,10 @@ class SimDSS(object):
         if operation not in [0, 1]:
             raise Exception('Switch Operation:', operation, ' not valid')    
 
-        #-- set element as active
-        dss.Circuit.SetActiveElement(cktElement)            
-
-        #-- get the number of terminals, conductors and phases 
-        nTerm   = dss.CktElement.NumTerminals()   
-        elemNames = dss.Circuit.AllElementNames()
+        #-- set element as active and get the number of terminals
+        (nTerm, _, _, _) = self._getElement(cktElement)
 
         #-- Verify if parameters are fine for the circuit
-        if cktElement.lower() not in (name.lower() for name in elemNames):
-            raise Exception('cktElement:', cktElement, ' not in the circuit')
         if cktTerminal > nTerm:
             raise Exception('ckTerminal value', cktTerminal, ' exceeds the number of terminals on this circuit element: {}'.format(nTerm))
         if cktTerminal < 1:
@@ -838,9 +2262,15 @@ class SimDSS(object):
             dss.CktElement.Close(cktTerminal, cktPhase)
 
         #-- topology change. Need a new solution
+        #-- the elements are the same, so the element index is kept
+        elemIndexValid = (self._elemMapVersion == self._topoVersion)
+        self._topoVersion += 1
+        if elemIndexValid:
+            self._elemMapVersion = self._topoVersion
         self._updateSystemState()
 
 
+    @_inContext
     def setTrafoTap(self, cktTrafo, tapOrientation=0, tapUnits=1):
         '''
         Decrease one TAP to the tranformer cktTrafo
@@ -875,16 +2305,33 @@ class SimDSS(object):
             
         newtap  = curtap + tapOrientation * ((maxtap - mintap)/numtaps) * tapUnits        
 
+        #-- the tap does not move, the last solution is kept
+        if (self._solveDeadband > 0) and (newtap == curtap):
+            self._skippedSolves += 1
+            return
+
         if(newtap > mintap and newtap < maxtap):        
+            #-- YMatrix is up to date and can be patched instead of rebuilt
+            patchY = (self._YIncremental and 
+                      self._YMatrixVersion == (self._topoVersion, self._tapVersion))
+            if patchY:
+                (YPrimOld, _) = self._getYPrim('Transformer.' + nameTrafo)
+                dss.Transformers.Name(nameTrafo)
             dss.Transformers.Tap(newtap)
             curtap  = dss.Transformers.Tap()
+            self._tapVersion += 1
             self._updateSystemState()
+            if patchY:
+                (YPrimNew, nodes) = self._getYPrim('Transformer.' + nameTrafo)
+                self._patchYMatrix(YPrimNew - YPrimOld, nodes)
+                self._YMatrixVersion = (self._topoVersion, self._tapVersion)
     
     
     #------------#
     #--- SHOW ---#
     #------------#
 
+    @_inContext
     def showLoads(self):
         '''
         Print a formatted version for P and Q values per node, using openDSS format
@@ -907,48 +2354,53 @@ class SimDSS(object):
             load_elem = dss.Loads.Next()           
 
 
+    @_inContext
     def showVNodes(self):
         '''
         Print a formatted version of the voltage per node
         '''
         
+        Vckt = self._getVckt()
         print('Show Voltage by node')
         for i in range(int(self._nNodes)):
             nodeName = list(self._terminal2node.keys())[list(self._terminal2node.values()).index(i)] 
-            print(nodeName.ljust(12), "({0.real:15.4f} + {0.imag:15.4f}i)".format(self._Vckt[i],4), "{:13.4f}".format(np.abs(self._Vckt[i])))       
+            print(nodeName.ljust(12), "({0.real:15.4f} + {0.imag:15.4f}i)".format(Vckt[i],4), "{:13.4f}".format(np.abs(Vckt[i])))       
 
 
+    @_inContext
     def showIinout(self):
         '''
         Print a formatted version of the Input/Output current per node
         '''
 
+        (I_in, I_out) = self._getIinout()
         print('Show I2 / I1 Currents by node')
         print('Receiver side         I2-Real       I2-Imaginary  |  Sender side           I1-Real       I1-Imaginary')
         print('-----------------------------------------------------------------------------------------------------')
         for i in range(int(self._nNodes)):
             nodeName = list(self._terminal2node.keys())[list(self._terminal2node.values()).index(i)]        
             print(nodeName.ljust(12), 
-                  "({0.real:15.4f} + {0.imag:15.4f}i)".format(self._I_out[i],4), '               ',
-                  "({0.real:15.4f} + {0.imag:15.4f}i)".format(self._I_in[i],4))
+                  "({0.real:15.4f} + {0.imag:15.4f}i)".format(I_out[i],4), '               ',
+                  "({0.real:15.4f} + {0.imag:15.4f}i)".format(I_in[i],4))
 
 
+    @_inContext
     def showVMagAnglePu(self):
         '''
         Print a formatted version for VMag and Angle values per node in p.u.
         '''
         print('VMag and Angle in Pu (L-N): ')
-        BusNames = dss.Circuit.AllBusNames()
-        for bus in BusNames:
-            Nodes = self._VMagAnglePu[bus].keys()
+        VMagAnglePu = self._getVMagAnglePuMap()
+        for (bus, Nodes) in self._busNodes.items():
             print(bus.ljust(10), end=" ")
-            for nd in Nodes:
+            for (nd, slot) in Nodes:
                 print("Phase:", nd,  end = " ")
-                print("VMag:",  "{:6.4f}".format(np.round(self._VMagAnglePu[bus][nd]['VMag'],4)), end = " ")
-                print("Angle:", "{:7.2f}".format(np.round(self._VMagAnglePu[bus][nd]['Angle'],2)), end = "   ")
+                print("VMag:",  "{:6.4f}".format(np.round(VMagAnglePu[slot, 0],4)), end = " ")
+                print("Angle:", "{:7.2f}".format(np.round(VMagAnglePu[slot, 1],2)), end = "   ")
             print("")
 
 
+    @_inContext
     def showYMatrixDiff(self):
         '''
         Show the admittance matrix difference
@@ -957,20 +2409,26 @@ class SimDSS(object):
         def R2P(x):
             return np.abs(x), np.angle(x)
         
-        Ydiff = self._YMatrix - self._YMatrixPrev
-        (i,j) = np.where(Ydiff != 0)    
+        self._updateYMatrix()
+        if self._YMatrixDiff is None:
+            return
+
+        (i,j,dY) = sp.find(self._YMatrixDiff)
         n = len(i)
         for k in range(n):
-            print('RECT  ', k, i[k], j[k], self._YMatrixPrev[i[k],j[k]], self._YMatrix[i[k],i[k]])
-            print('POLAR ', k, i[k], j[k], R2P(self._YMatrixPrev[i[k],j[k]]), R2P(self._YMatrix[i[k],i[k]]))
+            Y     = self._YMatrix[i[k],j[k]]
+            YPrev = Y - dY[k]
+            print('RECT  ', k, i[k], j[k], YPrev, Y)
+            print('POLAR ', k, i[k], j[k], R2P(YPrev), R2P(Y))
 
     
+    @_inContext
     def showYMatrix(self):
         '''
         Print a formatted version of the admittance matrix
         '''   
 
-        YMatrix = self._constructYMatrix()
+        YMatrix = self.getYMatrix()
         NList = dss.Circuit.YNodeOrder()
         print('Show Admitance Matrix - Size:', YMatrix.shape)
         print(" ".ljust(13), end = '')
@@ -989,64 +2447,99 @@ class SimDSS(object):
     #--- CREATE ---#
     #--------------#
 
-    def createAdjMatrix(self, fname):
+    @_inContext
+    def createSolveStats(self, fname):
+        '''
+        Method to save the solution statistics of the run in a JSON file:
+        the summary (getSolveStats) and the records in the ring buffer
+        
+        Parameters
+        ----------
+        fname : str
+            Name of the file to save the statistics
+        
+        Returns
+        -------
+        None
+        '''
+
+        with open(fname, 'w') as f:
+            json.dump({'summary': self.getSolveStats(),
+                       'solves' : list(self._solveStats)}, f, indent=2)
+
+
+    @_inContext
+    def createAdjMatrix(self, fname, dense=False):
         '''
         Method to save adjacency matrix of the eletric network
         The circuit must have been already loaded
+
+        The lines and transformers are the edges between their first two buses.
+        By default the topology is saved sparse, in a numpy .npz file read
+        back by loadAdjMatrix, with:
+            busNames  - bus names, the node index of the graph
+            edges     - (nEdges x 2) bus indexes (from, to) of each element
+            edgeNames - element name of each edge
+            indptr, indices - CSR structure of the symmetric adjacency matrix
+            edgeIdx   - edge of each entry of indices (the first element
+                        between the two buses)
         
         Parameters
         ----------
         fname : str
-            Name of the file to save the matrix
+            Name of the file to save the matrix (.npz is added by numpy if missing)
+        dense : bool
+            If True, save the dense (nBuses x nBuses) 0/1 text matrix instead
         
         Returns
         -------
         None
         ''' 
 
-        ''' extract all bus names and attribute an index '''
+        #-- extract all bus names and attribute an index
         bus_names = dss.Circuit.AllBusNames()
-        
-        ''' create adj matrix all zero '''
-        adjMatrix = np.zeros((len(bus_names), len(bus_names)), dtype=bool)
-        edgeList = []
-        
-        ''' list all lines and extract src/dst '''
-        ''' populate a links list without duplication'''
-        ''' add 1 to matrix index src-dst and dst-src '''
-        line_elem = dss.Lines.First()
-        while line_elem > 0:
-            lName = dss.Lines.Name()
-            blist = dss.CktElement.BusNames()
-            src = blist[0].split('.')[0]
-            dst = blist[1].split('.')[0]
-            pos_src = bus_names.index(src)
-            pos_dst = bus_names.index(dst)
-            adjMatrix[pos_src, pos_dst] = True
-            adjMatrix[pos_dst, pos_src] = True
-            if ((pos_src, pos_dst)) not in edgeList:
-                edgeList.append((pos_src, pos_dst))
-            print(lName,  src, dst)
-            line_elem = dss.Lines.Next()     
-                 
-        ''' repeat for all transformers '''
-        transf_elem = dss.Transformers.First()
-        while transf_elem > 0:
-            lName = dss.Transformers.Name()
-            blist = dss.CktElement.BusNames()
-            src = blist[0].split('.')[0]
-            dst = blist[1].split('.')[0]
-            pos_src = bus_names.index(src)
-            pos_dst = bus_names.index(dst)
-            adjMatrix[pos_src, pos_dst] = True
-            adjMatrix[pos_dst, pos_src] = True
-            if ((pos_src, pos_dst)) not in edgeList:
-                edgeList.append((pos_src, pos_dst))
-            print(lName,  src, dst)
-            transf_elem = dss.Transformers.Next()             
-            
-        ''' save adj matrix file '''
-        np.savetxt(fname, adjMatrix, fmt='%d')
+        busIdx = {bus_names[k].lower(): k for k in range(len(bus_names))}
+
+        #-- list all lines and transformers and extract src/dst
+        edgeNames, src, dst = [], [], []
+        for iface in (dss.Lines, dss.Transformers):
+            elem = iface.First()
+            while elem > 0:
+                blist = dss.CktElement.BusNames()
+                edgeNames.append(dss.CktElement.Name())
+                src.append(busIdx[blist[0].split('.')[0].lower()])
+                dst.append(busIdx[blist[1].split('.')[0].lower()])
+                logging.debug('%s %s %s', edgeNames[-1], blist[0], blist[1])
+                elem = iface.Next()
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+
+        #-- both directions of each edge, sorted by row, column and edge:
+        #-- the first entry of each (row, column) is kept
+        nBuses = len(bus_names)
+        rows = np.concatenate((src, dst))
+        cols = np.concatenate((dst, src))
+        eIdx = np.concatenate((np.arange(len(src)), np.arange(len(src))))
+        order = np.lexsort((eIdx, cols, rows))
+        rows, cols, eIdx = rows[order], cols[order], eIdx[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows, cols, eIdx = rows[first], cols[first], eIdx[first]
+        indptr = np.zeros(nBuses + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=nBuses), out=indptr[1:])
+
+        if dense:
+            adjMatrix = np.zeros((nBuses, nBuses), dtype=bool)
+            adjMatrix[rows, cols] = True
+            np.savetxt(fname, adjMatrix, fmt='%d')
+        else:
+            np.savez_compressed(fname,
+                                busNames  = np.array(bus_names, dtype=str),
+                                edges     = np.stack((src, dst), axis=1),
+                                edgeNames = np.array(edgeNames, dtype=str),
+                                indptr    = indptr,
+                                indices   = cols,
+                                edgeIdx   = eIdx)
         
 
 if __name__ == '__main__':
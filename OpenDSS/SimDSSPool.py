@@ -0,0 +1,371 @@
+'''
+ # Process pool of SimDSS workers for Monte Carlo load studies
+'''
+
+import logging
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def _attachResults(shms, name, nScenarios, nNodes):
+    '''
+    Attach to the results shared memory block of a batch, reusing the
+    attachment of the previous tasks of the same batch
+
+    Returns
+    -------
+    results : numpy array
+        (3 x nScenarios x nNodes) complex view of the block: V, I_in, I_out
+    '''
+    if name not in shms:
+        for shm in shms.values():
+            shm.close()
+        shms.clear()
+        shms[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray((3, nScenarios, nNodes), dtype=np.complex128, buffer=shms[name].buf)
+
+
+def _worker(topofile, nwlfile, ilpqfile, loadGenParams, tasks, results):
+    '''
+    Worker process: compile its own copy of the circuit and solve the
+    scenarios received in tasks, writing V, I_in and I_out to shared memory
+
+    Parameters
+    ----------
+    topofile, nwlfile, ilpqfile : str
+        Files given to SimDSS
+    loadGenParams : dict
+        LoadGenerator parameters, or None if only ePQ batches are solved
+    tasks : multiprocessing Queue
+        (shmName, nScenarios, first, scenarios) tuples, None to stop
+    results : multiprocessing Queue
+        ('ready', nNodes), ('done', first, notConverged) or ('error', message)
+    '''
+    #-- the engine is global: import it only in the worker
+    import opendssdirect as dss
+    from opendssdirect._utils import ffi
+    from SimDSS import SimDSS
+    from LoadGenerator import LoadGenerator
+
+    try:
+        dss.utils.set_numpy_buffers(True)
+        dssObj = SimDSS(topofile, nwlfile, ilpqfile)
+        objLoadGen = None
+        if loadGenParams is not None:
+            objLoadGen = LoadGenerator(nwlfile, **loadGenParams)
+        #-- every scenario starts from the same tap positions and the same
+        #-- initial voltages, the solver starts from the previous solution
+        taps = []
+        trafo = dss.Transformers.First()
+        while trafo > 0:
+            taps.append((dss.Transformers.Name(), dss.Transformers.Tap()))
+            trafo = dss.Transformers.Next()
+        V0 = np.array(dss.YMatrix.getV(), dtype=np.float64).tobytes()
+        nNodes = dssObj.getnNodes()
+    except BaseException as e:
+        results.put(('error', 'worker start: {}'.format(e)))
+        return
+    results.put(('ready', nNodes))
+
+    shms = {}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        (shmName, nScenarios, first, scenarios) = task
+        try:
+            out = _attachResults(shms, shmName, nScenarios, nNodes)
+            notConverged = 0
+            for k in range(len(scenarios)):
+                for (name, tap) in taps:
+                    dss.Transformers.Name(name)
+                    dss.Transformers.Tap(tap)
+                ffi.memmove(dss.YMatrix.VVector(), V0, len(V0))
+                (kind, value) = scenarios[k]
+                if kind == 'seed':
+                    (seed, nSteps) = value
+                    objLoadGen.reset(seed)
+                    for step in range(nSteps):
+                        ePQ = objLoadGen.createLoads()
+                else:
+                    ePQ = value
+                dssObj.setLoads(ePQ)
+                (I_in, I_out) = dssObj.getIinout()
+                out[0, first + k] = dssObj.getVNodes()
+                out[1, first + k] = I_in
+                out[2, first + k] = I_out
+                if not dss.Solution.Converged():
+                    notConverged += 1
+            del out
+            results.put(('done', first, notConverged))
+        except BaseException as e:
+            results.put(('error', 'scenario {}: {}'.format(first, e)))
+
+    for shm in shms.values():
+        shm.close()
+
+
+class SimDSSPool(object):
+
+    '''
+    Pool of worker processes, each one with its own compiled copy of the
+    circuit, to solve batches of load scenarios in parallel
+
+    The OpenDSS engine is global to a process, so parallel power flows need
+    one process per engine. The results are written by the workers directly
+    into a shared memory block, and only the scenario inputs are sent
+    through the task queue. Every scenario starts from the tap positions and
+    node voltages of the compiled circuit, so the result of a scenario does
+    not depend on the worker that solves it or on the scenarios solved before it
+
+    Attributes
+    ----------
+    _nWorkers      : int
+        number of worker processes
+    _workers       : list
+        worker processes
+    _tasks         : multiprocessing Queue
+        scenarios to be solved
+    _results       : multiprocessing Queue
+        completion messages of the workers
+    _nNodes        : int
+        number of nodes in the circuit
+    _chunkSize     : int
+        maximum number of scenarios sent in one task
+    _pollInterval  : float
+        time (s) waiting for a message before checking that the workers are alive
+    '''
+
+    _pollInterval = 1.0
+
+
+    def __init__(self, topofile, nwlfile, ilpqfile = "", nWorkers = None, loadGenParams = None, chunkSize = 16):
+        '''
+        Start the workers and wait until all of them compiled the circuit
+
+        Parameters
+        ----------
+        topofile : str
+            Name of the topology file
+        nwlfile : str
+            Name of the node with load file
+        ilpqfile : str
+            Name of the inelastic load file
+        nWorkers : int
+            Number of worker processes, the number of CPUs if None
+        loadGenParams : dict
+            LoadGenerator parameters (PFLimInf, PFLimSup, LoadLimInf, LoadLimSup,
+            AmpGain, Freq, PhaseShift), required by solveSeeds
+        chunkSize : int
+            Maximum number of scenarios sent to a worker in one task
+        '''
+
+        self._nWorkers  = nWorkers if nWorkers else mp.cpu_count()
+        self._chunkSize = max(1, int(chunkSize))
+        self._nNodes    = None
+        self._hasLoadGen = loadGenParams is not None
+
+        #-- spawn: the workers must not inherit the engine state of this process
+        ctx = mp.get_context('spawn')
+        self._tasks   = ctx.Queue()
+        self._results = ctx.Queue()
+        self._workers = []
+        for i in range(self._nWorkers):
+            worker = ctx.Process(target=_worker,
+                                 args=(topofile, nwlfile, ilpqfile, loadGenParams,
+                                       self._tasks, self._results),
+                                 daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        for i in range(self._nWorkers):
+            msg = self._getResult()
+            if msg[0] == 'error':
+                self.close()
+                raise Exception('SimDSSPool:', msg[1])
+            self._nNodes = msg[1]
+
+        logging.debug('Start SimDSSPool with %s workers', self._nWorkers)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+    #-------------------#
+    #- Private Methods -#
+    #-------------------#
+
+    def _getResult(self):
+        '''
+        Wait for the next message of the workers. A worker that dies (crash of
+        the engine, out of memory) never sends the message of its task, so the
+        workers are checked while waiting, and all of them are stopped if one died
+
+        Returns
+        -------
+        msg : tuple
+            Message of a worker
+        '''
+        while True:
+            try:
+                return self._results.get(timeout=self._pollInterval)
+            except queue.Empty:
+                pass
+            dead = [worker for worker in self._workers if not worker.is_alive()]
+            if dead:
+                #-- a message sent just before the exit may have arrived meanwhile
+                try:
+                    return self._results.get(timeout=self._pollInterval)
+                except queue.Empty:
+                    pass
+                codes = [worker.exitcode for worker in dead]
+                #-- the tasks of the dead worker are lost: stop the pool
+                for worker in self._workers:
+                    worker.terminate()
+                    worker.join()
+                self._workers = []
+                raise Exception('SimDSSPool: worker died, exit codes {}'.format(codes))
+
+
+    def _run(self, scenarios):
+        '''
+        Distribute the scenarios to the workers and collect the results
+
+        Parameters
+        ----------
+        scenarios : list
+            ('ePQ', ePQ) or ('seed', (seed, nSteps)) tuples
+
+        Returns
+        -------
+        V     : numpy array (nScenarios x nNodes)
+        I_in  : numpy array (nScenarios x nNodes)
+        I_out : numpy array (nScenarios x nNodes)
+        '''
+        if not self._workers:
+            raise Exception('SimDSSPool: the pool is closed')
+        nScenarios = len(scenarios)
+        if nScenarios == 0:
+            empty = np.zeros((0, self._nNodes), dtype=complex)
+            return empty, empty.copy(), empty.copy()
+
+        #-- small chunks keep all the workers busy until the end of the batch
+        chunk = max(1, min(self._chunkSize, nScenarios // (4 * self._nWorkers)))
+        shm = shared_memory.SharedMemory(create=True, size=3 * nScenarios * self._nNodes * 16)
+        try:
+            nTasks = 0
+            for first in range(0, nScenarios, chunk):
+                self._tasks.put((shm.name, nScenarios, first, scenarios[first:first + chunk]))
+                nTasks += 1
+            errors = []
+            notConverged = 0
+            for i in range(nTasks):
+                msg = self._getResult()
+                if msg[0] == 'error':
+                    errors.append(msg[1])
+                else:
+                    notConverged += msg[2]
+            if notConverged > 0:
+                logging.warning('SimDSSPool: %s scenarios did not converge', notConverged)
+            if errors:
+                raise Exception('SimDSSPool:', errors)
+            out = np.ndarray((3, nScenarios, self._nNodes), dtype=np.complex128, buffer=shm.buf)
+            V, I_in, I_out = out[0].copy(), out[1].copy(), out[2].copy()
+            del out
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return V, I_in, I_out
+
+
+    #------------------#
+    #- Public Methods -#
+    #------------------#
+
+    def getnNodes(self):
+        '''
+        Get the number of nodes of the circuit
+
+        Returns
+        -------
+        nNodes : int
+        '''
+
+        return self._nNodes
+
+
+    def solve(self, ePQs):
+        '''
+        Solve a batch of load scenarios. Each scenario is a load set in the
+        format of SimDSS.setLoads
+
+        Parameters
+        ----------
+        ePQs : list
+            List of lists of <nodeName, P, Q> tuples, one per scenario
+
+        Returns
+        -------
+        V     : numpy array (nScenarios x nNodes)
+            node voltages of each scenario
+        I_in  : numpy array (nScenarios x nNodes)
+            node input currents of each scenario
+        I_out : numpy array (nScenarios x nNodes)
+            node output currents of each scenario
+        '''
+
+        return self._run([('ePQ', list(ePQ)) for ePQ in ePQs])
+
+
+    def solveSeeds(self, seeds, nSteps=1):
+        '''
+        Solve a batch of random load scenarios created by the LoadGenerator of
+        the workers. The loads of a scenario are the nSteps-th createLoads after
+        LoadGenerator.reset(seed), so the same seed always gives the same result
+
+        Parameters
+        ----------
+        seeds : list
+            Seed of each scenario
+        nSteps : int
+            Number of createLoads calls for each scenario (time of the sine load)
+
+        Returns
+        -------
+        V     : numpy array (nScenarios x nNodes)
+        I_in  : numpy array (nScenarios x nNodes)
+        I_out : numpy array (nScenarios x nNodes)
+        '''
+
+        if not self._hasLoadGen:
+            raise Exception('SimDSSPool: solveSeeds requires loadGenParams')
+        if nSteps < 1:
+            raise Exception('nSteps value is invalid: {}'.format(nSteps))
+
+        return self._run([('seed', (int(seed), int(nSteps))) for seed in seeds])
+
+
+    def close(self):
+        '''
+        Stop the workers
+        '''
+        for worker in self._workers:
+            if worker.is_alive():
+                self._tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+
+
+if __name__ == '__main__':
+    print('SimDSSPool class file')
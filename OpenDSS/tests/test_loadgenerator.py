@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+
+from LoadGenerator import LoadGenerator
+
+
+class TestLoadGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.loadGen = LoadGenerator("examples/example_01_nwl.csv", PFLimInf=0.95, PFLimSup=0.99,
+                                     LoadLimInf=100, LoadLimSup=300, AmpGain=30, Freq=1./100,
+                                     PhaseShift=0)
+
+
+    def test_skipLoadVectors(self):
+        for n in (0, 1, 5):
+            self.loadGen.reset(7)
+            for k in range(n + 1):
+                (P, Q) = self.loadGen.createLoadVector()
+            self.loadGen.reset(7)
+            self.loadGen.skipLoadVectors(n)
+            #--- the next sample is the same as after n samples
+            (P1, Q1) = self.loadGen.createLoadVector()
+            np.testing.assert_array_equal(P1, P)
+            np.testing.assert_array_equal(Q1, Q)
+            self.assertEqual(self.loadGen._time, n + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import json
+import math
+
+from Measurement import Measurement
+
+
+class TestMeasurement(unittest.TestCase):
+
+    def test_encode(self):
+        phasor = Measurement('Phasor_650-632.0.0', 'Phasor', 0b101, 50.000000001,
+                             (2401.45, math.nan, 2401.47), vang=(-0.0002, math.nan, 2.0941),
+                             imag=(471.6, math.nan, 480.5), iang=(-0.439, math.nan, 1.631))
+        msg = phasor.encode()
+        self.assertTrue(Measurement.isEncoded(msg))
+        #--- only the phases measured are encoded
+        self.assertEqual(len(msg), len(Measurement.PREFIX) + 4 * math.ceil((14 + 18 + 8 * 8) / 3))
+        #--- the record goes through mosaik (JSON) and NS-3 (quoted JSON text)
+        for wire in (json.loads(json.dumps(msg)), json.dumps(msg) + '\n'):
+            rec = Measurement.decode(wire)
+            self.assertEqual((rec.idt, rec.kind, rec.mask, rec.ts), (phasor.idt, 'Phasor', 0b101, 50.000000001))
+            self.assertEqual(rec.phases(), [0, 2])
+            for name in ('vmag', 'vang', 'imag', 'iang'):
+                self.assertEqual([getattr(rec, name)[j] for j in (0, 2)], [getattr(phasor, name)[j] for j in (0, 2)])
+                self.assertTrue(math.isnan(getattr(rec, name)[1]))
+            self.assertIsNone(rec.sp)
+
+    def test_kinds(self):
+        meter = Measurement.decode(Measurement('SmartMeter_1', 'Smartmeter', 0b010, 1.0,
+                                               (math.nan, 240.1, math.nan), sp=(math.nan, -3.5e5, math.nan)).encode())
+        self.assertEqual((meter.vmag[1], meter.sp[1]), (240.1, -3.5e5))
+        self.assertIsNone(meter.vang)
+        sensor = Measurement.decode(Measurement('Sensor_611-632.0.0', 'Sensor', 0b100, 2.0,
+                                                (math.nan, math.nan, 2207.55)).encode())
+        self.assertEqual(sensor.scalar(), 2207.55)
+        with self.assertRaises(Exception):
+            Measurement('Prober_1', 'Prober', 1, 0.0, (1.0,))
+        with self.assertRaises(Exception):
+            Measurement.decode('2207.55')
+        self.assertFalse(Measurement.isEncoded(2207.55))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+import opendssdirect as dss
+
+from SimDSS import SimDSS
+from SensorBank import SensorBank, SamplingWheel
+from SensorNoise import NoiseStream
+
+
+class TestSamplingWheel(unittest.TestCase):
+
+    def test_advance(self):
+        wheel = SamplingWheel()
+        self.assertIsNone(wheel.next())
+        wheel.add('a', 20)
+        wheel.add('b', 50)
+        wheel.add('c', 20)
+        wheel.add('d', 50, offset=10)
+        self.assertEqual(wheel.advance(0), ['a', 'c', 'b'])
+        self.assertEqual(wheel.next(), 10)
+        self.assertEqual(wheel.advance(10), ['d'])
+        #--- a second step at the same time gets the same items
+        self.assertEqual(wheel.advance(10), ['d'])
+        self.assertEqual(wheel.next(), 20)
+        #--- the due times skipped are not sampled
+        self.assertEqual(sorted(wheel.advance(100)), ['a', 'b', 'c'])
+        self.assertEqual(wheel.next(), 110)
+
+
+class TestSensorBank(unittest.TestCase):
+
+    def setUp(self):
+        dss.run_command('Clear')
+        self.dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv")
+
+
+    def test_phasor(self):
+        bank = SensorBank('Phasor', self.dssObj, seed=3)
+        bank.add('Phasor_1', 'BUS2', 'PHASE_123', 10, 'Line.LINE1', 0.01)
+        bank.add('Phasor_2', 'BUS1', 'PHASE_13', 20, 'Line.LINE1', 0.01)
+        self.assertEqual(bank.getLastValue('Phasor_1'), (None, None))
+        #--- the values of a sensor sampled alone with its own noise stream
+        streams = {eid: NoiseStream(eid, 0.01, 3) for eid in ('Phasor_1', 'Phasor_2')}
+        phases = {'Phasor_1': (1, 2, 3), 'Phasor_2': (1, 3)}
+        terminal = {'Phasor_1': 2, 'Phasor_2': 1}
+        for time in range(0, 200, 10):
+            rows = bank.step(time)
+            self.assertEqual(bank.getEids(rows), ['Phasor_1', 'Phasor_2'] if time % 20 == 0 else ['Phasor_1'])
+            for eid in bank.getEids(rows):
+                state = [self.dssObj.getCktElementState('Line.LINE1', terminal[eid], ph) for ph in phases[eid]]
+                VI = streams[eid].addNoise([s[0] for s in state] + [s[1] for s in state])
+                (val, ts) = bank.getLastValue(eid)
+                self.assertEqual(ts, time + 1e-9)
+                self.assertEqual(val.ts, ts)
+                self.assertEqual(val.idt, eid)
+                self.assertEqual(val.kind, 'Phasor')
+                self.assertEqual(val.phases(), [ph - 1 for ph in phases[eid]])
+                for (k, ph) in enumerate(phases[eid]):
+                    j = ph - 1
+                    self.assertEqual((val.vmag[j], val.vang[j]), (np.abs(VI[k]), np.angle(VI[k])))
+                    self.assertEqual((val.imag[j], val.iang[j]),
+                                     (np.abs(VI[len(state) + k]), np.angle(VI[len(state) + k])))
+                if eid == 'Phasor_2':
+                    self.assertTrue(np.isnan(val.vmag[1]))
+        self.assertEqual(bank.next(), 200)
+
+
+    def test_smartmeter(self):
+        bank = SensorBank('Smartmeter', self.dssObj)
+        bank.add('SmartMeter_1', 'BUS2', 'PHASE_2', 10, 'Line.LINE1', 0.01)
+        stream = NoiseStream('SmartMeter_1', 0.01)
+        for time in range(0, 500, 10):
+            bank.step(time)
+            (VComp, IComp, _) = self.dssObj.getCktElementState('Line.LINE1', 2, 2)
+            (VComp, IComp) = stream.addNoise([VComp, IComp])
+            (val, ts) = bank.getLastValue('SmartMeter_1')
+            self.assertEqual((val.kind, val.phases()), ('Smartmeter', [1]))
+            self.assertEqual(val.vmag[1], np.abs(VComp))
+            self.assertEqual(val.sp[1], (VComp * np.conj(-IComp)).real)
+            self.assertIsNone(val.imag)
+
+
+    def test_sensor(self):
+        bank = SensorBank('Sensor', self.dssObj)
+        bank.add('Sensor_1', 'BUS2', 'PHASE_3', 10, 'Line.LINE1', 0.01)
+        bank.step(0)
+        (val, ts) = bank.getLastValue('Sensor_1')
+        self.assertEqual(val.scalar(), np.abs(self.dssObj.getCktElementState('Line.LINE1', 2, 3)[0]))
+        self.assertEqual(ts, 1e-9)
+        with self.assertRaises(Exception):
+            bank.add('Sensor_1', 'BUS2', 'PHASE_3', 10, 'Line.LINE1', 0.01)
+        with self.assertRaises(Exception):
+            SensorBank('Prober', self.dssObj)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from SensorNoise import NoiseStream
+
+
+class TestSensorNoise(unittest.TestCase):
+
+    def test_reproducible(self):
+        a = NoiseStream('Phasor_1', 0.1, seed=7)
+        b = NoiseStream('Phasor_1', 0.1, seed=7)
+        np.testing.assert_array_equal(a.next(5), b.next(5))
+        #--- the stream does not depend on how the values are taken
+        x = np.concatenate([a.next(3) for k in range(1000)])
+        np.testing.assert_array_equal(x, b.next(3000))
+        c = NoiseStream('Phasor_1', 0.1, seed=8)
+        self.assertFalse(np.array_equal(NoiseStream('Phasor_1', 0.1, seed=7).next(5), c.next(5)))
+
+    def test_independentSensors(self):
+        #--- the stream of a sensor does not change when other sensors are added before it
+        a = NoiseStream('Smartmeter_2', 0.1)
+        NoiseStream('Smartmeter_1', 0.1).next(10)
+        b = NoiseStream('Smartmeter_2', 0.1)
+        np.testing.assert_array_equal(a.next(10), b.next(10))
+        self.assertFalse(np.array_equal(NoiseStream('Smartmeter_1', 0.1).next(10), b.next(10)))
+
+    def test_distribution(self):
+        noise = NoiseStream('Phasor_1', 0.5).next(200000)
+        self.assertEqual(noise.dtype, np.complex128)
+        self.assertAlmostEqual(noise.real.std(), 0.5, delta=0.01)
+        self.assertAlmostEqual(noise.imag.std(), 0.5, delta=0.01)
+        self.assertAlmostEqual(noise.real.mean(), 0, delta=0.01)
+
+    def test_addNoise(self):
+        stream = NoiseStream('Prober_1', 0.0)
+        x = np.array([[1 + 1j, 2], [3, 4j]])
+        np.testing.assert_array_equal(stream.addNoise(x), x)
+        stream = NoiseStream('Prober_1', 0.1)
+        self.assertIsInstance(stream.addNoise(1 + 1j), complex)
+        self.assertEqual(stream.addNoise(x).shape, (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
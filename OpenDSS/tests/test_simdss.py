@@ -0,0 +1,663 @@
+import unittest
+import os
+import json
+import shutil
+import pickle
+import tempfile
+from unittest import mock
+
+import numpy as np
+import opendssdirect as dss
+
+from SimDSS import SimDSS, loadAdjMatrix
+
+
+class TestSimDSS(unittest.TestCase):
+
+    def setUp(self):
+        #--- the engine is shared by all the tests: start from an empty circuit
+        dss.run_command('Clear')
+        self.dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv")
+
+
+    #--- Node voltages
+
+    def test_calcVComplex(self):
+        vckt = dss.Circuit.YNodeVArray()
+        nNodes = self.dssObj.getnNodes()
+        V = self.dssObj._calcVComplex()
+        self.assertEqual(V.dtype, np.complex128)
+        self.assertEqual(len(V), nNodes)
+        for i in range(nNodes):
+            self.assertEqual(V[i], vckt[2*i] + 1j*vckt[2*i + 1])
+        #--- no second copy is kept
+        self.assertIs(V, self.dssObj._Vckt)
+
+
+    def test_numpyBuffers(self):
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        self.dssObj.setLoads(ePQ)
+        vckt = dss.Circuit.YNodeVArray()
+        V = self.dssObj.getVNodes().copy()
+        (I_in, I_out) = self.dssObj.getIinout()
+        dss.Circuit.SetActiveElement('Line.line1')
+        volts = dss.CktElement.Voltages()
+        dss.utils.set_numpy_buffers(True)
+        try:
+            self.assertTrue(dss.utils.numpy_buffers())
+            buf = dss.Circuit.YNodeVArray()
+            self.assertEqual(buf.dtype, np.float64)
+            np.testing.assert_array_equal(buf, vckt)
+            #--- the same array is refilled by the next call
+            self.assertIs(dss.Circuit.YNodeVArray(), buf)
+            np.testing.assert_array_equal(dss.CktElement.Voltages(), volts)
+            #--- SimDSS keeps its own copy
+            self.dssObj.setLoads([(nodeName, P + 1.0, Q) for (nodeName, P, Q) in ePQ])
+            V1 = self.dssObj.getVNodes()
+            self.dssObj.setLoads(ePQ)
+            self.assertGreater(np.max(np.abs(V1 - self.dssObj.getVNodes())), 0)
+            np.testing.assert_allclose(self.dssObj.getVNodes(), V, rtol=1e-5)
+            np.testing.assert_allclose(self.dssObj.getIinout()[0], I_in, rtol=1e-4)
+        finally:
+            dss.utils.set_numpy_buffers(False)
+        self.assertIsInstance(dss.Circuit.YNodeVArray(), list)
+
+
+    def test_classToColumns(self):
+        columns = dss.utils.class_to_columns('Line', ['length', 'bus1'])
+        self.assertEqual(list(columns['name']), dss.Lines.AllNames())
+        self.assertEqual(columns['length'].dtype, np.float64)
+        dss.Lines.Name('line1')
+        self.assertEqual(columns['length'][0], dss.Lines.Length())
+        self.assertEqual(columns['bus1'][0], dss.Lines.Bus1())
+        #--- cached until the next command
+        self.assertIs(dss.utils.class_to_columns('Line', ['length', 'bus1'])['length'], columns['length'])
+        #--- the cached columns are shared, they cannot be changed in place
+        with self.assertRaises(ValueError):
+            columns['length'][0] = 0.0
+        dss.run_command('Edit Line.line1 length=2.5')
+        self.assertEqual(dss.utils.class_to_columns('Line', ['length'])['length'][0], 2.5)
+        #--- same values as the element by element dataframe
+        df = dss.utils.class_to_dataframe('Load', columnar=True)
+        ref = dss.utils.class_to_dataframe('Load')
+        self.assertEqual(list(df.index), list(ref.index))
+        self.assertEqual(list(df.columns), list(ref.columns))
+        self.assertEqual(df.loc['Load.load1', 'kW'], float(ref.loc['Load.load1', 'kW']))
+        with self.assertRaises(ValueError):
+            dss.utils.class_to_columns('Line', ['nonexistent'])
+
+
+    def test_classToColumns_setters(self):
+        self.assertEqual(dss.utils.class_to_columns('Transformer', ['tap'])['tap'][0], 1.0)
+        #--- a property setter changes the circuit
+        dss.Transformers.Name('tr1')
+        dss.Transformers.Wdg(2)
+        dss.Transformers.Tap(1.0125)
+        self.assertEqual(dss.utils.class_to_columns('Transformer', ['tap'])['tap'][0], 1.0125)
+        #--- so does a tap operation of SimDSS
+        self.dssObj.setTrafoTap('Transformer.TR1', 1, 1)
+        dss.Transformers.Name('tr1')
+        dss.Transformers.Wdg(2)
+        self.assertEqual(dss.utils.class_to_columns('Transformer', ['tap'])['tap'][0], dss.Transformers.Tap())
+        self.assertGreater(dss.Transformers.Tap(), 1.0125)
+
+
+    def test_elementBatch(self):
+        dss.run_commands(['New Load.a1 Bus1=loadbus.1 kW=1', 'New Load.a2 Bus1=loadbus.2 kW=2'])
+        #--- the batch keeps the order of the indexes
+        batch = dss.utils.ElementBatch('Load', [3, 1])
+        try:
+            self.assertEqual(len(batch), 2)
+            batch.set_float64('kW', [30.0, 10.0])
+            batch.set_float64('kvar', [3.0, 1.0])
+            for (idx, P, Q) in ((1, 10.0, 1.0), (3, 30.0, 3.0)):
+                dss.Loads.Idx(idx)
+                self.assertEqual((dss.Loads.kW(), dss.Loads.kvar()), (P, Q))
+            #--- the other loads are not changed
+            dss.Loads.Idx(2)
+            self.assertEqual(dss.Loads.kW(), 1.0)
+            with self.assertRaises(ValueError):
+                batch.set_float64('kW', [1.0])
+        finally:
+            batch.dispose()
+        with self.assertRaises(ValueError):
+            dss.utils.ElementBatch('Load', [4])
+
+
+    def test_runCommands(self):
+        errors = dss.run_commands(['New Load.a1 Bus1=loadbus.1 kW=1',
+                                   'Foo bar',
+                                   'New Load.a2 Bus1=loadbus.2 kW=2\nNew Load.a3 Bus1=loadbus.3 kW=3',
+                                   'New Load.a4 Bus1=loadbus.1 kW=1 kk=1'])
+        #--- the lines after a failed one still run
+        self.assertEqual([(index, command) for (index, command, number, description) in errors],
+                         [(1, 'Foo bar'), (4, 'New Load.a4 Bus1=loadbus.1 kW=1 kk=1')])
+        self.assertTrue(all(number != 0 for (index, command, number, description) in errors))
+        self.assertTrue(set(['a1', 'a2', 'a3']) <= set(dss.Loads.AllNames()))
+        self.assertEqual(dss.run_commands(['Edit Load.a1 kW=5', 'Edit Load.a1 kW=5']), [])
+        dss.Loads.Name('a1')
+        self.assertEqual(dss.Loads.kW(), 5)
+
+
+    def test_runCommands_warnings(self):
+        #--- the redefinition in the middle of the block is a warning, the block goes on
+        commands = ['New Load.w1 Bus1=loadbus.1 kW=1', 'New Load.w2 Bus1=loadbus.2 kW=2',
+                    'New Load.w1 Bus1=loadbus.1 kW=4', 'New Load.w3 Bus1=loadbus.3 kW=3', 'Foo bar',
+                    'New Load.w4 Bus1=loadbus.1 kW=5']
+        errors = dss.run_commands(commands, stop_on_error=True)
+        self.assertEqual([(index, number) for (index, command, number, description) in errors], [(2, 266), (4, 302)])
+        self.assertTrue(errors[0][3].startswith('Warning'))
+        #--- the run stops at the first error, not at the warning
+        self.assertTrue(set(['w1', 'w2', 'w3']) <= set(dss.Loads.AllNames()))
+        self.assertNotIn('w4', dss.Loads.AllNames())
+        dss.Loads.Name('w1')
+        self.assertEqual(dss.Loads.kW(), 4)
+
+
+    #--- Lazy system state
+
+    def test_lazySystemState(self):
+        self.dssObj.setLoads([('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)])
+        self.assertTrue(self.dssObj._VDirty)
+        self.assertTrue(self.dssObj._IDirty)
+        self.assertTrue(self.dssObj._VMagAnglePuDirty)
+        #--- element probes do not need the derived quantities
+        self.dssObj.getCktElementState('Line.LINE1', 2, 1)
+        self.assertTrue(self.dssObj._IDirty)
+        self.assertTrue(self.dssObj._VMagAnglePuDirty)
+        #--- only the accessed quantity is calculated, once
+        V = self.dssObj.getVNodes()
+        self.assertFalse(self.dssObj._VDirty)
+        self.assertTrue(self.dssObj._IDirty)
+        self.assertIs(V, self.dssObj.getVNodes())
+        self.dssObj.getVMagAnglePu('loadbus', 1)
+        self.assertFalse(self.dssObj._VMagAnglePuDirty)
+        self.assertTrue(self.dssObj._IDirty)
+
+
+    #--- Element probes
+
+    def test_getCktElementState(self):
+        for (term, phase) in ((1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3)):
+            (V, I, P) = self.dssObj.getCktElementState('LINE.line1', term, phase)
+            dss.Circuit.SetActiveElement('Line.LINE1')
+            nc = len(dss.CktElement.NodeOrder()) // 2
+            pos = 2*((term - 1)*nc + list(dss.CktElement.NodeOrder())[(term - 1)*nc:].index(phase))
+            self.assertEqual(V, dss.CktElement.Voltages()[pos] + 1j*dss.CktElement.Voltages()[pos+1])
+            self.assertEqual(I, dss.CktElement.Currents()[pos] + 1j*dss.CktElement.Currents()[pos+1])
+        with self.assertRaises(Exception):
+            self.dssObj.getCktElementState('Line.NOLINE', 1, 1)
+        with self.assertRaises(Exception):
+            self.dssObj.getCktElementState('Line.LINE1', 3, 1)
+
+    def test_elementIndex(self):
+        self.dssObj.getCktElementState('Line.LINE1', 1, 1)
+        index = self.dssObj._elemIndex
+        #--- switching does not rebuild the index
+        self.dssObj.setSwitch(0, 'Line.LINE1', 2, 0)
+        self.assertEqual(self.dssObj.getSwitch('Line.LINE1', 2, 1), True)
+        self.dssObj.setSwitch(1, 'Line.LINE1', 2, 0)
+        self.assertIs(index, self.dssObj._elemIndex)
+        #--- elements added outside the class are found
+        dss.run_command('New Line.LINE2 Bus1=LoadBus Bus2=EndBus Linecode=336ACSR Length=1 Units=Mi')
+        dss.Solution.Solve()
+        self.dssObj.getCktElementState('Line.LINE2', 1, 1)
+        self.assertIn('line.line2', self.dssObj._elemIndex)
+
+    def test_getSnapshot(self):
+        probes = [('Line.LINE1', 1, 1), ('Line.LINE1', 2, 3), ('Transformer.TR1', 2, 2), ('line.line1', 1, 1)]
+        idx = [self.dssObj.addProbe(*probe) for probe in probes]
+        #--- the same probe is registered once
+        self.assertEqual(idx, [0, 1, 2, 0])
+        self.assertEqual(self.dssObj._probeGroups, {'line.line1': [0, 1], 'transformer.tr1': [2]})
+        for _ in range(2):
+            (V, I, S) = self.dssObj.getSnapshot()
+            self.assertIs(V, self.dssObj.getSnapshot()[0])
+            for (probe, k) in zip(probes, idx):
+                (VComp, IComp, PComp) = self.dssObj.getCktElementState(*probe)
+                self.assertEqual((V[k], I[k], S[k]), (VComp, IComp, PComp))
+            #--- a new solution invalidates the snapshot
+            self.dssObj.setLoads([('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)])
+            self.assertTrue(self.dssObj._snapshotDirty)
+        with self.assertRaises(Exception):
+            self.dssObj.addProbe('Line.LINE1', 3, 1)
+
+
+    #--- Solution statistics
+
+    def test_solveStats(self):
+        records = []
+        self.dssObj.setSolveStats(size=2, callback=records.append)
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        for k in range(3):
+            self.dssObj.setLoads([(nodeName, P*(k + 1), Q) for (nodeName, P, Q) in ePQ])
+            self.dssObj.getIinout()
+        self.assertEqual(len(records), 3)
+        self.assertTrue(records[-1]['converged'])
+        self.assertGreater(records[-1]['iterations'], 0)
+        self.assertEqual(set(records[-1]['postTime']), {'I'})
+        stats = self.dssObj.getSolveStats()
+        self.assertEqual(stats['solves'] - records[0]['solve'], 2)
+        self.assertEqual(stats['buffered'], 2)
+        self.assertEqual(stats['notConverged'], 0)
+        self.assertGreater(stats['solveTime']['total'], 0)
+        #--- JSON export
+        (fd, fname) = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            self.dssObj.createSolveStats(fname)
+            with open(fname) as f:
+                data = json.load(f)
+        finally:
+            os.remove(fname)
+        self.assertEqual(data['summary']['buffered'], 2)
+        self.assertEqual(data['solves'][-1], records[-1])
+
+
+    def test_solveStats_purpose(self):
+        #--- the solution of the circuit loading is recorded
+        self.assertEqual([rec['purpose'] for rec in self.dssObj._solveStats], ['startup'])
+        self.dssObj.getYMatrix()
+        self.dssObj.setLoads([('loadbus.1', 100.0, 30.0)])
+        self.dssObj.getVNodes()
+        self.assertEqual([rec['purpose'] for rec in self.dssObj._solveStats], ['startup', 'ymatrix', 'ymatrix', 'step'])
+        self.assertEqual(self.dssObj.getSolveStats()['solves'], 4)
+        #--- also the inelastic loads, from the files or from the cache
+        cachedir = tempfile.mkdtemp()
+        try:
+            for k in range(2):
+                dss.run_command('Clear')
+                dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv",
+                                "examples/example_01_ilpq.csv", cachedir=cachedir)
+                self.assertEqual([rec['purpose'] for rec in dssObj._solveStats], ['startup', 'startup'])
+        finally:
+            shutil.rmtree(cachedir)
+
+
+    #--- Per unit voltages
+
+    def test_getVMagAnglePu(self):
+        self.dssObj.setLoads([('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)])
+        for bus in dss.Circuit.AllBusNames():
+            dss.Circuit.SetActiveBus(bus)
+            puVmagAngle = dss.Bus.puVmagAngle()
+            for (j, nd) in enumerate(dss.Bus.Nodes()):
+                (VMag, Angle) = self.dssObj.getVMagAnglePu(bus.upper(), nd)
+                np.testing.assert_allclose((VMag, Angle), puVmagAngle[2*j:2*j + 2], rtol=1e-12, atol=1e-8)
+        self.assertEqual(self.dssObj._VMagAnglePu.shape, (self.dssObj.getnNodes(), 2))
+        with self.assertRaises(Exception):
+            self.dssObj.getVMagAnglePu('nobus', 1)
+        with self.assertRaises(Exception):
+            self.dssObj.getVMagAnglePu('sourcebus', 4)
+
+
+    #--- Input/output currents
+
+    def _refInOutCurrent(self):
+        #--- element by element accumulation
+        t2n = self.dssObj._terminal2node
+        I_1 = np.zeros(self.dssObj.getnNodes(), dtype=complex)
+        I_2 = np.zeros(self.dssObj.getnNodes(), dtype=complex)
+        for (elemClass, module, skip) in (('Line.', dss.Lines, 0), ('Transformer.', dss.Transformers, 1)):
+            elem = module.First()
+            while elem > 0:
+                dss.Circuit.SetActiveElement(elemClass + module.Name())
+                blist  = dss.CktElement.BusNames()
+                CArray = dss.CktElement.Currents()
+                OArray = dss.CktElement.NodeOrder()
+                nc = int(len(CArray)/4)
+                for p in range(nc - skip):
+                    I_1[t2n[blist[0].split('.')[0] + '.' + str(OArray[p])]] += CArray[2*p] + CArray[2*p+1]*1j
+                for p in range(nc, 2*nc - skip):
+                    I_2[t2n[blist[1].split('.')[0] + '.' + str(OArray[p])]] += CArray[2*p] + CArray[2*p+1]*1j
+                elem = module.Next()
+        return I_1, I_2
+
+    def test_calcInOutCurrent(self):
+        (I_in, I_out) = self.dssObj._calcInOutCurrent()
+        (I_1, I_2) = self._refInOutCurrent()
+        np.testing.assert_allclose(I_in, I_1)
+        np.testing.assert_allclose(I_out, I_2)
+
+    def test_calcInOutCurrent_tables(self):
+        self.dssObj._calcInOutCurrent()
+        sndIdx = self.dssObj._sndCurrIdx
+        #--- tables are not rebuilt while the topology is the same
+        self.dssObj._calcInOutCurrent()
+        self.assertIs(sndIdx, self.dssObj._sndCurrIdx)
+        #--- a new element changes the topology
+        dss.run_command('New Line.LINE2 Bus1=LoadBus Bus2=EndBus Linecode=336ACSR Length=1 Units=Mi')
+        dss.Solution.Solve()
+        (I_in, I_out) = self.dssObj._calcInOutCurrent()
+        self.assertIsNot(sndIdx, self.dssObj._sndCurrIdx)
+
+
+    #--- Admittance matrix
+
+    def test_getYMatrix(self):
+        Y = self.dssObj.getYMatrix(sparse=True)
+        nNodes = self.dssObj.getnNodes()
+        self.assertEqual(Y.format, 'csc')
+        self.assertEqual(Y.shape, (nNodes, nNodes))
+        self.assertEqual(len(self.dssObj.getYNodeOrder()), nNodes)
+        #--- same values as the dense SystemY
+        dss.run_command('vsource.source.enabled = no')
+        dss.run_command('batchedit load..* enabled=no')
+        dss.Solution.Solve()
+        Ydense = np.reshape(dss.Circuit.SystemY(), (nNodes, 2*nNodes))
+        Ydense = Ydense[:, 0::2] + 1j*Ydense[:, 1::2]
+        np.testing.assert_allclose(self.dssObj.getYMatrix(), Ydense)
+
+    def test_getYMatrix_cache(self):
+        Y = self.dssObj.getYMatrix(sparse=True)
+        self.assertIs(Y, self.dssObj.getYMatrix(sparse=True))
+        self.assertIs(self.dssObj.getYMatrix(), self.dssObj.getYMatrix())
+        #--- a tap change rebuilds the matrix
+        self.dssObj.setTrafoTap('Transformer.TR1', 1, 1)
+        Ynew = self.dssObj.getYMatrix(sparse=True)
+        self.assertIsNot(Y, Ynew)
+        np.testing.assert_allclose((Ynew - Y).toarray(), self.dssObj._YMatrixDiff.toarray())
+        self.assertNotEqual(self.dssObj._YMatrixDiff.count_nonzero(), 0)
+
+    def test_getYMatrix_incremental(self):
+        self.dssObj.setYMatrixIncremental(True)
+        Y = self.dssObj.getYMatrix(sparse=True)
+        Ydense = self.dssObj.getYMatrix()
+        Yref = Ydense.copy()
+        for tap in (1, 1, -1, 1):
+            self.dssObj.setTrafoTap('Transformer.TR1', tap, 1)
+        #--- the matrices held by the caller are not changed by the taps
+        np.testing.assert_array_equal(Y.toarray(), Yref)
+        np.testing.assert_array_equal(Ydense, Yref)
+        with self.assertRaises(ValueError):
+            Ydense[0, 0] = 0
+        with self.assertRaises(ValueError):
+            Y.data[0] = 0
+        #--- patched without a new sparsity pattern, same result as a full rebuild
+        Ynew = self.dssObj.getYMatrix(sparse=True)
+        self.assertTrue(np.shares_memory(Ynew.indices, Y.indices))
+        Yfull = self.dssObj._constructYMatrix()
+        np.testing.assert_allclose(Ynew.toarray(), Yfull.toarray())
+        np.testing.assert_allclose(self.dssObj.getYMatrix(), Yfull.toarray())
+        self.assertGreater(np.abs(Yfull.toarray() - Yref).max(), 0)
+
+    def test_getYNodeOrder(self):
+        self.assertEqual(self.dssObj.getYNodeOrder(), [name.lower() for name in dss.Circuit.YNodeOrder()])
+        self.dssObj.getCktElementState('Line.LINE1', 1, 1)
+        #--- the labels follow the matrix after a topology change
+        dss.run_command('New Line.LINE2 Bus1=LoadBus Bus2=EndBus Linecode=336ACSR Length=1 Units=Mi')
+        dss.Solution.Solve()
+        self.dssObj.getCktElementState('Line.LINE2', 2, 1)
+        Y = self.dssObj.getYMatrix(sparse=True)
+        YNodeOrder = self.dssObj.getYNodeOrder()
+        self.assertEqual(YNodeOrder, [name.lower() for name in dss.Circuit.YNodeOrder()])
+        self.assertEqual(Y.shape, (len(YNodeOrder), len(YNodeOrder)))
+        self.assertIn('endbus.1', YNodeOrder)
+        (_, nodes) = self.dssObj._getYPrim('Line.LINE2')
+        self.assertEqual([YNodeOrder[k] for k in nodes[3:]], ['endbus.1', 'endbus.2', 'endbus.3'])
+
+
+    #--- Loads
+
+    def test_setLoads(self):
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        self.dssObj.setLoads(ePQ)
+        nLoads  = dss.Loads.Count()
+        handles = list(self.dssObj._loadHandles)
+        self.assertEqual(self.dssObj.getPQ('Load.loadbus.2'), (200.0, 60.0))
+        #--- loads are not created again
+        ePQ = [('loadbus.1', 110.0, 33.0), ('loadbus.2', 220.0, 66.0), ('loadbus.3', 330.0, 99.0)]
+        self.dssObj.setLoads(ePQ)
+        self.assertEqual(dss.Loads.Count(), nLoads)
+        self.assertEqual(self.dssObj._loadHandles, handles)
+        for (nodeName, P, Q) in ePQ:
+            self.assertEqual(self.dssObj.getPQ('Load.' + nodeName), (P, Q))
+
+    def test_setLoads_topologyLoads(self):
+        topo = "../TapControl/tapcontrol/data/IEEE13Nodeckt.dss"
+        nwl  = "../TapControl/tapcontrol/data/IEEE13Nodeckt_NodeWithLoad.csv"
+        ePQ = [('646.2', 100.0, 40.0), ('692.3', 50.0, 20.0)]
+        dss.run_command('Clear')
+        dssObj = SimDSS(topo, nwl)
+        dssObj.setLoads(ePQ)
+        dssObj.getVNodes()
+        #--- the loads of the topology between two nodes are connected to the node
+        for (nodeName, P, Q) in ePQ:
+            dss.Loads.Name(nodeName)
+            self.assertEqual(dss.CktElement.BusNames()[0], nodeName)
+            self.assertEqual((dss.Loads.kW(), dss.Loads.kvar()), (P, Q))
+        V = dict(zip(dss.Circuit.YNodeOrder(), np.array(dss.Circuit.YNodeVArray()).view(complex)))
+        #--- same solution as defining the loads again, up to the solver tolerance
+        dss.run_command('Clear')
+        dss.run_command('Redirect ' + os.path.abspath(topo))
+        dss.run_commands(['New Load.{0} Bus1={0} kW={1} kvar={2}'.format(*load) for load in ePQ])
+        dss.Solution.Solve()
+        Vref = dict(zip(dss.Circuit.YNodeOrder(), np.array(dss.Circuit.YNodeVArray()).view(complex)))
+        self.assertEqual(sorted(V), sorted(Vref))
+        np.testing.assert_allclose([V[name] for name in Vref], list(Vref.values()), rtol=1e-5)
+
+    def test_setLoadVector(self):
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        self.dssObj.setLoads(ePQ)
+        V = self.dssObj.getVNodes().copy()
+        self.dssObj.setLoads([(nodeName, 0.0, 0.0) for (nodeName, P, Q) in ePQ])
+        #--- same solution from arrays in the fixed node order
+        self.dssObj.setLoadOrder([rec[0] for rec in ePQ])
+        self.assertEqual(self.dssObj.getLoadOrder(), [rec[0] for rec in ePQ])
+        self.dssObj.setLoadVector(np.array([100.0, 200.0, 300.0]), np.array([30.0, 60.0, 90.0]))
+        np.testing.assert_allclose(self.dssObj.getVNodes(), V, rtol=1e-5)
+        with self.assertRaises(Exception):
+            self.dssObj.setLoadVector(np.zeros(2), np.zeros(2))
+
+
+    def test_solveDeadband(self):
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        self.dssObj.setSolveDeadband(1.0)
+        self.dssObj.setLoads(ePQ)
+        V = self.dssObj.getVNodes()
+        #--- a change below the deadband keeps the last solution
+        self.dssObj.setLoads([(nodeName, P + 0.5, Q) for (nodeName, P, Q) in ePQ])
+        self.assertEqual(self.dssObj.getSkippedSolves(), 1)
+        self.assertIs(V, self.dssObj.getVNodes())
+        self.assertEqual(self.dssObj.getPQ('Load.loadbus.1'), (100.0, 30.0))
+        #--- the change is measured from the last solution
+        self.dssObj.setLoads([(nodeName, P + 1.0, Q) for (nodeName, P, Q) in ePQ])
+        self.assertEqual(self.dssObj.getSkippedSolves(), 1)
+        self.assertEqual(self.dssObj.getPQ('Load.loadbus.1'), (101.0, 30.0))
+        #--- a tap operation that does not move the tap
+        self.dssObj.setTrafoTap('Transformer.TR1', 0, 1)
+        self.assertEqual(self.dssObj.getSkippedSolves(), 2)
+
+
+    #--- Time series
+
+    def test_runTimeSeries(self):
+        nodeNames = ['loadbus.1', 'loadbus.2', 'loadbus.3']
+        P = np.array([[100.0, 120.0, 90.0, 110.0], [200.0, 210.0, 190.0, 205.0], [300.0, 310.0, 330.0, 295.0]])
+        Q = 0.3*P
+        Vsnap = []
+        for k in range(P.shape[1]):
+            self.dssObj.setLoads([(nodeNames[i], P[i, k], Q[i, k]) for i in range(len(nodeNames))])
+            Vsnap.append(self.dssObj.getVNodes().copy())
+        self.dssObj.setLoadShapes(nodeNames, P, Q, stepSize=60.0)
+        nSolves = self.dssObj.getSolveStats()['solves']
+        V = self.dssObj.runTimeSeries()
+        self.assertEqual(V.shape, (P.shape[1], self.dssObj.getnNodes()))
+        #--- the whole span is one solution of the engine
+        self.assertEqual(self.dssObj.getSolveStats()['solves'], nSolves + 1)
+        #--- same solution as the snapshot solves, up to the solver tolerance
+        np.testing.assert_allclose(V, np.array(Vsnap), rtol=1e-5)
+        #--- a span of the profile, back in snapshot mode with the last step loads
+        V = self.dssObj.runTimeSeries(nSteps=2, start=1)
+        np.testing.assert_allclose(V, np.array(Vsnap[1:3]), rtol=1e-5)
+        self.assertEqual(dss.Solution.ModeID(), 'Snap')
+        self.dssObj.setLoads([])
+        np.testing.assert_allclose(self.dssObj.getVNodes(), Vsnap[2], rtol=1e-5)
+        with self.assertRaises(Exception):
+            self.dssObj.runTimeSeries(nSteps=2, start=3)
+
+    def test_runTimeSeries_restore(self):
+        nodeNames = ['loadbus.1', 'loadbus.2', 'loadbus.3']
+        P = np.array([[100.0, 120.0], [200.0, 210.0], [300.0, 310.0]])
+        Q = 0.3*P
+        self.dssObj.setLoadShapes(nodeNames, P, Q, stepSize=60.0)
+        self.dssObj.runTimeSeries()
+        V = self.dssObj.getVNodes().copy()
+        #--- the monitors of the run are left disabled, in snapshot mode
+        self.assertEqual(dss.Solution.ModeID(), 'Snap')
+        self.assertEqual(dss.Solution.Number(), 1)
+        self.assertTrue(len(dss.Monitors.AllNames()) > 0)
+        self.assertEqual(set(dss.utils.class_to_columns('Monitor', ['enabled'])['enabled']), {'No'})
+        #--- same solution as a fresh snapshot solve with the loads of the last step
+        dss.run_command('Clear')
+        dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv")
+        dssObj.setLoads([(nodeNames[i], P[i, -1], Q[i, -1]) for i in range(len(nodeNames))])
+        np.testing.assert_allclose(V, dssObj.getVNodes(), rtol=1e-5)
+
+
+    #--- Adjacency matrix
+
+    def test_createAdjMatrix(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, 'adj.npz')
+            self.dssObj.createAdjMatrix(fname)
+            (busNames, adjMatrix, edges, edgeNames, edgeIdx) = loadAdjMatrix(fname)
+            self.assertEqual(busNames, dss.Circuit.AllBusNames())
+            self.assertEqual(edgeNames, ['Line.line1', 'Transformer.tr1'])
+            src, dst = busNames.index('sub_bus'), busNames.index('loadbus')
+            self.assertEqual(edges[0].tolist(), [src, dst])
+            self.assertEqual(adjMatrix.nnz, 4)
+            self.assertTrue(adjMatrix[src, dst] and adjMatrix[dst, src])
+            #--- element name of each entry
+            row = adjMatrix.indptr[dst]
+            self.assertEqual(adjMatrix.indices[row], src)
+            self.assertEqual(edgeNames[edgeIdx[row]], 'Line.line1')
+            #--- optional dense text matrix
+            fname = os.path.join(tmpdir, 'adj.txt')
+            self.dssObj.createAdjMatrix(fname, dense=True)
+            np.testing.assert_array_equal(np.loadtxt(fname, dtype=int), adjMatrix.toarray().astype(int))
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #--- Compiled-topology cache
+
+    def test_cache(self):
+        cachedir = tempfile.mkdtemp()
+        ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+        try:
+            results = []
+            for k in range(2):
+                dss.run_command('Clear')
+                dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv", 
+                                "examples/example_01_ilpq.csv", cachedir=cachedir)
+                self.assertEqual(len(os.listdir(cachedir)), 1)
+                if k == 1:
+                    #--- warm start: tables and admittance matrix come from the cache
+                    self.assertEqual(dssObj._elemMapVersion, dssObj._topoVersion)
+                    self.assertEqual(dssObj._YMatrixVersion, (dssObj._topoVersion, dssObj._tapVersion))
+                dssObj.setLoads(ePQ)
+                results.append((dssObj.getVNodes(), dssObj.getIinout()[0], 
+                                dssObj.getCktElementState('Line.LINE1', 2, 1), dssObj.getVMagAnglePu('loadbus', 2)))
+                if k == 0:
+                    #--- the matrix is added to the cache when built
+                    Y = dssObj.getYMatrix(sparse=True)
+                else:
+                    np.testing.assert_array_equal(dssObj.getYMatrix(sparse=True).toarray(), Y.toarray())
+            np.testing.assert_array_equal(results[0][0], results[1][0])
+            np.testing.assert_array_equal(results[0][1], results[1][1])
+            self.assertEqual(results[0][2:], results[1][2:])
+        finally:
+            shutil.rmtree(cachedir)
+
+    def test_cacheMismatch(self):
+        cachedir = tempfile.mkdtemp()
+        files = ("examples/example_01.dss", "examples/example_01_nwl.csv", "examples/example_01_ilpq.csv")
+        runCommands = SimDSS._runCommands
+        try:
+            dss.run_command('Clear')
+            SimDSS(*files, cachedir=cachedir)
+            cacheFile = os.path.join(cachedir, os.listdir(cachedir)[0])
+            #--- other nodes before the inelastic loads: they are only created by the cold start
+            #--- other nodes after the inelastic loads: the cold start compiles a new circuit
+            for (key, nCommands) in (('NodeList', 3), ('YNodeOrder', 6)):
+                with open(cacheFile, 'rb') as f:
+                    cache = pickle.load(f)
+                cache[key] = cache[key][::-1]
+                with open(cacheFile, 'wb') as f:
+                    pickle.dump(cache, f)
+                commands, errors = [], []
+                def record(obj, cmds):
+                    commands.extend(cmds)
+                    errors.extend(runCommands(obj, cmds))
+                    return errors
+                dss.run_command('Clear')
+                with mock.patch.object(SimDSS, '_runCommands', record):
+                    dssObj = SimDSS(*files, cachedir=cachedir)
+                self.assertEqual(len([command for command in commands if command.startswith('New Load.')]), nCommands)
+                #--- no load is redefined
+                self.assertEqual(errors, [])
+                self.assertEqual(dss.Loads.Count(), 4)
+                self.assertEqual(dssObj._NodeList, [name.lower() for name in dss.Circuit.YNodeOrder()])
+        finally:
+            shutil.rmtree(cachedir)
+
+    def test_cacheRedirect(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            cachedir = os.path.join(tmpdir, 'cache')
+            os.mkdir(cachedir)
+            with open('examples/example_01.dss') as f:
+                lines = f.read().splitlines()
+            #--- the line code and the line are loaded with Redirect
+            with open(os.path.join(tmpdir, 'master.dss'), 'w') as f:
+                f.write('\n'.join([line for line in lines if 'LINE' not in line.upper()] + ['Redirect lines.dss']))
+            shutil.copy('examples/example_01_nwl.csv', tmpdir)
+            files = (os.path.join(tmpdir, 'master.dss'), os.path.join(tmpdir, 'example_01_nwl.csv'))
+            Y = []
+            for R1 in ('0.058', '0.058', '0.116'):
+                with open(os.path.join(tmpdir, 'lines.dss'), 'w') as f:
+                    f.write('\n'.join([line.replace('R1=0.058', 'R1=' + R1) for line in lines if 'LINE' in line.upper()]))
+                dss.run_command('Clear')
+                dssObj = SimDSS(*files, cachedir=cachedir)
+                Y.append(dssObj.getYMatrix(sparse=True).toarray())
+            #--- a change in the redirected file is a cache miss
+            self.assertEqual(len(os.listdir(cachedir)), 2)
+            np.testing.assert_array_equal(Y[0], Y[1])
+            self.assertGreater(np.abs(Y[2] - Y[1]).max(), 0)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #--- Isolated circuits
+
+    def test_isolated(self):
+        topo = "../TapControl/tapcontrol/data/IEEE13Nodeckt.dss"
+        nwl  = "../TapControl/tapcontrol/data/IEEE13Nodeckt_NodeWithLoad.csv"
+        feeder1 = SimDSS(topo, nwl, isolated=True)
+        feeder2 = SimDSS(topo, nwl, isolated=True)
+        try:
+            #--- the global engine keeps the circuit of setUp
+            self.assertEqual(dss.Circuit.Name(), 'simple')
+            self.assertEqual(self.dssObj.getnNodes(), dss.Circuit.NumNodes())
+            V = feeder2.getVNodes().copy()
+            #--- a change in one feeder does not affect the other
+            feeder1.setSwitch(0, 'Line.671692', 1, 0)
+            self.assertTrue(feeder1.getSwitch('Line.671692', 1, 1))
+            self.assertFalse(feeder2.getSwitch('Line.671692', 1, 1))
+            feeder2.setLoads([])
+            #--- the re-solve only moves the regulators slightly
+            np.testing.assert_allclose(feeder2.getVNodes(), V, rtol=1e-4)
+            self.assertGreater(np.max(np.abs(feeder1.getVNodes() - V)), 100)
+            self.assertEqual(dss.Circuit.Name(), 'simple')
+        finally:
+            feeder1.close()
+            feeder2.close()
+        with self.assertRaises(Exception):
+            feeder1.getVNodes()
+
+
+if __name__ == '__main__':
+    # begin the unittest.main()
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import opendssdirect as dss
+
+from SimDSS import SimDSS
+from SimDSSPool import SimDSSPool
+
+
+class TestSimDSSPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = SimDSSPool("examples/example_01.dss", "examples/example_01_nwl.csv", nWorkers=2,
+                              loadGenParams={'PFLimInf': 0.95, 'PFLimSup': 0.99, 'LoadLimInf': 100,
+                                             'LoadLimSup': 300, 'AmpGain': 30, 'Freq': 1./100,
+                                             'PhaseShift': 0})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+
+    def test_solve(self):
+        ePQs = [[('loadbus.1', 100.0*k, 30.0), ('loadbus.2', 200.0, 60.0*k), ('loadbus.3', 300.0, 90.0)]
+                for k in range(1, 6)]
+        (V, I_in, I_out) = self.pool.solve(ePQs)
+        self.assertEqual(V.shape, (5, self.pool.getnNodes()))
+        #--- same result as a circuit solved in this process
+        for k in (0, 4):
+            dss.run_command('Clear')
+            dssObj = SimDSS("examples/example_01.dss", "examples/example_01_nwl.csv")
+            dssObj.setLoads(ePQs[k])
+            np.testing.assert_allclose(V[k], dssObj.getVNodes())
+            np.testing.assert_allclose(I_in[k], dssObj.getIinout()[0])
+            np.testing.assert_allclose(I_out[k], dssObj.getIinout()[1])
+
+    def test_solveSeeds(self):
+        (V, I_in, I_out) = self.pool.solveSeeds(range(10), nSteps=2)
+        #--- the result of a seed does not depend on the order or the worker
+        (V2, _, _) = self.pool.solveSeeds([9, 3, 3])
+        self.assertFalse(np.array_equal(V2[1], V[3]))
+        (V2, _, _) = self.pool.solveSeeds([9, 3, 3], nSteps=2)
+        np.testing.assert_array_equal(V2[0], V[9])
+        np.testing.assert_array_equal(V2[1], V[3])
+        np.testing.assert_array_equal(V2[2], V[3])
+
+    def test_workerDied(self):
+        pool = SimDSSPool("examples/example_01.dss", "examples/example_01_nwl.csv", nWorkers=1)
+        try:
+            #--- the caller does not wait forever for the tasks of a dead worker
+            pool._workers[0].kill()
+            ePQ = [('loadbus.1', 100.0, 30.0), ('loadbus.2', 200.0, 60.0), ('loadbus.3', 300.0, 90.0)]
+            with self.assertRaisesRegex(Exception, 'worker died'):
+                pool.solve([ePQ])
+            with self.assertRaisesRegex(Exception, 'closed'):
+                pool.solve([ePQ])
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    # begin the unittest.main()
+    unittest.main()
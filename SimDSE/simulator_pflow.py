@@ -163,10 +163,12 @@ class PFlowSim(mosaik_api.Simulator):
         self.prev_step = 0
 
 
-    def init(self, sid, time_resolution, topofile, nwlfile, loadgen_interval, test, ilpqfile = "", verbose=0):	
+    def init(self, sid, time_resolution, topofile, nwlfile, loadgen_interval, test, ilpqfile = "", loadgen_catchup = False, verbose=0):	
         self.sid = sid       
         self.verbose = verbose
         self.loadgen_interval = loadgen_interval
+        #--- when several load intervals elapse in one step, only solve the loads of the last one
+        self.loadgen_catchup = loadgen_catchup
         self.test = test
         
         self.swpos = 0
@@ -187,7 +189,7 @@ class PFlowSim(mosaik_api.Simulator):
         
         
         #--- Generate and save AdjMatrix and YMatrix
-#         self.dssObj.createAdjMatrix("config/IEEE33_AdjMatrixFull.txt")
+#         self.dssObj.createAdjMatrix("config/IEEE33_AdjMatrixFull.txt", dense=True)
 #         YMatrix = self.dssObj.getYMatrix()
 #         np.save('config/IEEE33_YMatrixFull.npy', YMatrix)
              
@@ -201,6 +203,10 @@ class PFlowSim(mosaik_api.Simulator):
                                         Freq       =  1./1250,
                                         PhaseShift = math.pi)
 
+        #--- the load vectors of the profile follow its node order
+        (nodeNames, P, Q) = self.objLoadGen.readLoadProfiles(self.test)
+        self.dssObj.setLoadOrder(nodeNames)
+
     
         return self.meta
 
@@ -263,18 +269,22 @@ class PFlowSim(mosaik_api.Simulator):
         #--- Activate load generator
 
         #--- Calculate how many times load generator
-        #--- needs to be called
-        for i in range(self.prev_step+1, time+1):
-            if(i%self.loadgen_interval == 0):
-                #-- get a new sample from loadgen
-                # ePQ = self.objLoadGen.createLoads()
-                if (self.verbose > 1): print("simulator_pflow::Generating Load for time: ", i)
-                if(self.test):
-                    ePQ = self.objLoadGen.readLoads(True)
-                else:
-                    ePQ = self.objLoadGen.readLoads(False)
-                #-- execute processing of the the new elastic load
-                self.dssObj.setLoads(ePQ)
+        #--- needs to be called: intervals ending in (prev_step, time]
+        first = self.prev_step // self.loadgen_interval + 1
+        last  = time // self.loadgen_interval
+
+        #--- Catch-up: skip the profile steps of all but the last interval
+        if (self.loadgen_catchup and last > first):
+            self.objLoadGen.skipLoadProfile(last - first)
+            first = last
+
+        for i in range(first, last + 1):
+            #-- get a new sample from loadgen
+            # ePQ = self.objLoadGen.createLoads()
+            if (self.verbose > 1): print("simulator_pflow::Generating Load for time: ", i * self.loadgen_interval)
+            (P, Q) = self.objLoadGen.readLoadVector(self.test)
+            #-- execute processing of the the new elastic load
+            self.dssObj.setLoadVector(P, Q)
 
         #--- use actuators to update opendss state with actions received by controllers (Mosaik)
         # for eid, attrs in inputs.items():
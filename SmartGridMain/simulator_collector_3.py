@@ -17,6 +17,7 @@ import warnings
 import pandas as pd
 import sys
 import datetime
+from Measurement import Measurement
 
 META = {
 	'api-version': '3.0',
@@ -76,6 +77,11 @@ class Collector(mosaik_api.Simulator):
 				# For now, only using the latest data to plot and avoid overlapping data
 				value = value[len(value)-1]
 				if (value not in ['None',  None]):
+					#--- sensor samples are encoded Measurement records
+					if Measurement.isEncoded(value):
+						value = Measurement.decode(value)
+						if value.kind == 'Sensor':
+							value = value.scalar()
 					if isinstance(value, np.float64) or isinstance(value, float):
 						value = np.around(value, decimals = 6)
 					if isinstance(value, str):
@@ -15,6 +15,7 @@ from tabnanny import verbose
 import mosaik_api
 import sys
 import datetime
+from Measurement import Measurement
 
 META = {
     'api-version': '3.0',
@@ -109,7 +110,8 @@ class ControlSim(mosaik_api.Simulator):
                     #--- Calculate value_v
                     VAR_V = 0
                                     
-                    delta_v = float(vmeas.rstrip()) - self.entities[controller_eid]['vset']
+                    #--- the sensor sample is an encoded Measurement record
+                    delta_v = Measurement.decode(vmeas).scalar() - self.entities[controller_eid]['vset']
                     
                     #--- check if voltage on the range or out
                     if(abs(delta_v) < (self.entities[controller_eid]['bw']/2)):
@@ -17,7 +17,7 @@ import pandas as pd
 import os
 import sys
 import csv
-from ast import literal_eval
+from Measurement import Measurement
 import scipy.io as spio
 import math
 from pathlib import Path
@@ -174,59 +174,33 @@ class Estimator(mosaik_api.Simulator):
                     # For now assume that only one element arrives at a time
                     param = param[0]
 
-                    ''' change to dict because NS-3 need to transmit string '''
-                    if isinstance(param, str):
-                        param = literal_eval(param)
-
-                    dev_id  = param['IDT']
-                    dev_type = param['TYPE']
+                    ''' encoded Measurement record, also after the NS-3 transporters '''
+                    meas = Measurement.decode(param)
+                    dev_id  = meas.idt
+                    dev_type = meas.kind
                     ''' store values already per-unit '''
 
                     if (self.verbose > 1):
                         print('simulator_dse::step INPUT PROCESSED: ',
                               'TIME:',  time,
-                              'TIME_Sent:', param['TS'],
+                              'TIME_Sent:', meas.ts,
                               'ID:',   dev_id,
                               'TYPE:',  dev_type,
-                              'PARMS:', param)
-
-
-                    for dev_param_key in param.keys():
-                        if dev_param_key == 'VA' and dev_type == 'Phasor':
-                            df_devs.at[dev_id, 'VMA'] = param['VA'][0] / self.entities[dse_eid]['baseV']
-                            df_devs.at[dev_id, 'VAA'] = param['VA'][1]
-                        elif dev_param_key == 'VB' and dev_type == 'Phasor':
-                            df_devs.at[dev_id, 'VMB'] = param['VB'][0] / self.entities[dse_eid]['baseV']
-                            df_devs.at[dev_id, 'VAB'] = param['VB'][1]
-                        elif dev_param_key == 'VC' and dev_type == 'Phasor':
-                            df_devs.at[dev_id, 'VMC'] = param['VC'][0] / self.entities[dse_eid]['baseV']
-                            df_devs.at[dev_id, 'VAC'] = param['VC'][1]
-                        elif dev_param_key == 'IA':
-                            df_devs.at[dev_id, 'IMA'] = param['IA'][0] / self.entities[dse_eid]['baseI']
-                            df_devs.at[dev_id, 'IAA'] = param['IA'][1]
-                        elif dev_param_key == 'IB':
-                            df_devs.at[dev_id, 'IMB'] = param['IB'][0] / self.entities[dse_eid]['baseI']
-                            df_devs.at[dev_id, 'IAB'] = param['IB'][1]
-                        elif dev_param_key == 'IC':
-                            df_devs.at[dev_id, 'IMC'] = param['IC'][0] / self.entities[dse_eid]['baseI']
-                            df_devs.at[dev_id, 'IAC'] = param['IC'][1]
-                        elif dev_param_key == 'SPA':
-                            df_devs.at[dev_id, 'SPA'] = param['SPA'] / (self.entities[dse_eid]['baseS']*1000)
-                            df_devs.at[dev_id, 'SQA'] =  df_devs.at[dev_id, 'SPA'] * np.tan(np.arccos(self.entities[dse_eid]['basePF'] ))
-                        elif dev_param_key == 'SPB':
-                            df_devs.at[dev_id, 'SPB'] = param['SPB'] / (self.entities[dse_eid]['baseS']*1000)
-                            df_devs.at[dev_id, 'SQB'] =  df_devs.at[dev_id, 'SPB'] * np.tan(np.arccos(self.entities[dse_eid]['basePF'] ))
-                        elif dev_param_key == 'SPC':
-                            df_devs.at[dev_id, 'SPC'] = param['SPC'] / (self.entities[dse_eid]['baseS']*1000)
-                            df_devs.at[dev_id, 'SQC'] =  df_devs.at[dev_id, 'SPC'] * np.tan(np.arccos(self.entities[dse_eid]['basePF'] ))
-                        elif dev_param_key == 'TS':
-                            df_devs.at[dev_id, 'TS']  = param['TS']
-                        elif ((dev_param_key == 'VA')  or (dev_param_key == 'VB')  or (dev_param_key == 'VC')) and  (dev_type != 'Phasor'):
-                            pass
-                        elif (dev_param_key == 'IDT') or (dev_param_key == 'TYPE'):
-                            pass
+                              'PARMS:', meas)
+
+                    for j in meas.phases():
+                        ph = 'ABC'[j]
+                        if dev_type == 'Phasor':
+                            df_devs.at[dev_id, 'VM' + ph] = meas.vmag[j] / self.entities[dse_eid]['baseV']
+                            df_devs.at[dev_id, 'VA' + ph] = meas.vang[j]
+                            df_devs.at[dev_id, 'IM' + ph] = meas.imag[j] / self.entities[dse_eid]['baseI']
+                            df_devs.at[dev_id, 'IA' + ph] = meas.iang[j]
+                        elif dev_type == 'Smartmeter':
+                            df_devs.at[dev_id, 'SP' + ph] = meas.sp[j] / (self.entities[dse_eid]['baseS']*1000)
+                            df_devs.at[dev_id, 'SQ' + ph] =  df_devs.at[dev_id, 'SP' + ph] * np.tan(np.arccos(self.entities[dse_eid]['basePF'] ))
                         else:
-                            raise Exception('dev_param_key value unknown:', dev_param_key, "Device:", dev_id)
+                            raise Exception('Measurement kind not used by the estimator:', dev_type, "Device:", dev_id)
+                    df_devs.at[dev_id, 'TS']  = meas.ts
 
         for dse_eid in self.entities:
             if (0 == time % self.entities[dse_eid]['acc_period']):
@@ -10,6 +10,7 @@ import numpy as np
 import warnings
 import pandas as pd
 import sys
+from Measurement import Measurement
 
 META = {
 	'type': 'event-based',
@@ -66,6 +67,11 @@ class InfluxDB(mosaik_api.Simulator):
 			if value not in ['None', None]:
 				# For now, only using the latest data to plot and avoid overlapping data
 				value = value[len(value)-1]
+				#--- sensor samples are encoded Measurement records
+				if Measurement.isEncoded(value):
+					value = Measurement.decode(value)
+					if value.kind == 'Sensor':
+						value = value.scalar()
 				if isinstance(value, np.float64) or isinstance(value, float):
 					value = np.around(value, decimals = 6)
 				if isinstance(value, str):
@@ -10,8 +10,6 @@ Works only with MOSAIK 3 and later versions
 @company University of Alberta - Computing Science
 '''
 
-import queue
-import random
 import mosaik_api
 import os
 import sys
@@ -19,6 +17,7 @@ import csv
 from SimDSS import SimDSS
 from LoadGenerator import LoadGenerator
 from CktDef import CKTTerm, CKTPhase
+from SensorBank import SensorBank, SamplingWheel
 import numpy as np
 import opendssdirect as dss
 import math
@@ -65,200 +64,6 @@ META = {
     ],    
 }
 
-class PhasorSim:
-    def __init__(self,
-             sid,
-             cktTerminal,
-             cktPhase,
-             step_size, 
-             objDSS,  
-             cktElement, 
-             error, 
-             verbose):
-        self.idt        = sid
-        self.objDSS     = objDSS
-        self.cktElement = cktElement
-        self.cktTerminal = cktTerminal
-        self.cktPhase   = cktPhase
-        self.error      = float(error)
-        self.verbose    = verbose
-        self.priorValue = None
-        self.priorTime  = None
-        self.time_diff_resolution = 1e-9
-        self.randomTime = random.randint(0, 1)
-        self.step_size = int(step_size)
-    
-    def updateValues(self, time):
-        if (self.verbose > 2): print(self.idt,'::updateValues', 
-                                     self.cktElement, self.cktTerminal, self.cktPhase)
-
-        if(0 == (time % self.step_size)):
-            val = {}
-            val['IDT'] = self.idt  
-            val['TYPE'] = 'Phasor'
-            
-            if (self.cktPhase == 'PHASE_1'):
-                phases = ['PHASE_1']
-            elif (self.cktPhase == 'PHASE_2'):
-                phases = ['PHASE_2']
-            elif (self.cktPhase == 'PHASE_3'):
-                phases = ['PHASE_3']
-            elif (self.cktPhase == 'PHASE_12'):
-                phases = ['PHASE_1', 'PHASE_2']            
-            elif (self.cktPhase == 'PHASE_13'):
-                phases = ['PHASE_1', 'PHASE_3']
-            elif (self.cktPhase == 'PHASE_23'):
-                phases = ['PHASE_2', 'PHASE_3']              
-            elif (self.cktPhase == 'PHASE_123'):
-                phases = ['PHASE_1', 'PHASE_2', 'PHASE_3']
-
-            for ph in phases:
-                (VComp, IComp, _) = self.objDSS.getCktElementState(self.cktElement, 
-                                                     CKTTerm[self.cktTerminal].value, 
-                                                     CKTPhase[ph].value)
-
-                VComp = self.addNoise(VComp)
-                IComp = self.addNoise(IComp)
-                (VMag, VAng) = self.R2P(VComp)
-                (IMag, IAng) = self.R2P(IComp)
-                
-                if (ph == 'PHASE_1'):
-                    val['VA'] = (VMag, VAng)
-                    val['IA'] = (IMag, IAng)
-                elif (ph == 'PHASE_2'):
-                    val['VB'] = (VMag, VAng)
-                    val['IB'] = (IMag, IAng)
-                elif (ph == 'PHASE_3'):
-                    val['VC'] = (VMag, VAng)
-                    val['IC'] = (IMag, IAng)
-
-            self.priorTime  = time + self.time_diff_resolution
-            self.priorValue = val
-            if (self.verbose > 0): print('Phasor::updateValues Time = ', self.priorTime, 'Value = ', self.priorValue)
-            if (self.verbose > 2): print('Phasor[', self.idt, ']::updateValues v =', val) 
-
-            return (time + self.step_size)
-        else:
-            self.priorTime  = None
-            self.priorValue = None
-            if (self.verbose > 2): print('Phasor[', self.idt, ']::updateValues v =', val) 
-
-            return -1
-
-    def getLastValue(self):
-        if(self.priorValue != None):
-            self.priorValue['TS'] = self.priorTime
-        return self.priorValue, self.priorTime
-
-    def R2P(self, x):
-        return np.abs(x), np.angle(x)
-    
-    def addNoise(self, x):
-        noiseReal = np.random.normal(0, self.error, 1)
-        noiseImag = np.random.normal(0, self.error, 1)
-        noise = complex(noiseReal, noiseImag)
-        return x + noise
-
-
-class SmartmeterSim:
-    def __init__(self,
-             sid,
-             cktTerminal,
-             cktPhase,
-             step_size, 
-             objDSS,  
-             cktElement, 
-             error, 
-             verbose):
-        self.idt        = sid
-        self.objDSS     = objDSS
-        self.cktElement = cktElement
-        self.cktTerminal = cktTerminal
-        self.cktPhase   = cktPhase
-        self.error      = float(error)
-        self.verbose    = verbose
-        self.priorValue = None
-        self.priorTime  = None
-        self.time_diff_resolution = 1e-9
-        self.randomTime = random.randint(0, 1)
-        self.step_size = int(step_size)
-    
-    def updateValues(self, time):
-        if(0 == (time % self.step_size)):
-            if (self.verbose > 2): print('Smartmeter::updateValues', 
-                                    self.cktElement, self.cktTerminal, self.cktPhase)
-        
-        # if (0 == time % (self.step_size + self.randomTime)):
-        # for now assume that there is no randomTime
-        if (0 == time % (self.step_size)):
-            val = {}
-            val['IDT'] = self.idt
-            val['TYPE'] = 'Smartmeter'
-            
-            if (self.cktPhase == 'PHASE_1'):
-                phases = ['PHASE_1']
-            elif (self.cktPhase == 'PHASE_2'):
-                phases = ['PHASE_2']
-            elif (self.cktPhase == 'PHASE_3'):
-                phases = ['PHASE_3']
-            elif (self.cktPhase == 'PHASE_12'):
-                phases = ['PHASE_1', 'PHASE_2']            
-            elif (self.cktPhase == 'PHASE_13'):
-                phases = ['PHASE_1', 'PHASE_3']
-            elif (self.cktPhase == 'PHASE_23'):
-                phases = ['PHASE_2', 'PHASE_3']              
-            elif (self.cktPhase == 'PHASE_123'):
-                phases = ['PHASE_1', 'PHASE_2', 'PHASE_3']
-
-            for ph in phases:
-                (VComp, IComp, _) = self.objDSS.getCktElementState(self.cktElement,                               
-                                                     CKTTerm[self.cktTerminal].value, 
-                                                     CKTPhase[ph].value)
-                
-                VComp = self.addNoise(VComp)
-                IComp = self.addNoise(IComp)                
-                (VMag, _) = self.R2P(VComp)
-                SP = (VComp * np.conj(-IComp)).real
-                
-                #--- for voltage
-                if (ph == 'PHASE_1'):
-                    val['VA'] = VMag
-                    val['SPA'] = SP
-                elif (ph == 'PHASE_2'):
-                    val['VB'] = VMag
-                    val['SPB'] = SP
-                elif (ph == 'PHASE_3'):
-                    val['VC'] = VMag
-                    val['SPC'] = SP
-
-            self.priorTime  = time + self.time_diff_resolution
-            self.priorValue = val
-            if (self.verbose > 0): print('Smartmeter::updateValues Time = ', self.priorTime, 'Value = ', self.priorValue)
-            if (self.verbose > 2): print('Smartmeter[', self.idt, ']::updateValues v =', val)
-        
-            return (time + self.step_size)
-        else:
-            self.priorTime  = None
-            self.priorValue = None 
-            if (self.verbose > 2): print('Smartmeter[', self.idt, ']::updateValues v =', val)
-        
-            return -1 
-
-    def getLastValue(self):
-        if(self.priorValue != None):
-            self.priorValue['TS'] = self.priorTime
-        return self.priorValue, self.priorTime
-
-    def R2P(self, x):
-        return np.abs(x), np.angle(x)
-    
-    def addNoise(self, x):
-        noiseReal = np.random.normal(0, self.error, 1)
-        noiseImag = np.random.normal(0, self.error, 1)
-        noise = complex(noiseReal, noiseImag)
-        return x + noise
-
-
 class ProberSim:
     def __init__(self, eid, step_size, objDSS, element, terminal, phase, verbose):
         self.idt        = eid
@@ -271,6 +76,10 @@ class ProberSim:
         self.verbose    = verbose
         self.priorValue = None
         self.priorTime  = None
+        #--- voltage probers are sampled from the pflow snapshot
+        self.probe      = None
+        if (eid.split('.')[1] == '0'):
+            self.probe  = objDSS.addProbe(element, CKTTerm[terminal].value, CKTPhase[phase].value)
         
     def updateValues(self, time):
         if (self.verbose > 0): print('ProberSim::updateValues', self.idt, self.elem, self.term, self.ph)
@@ -283,7 +92,7 @@ class ProberSim:
             didx = eid[2]
             # 0 = voltage, 1 = tap, 2 = load, 3 = voltage phase angle
             if (cidx == '0'):
-                (VComp, _, _) =  self.objDSS.getCktElementState(self.elem, CKTTerm[self.term].value, CKTPhase[self.ph].value)
+                VComp = self.objDSS.getSnapshot()[0][self.probe]
                 val = self.R2P(VComp)[0] #-- only got the real part    
             if (cidx == '1'):
                 val = self.objDSS.getTrafoTap(self.elem)
@@ -311,57 +120,6 @@ class ProberSim:
 
 
 
-class SensorSim:
-    def __init__(self, eid, step_size, objDSS, element, terminal, phase, verbose):
-        self.idt        = eid
-        self.step_size  = int(step_size)
-        self.objDSS     = objDSS
-        # self.action     = action
-        self.elem       = element
-        self.term       = terminal
-        self.ph         = phase
-        self.verbose    = verbose
-        self.priorValue = None
-        self.priorTime  = None
-        self.time_diff_resolution = 1e-9
-        
-        
-    def updateValues(self, time):
-        if (self.verbose > 0): print('SensorSim::getValue', self.elem, self.term, self.ph)
-        
-        if (0 == time % self.step_size):
-            # no action choice - default action is get voltage value
-            # if (self.action == "getV"):
-            (VComp, _, _) =  self.objDSS.getCktElementState(self.elem, CKTTerm[self.term].value, CKTPhase[self.ph].value)
-            val = self.R2P(VComp)[0] #-- only got the real part
-            # if (self.action == "getTap"):
-            #     val = self.objDSS.getTrafoTap(self.elem)
-            self.priorTime  = time + self.time_diff_resolution
-            self.priorValue = val
-            if (self.verbose > 0): print('SensorSim::getValue Time = ', self.priorTime, 'Value = ', self.priorValue)
-            if (self.verbose > 1): print('SensorSim::getValue Next step = ', time + self.step_size)
-            if (self.verbose > 2): print('SensorSim[', self.idt, ']::getValue v =', val)        
-
-            return (time + self.step_size)
-        else:
-            self.priorTime  = None
-            self.priorValue = None
-            if (self.verbose > 0): print('SensorSim::getValue Time = ', self.priorTime, 'Value = ', self.priorValue)
-            if (self.verbose > 2): print('SensorSim[', self.idt, ']::getValue v =', val)        
-
-            return -1
-            
-        
-
-    def getLastValue(self):
-        return self.priorValue, self.priorTime
-
-    
-    def R2P(self, x):
-        return np.abs(x), np.angle(x)
-
-
-
 class ActuatorSim:
     def __init__(self, eid, step_size, objDSS, element, terminal, phase, verbose):
         self.eid        = eid
@@ -413,13 +171,23 @@ class PFlowSim(mosaik_api.Simulator):
         self.instances = {}
         self.loadgen_interval = 1
         self.time = -1
-        self.next_steps = queue.PriorityQueue()
+        #--- sensors drive the next step, probers are read when the simulator steps
+        #--- Sensor, Phasor and Smartmeter instances are rows of a SensorBank per model
+        self.banks = {}
+        self.proberWheel = SamplingWheel()
+        self.actuators = []
+        self.order = {}
+        self.due = []
 
 
-    def init(self, sid, time_resolution, topofile, nwlfile, loadgen_interval, ilpqfile="", verbose=0):	
+    def init(self, sid, time_resolution, topofile, nwlfile, loadgen_interval, ilpqfile="", solve_deadband=0.0, isolated=False, cachedir=None, noise_seed=0, loadgen_catchup=False, verbose=0):	
         self.sid = sid       
         self.verbose = verbose
+        #--- seed of the sensor noise streams
+        self.noise_seed = noise_seed
         self.loadgen_interval = loadgen_interval
+        #--- when several load intervals elapse in one step, only solve the loads of the last one
+        self.loadgen_catchup = loadgen_catchup
         
         self.swpos = 0
         self.swcycle = 35
@@ -429,16 +197,25 @@ class PFlowSim(mosaik_api.Simulator):
         if (self.verbose > 0): print('simulator_pflow::init', self.sid)
         if (self.verbose > 1): print('simulator_pflow::init', topofile, nwlfile, ilpqfile, verbose)
 
+        #--- the element reads of the simulator fill reused numpy buffers
+        dss.utils.set_numpy_buffers(True)
+
         #--- start opendss
-        self.dssObj = SimDSS(topofile, nwlfile, ilpqfile)
+        #--- isolated: the feeder gets its own engine context, so several
+        #--- PFlowSim instances can run in the same process
+        #--- cachedir: reuse the tables derived from the files in the next starts
+        self.dssObj = SimDSS(topofile, nwlfile, ilpqfile, isolated=isolated, cachedir=cachedir)
+        #--- skip power flows for load changes below the deadband (kVA)
+        self.dssObj.setSolveDeadband(solve_deadband)
         if (self.verbose > 2):
             self.dssObj.showLoads()
             self.dssObj.showVNodes()
             self.dssObj.showIinout()
             self.dssObj.showVMagAnglePu()
-            dss.run_command("Show Buses")
-            dss.run_command("Show Voltages LN nodes")
-            dss.run_command("Show Taps")
+            if not isolated:
+                dss.run_command("Show Buses")
+                dss.run_command("Show Voltages LN nodes")
+                dss.run_command("Show Taps")
             
         #--- create instance of LoadGenerator
         #--- IEEE13
@@ -461,6 +238,12 @@ class PFlowSim(mosaik_api.Simulator):
         #                                 AmpGain    =  0.25,
         #                                 Freq       =  1./1250,
         #                                 PhaseShift = math.pi)
+
+        #--- the load vectors of the generator follow its node order
+        self.dssObj.setLoadOrder(self.objLoadGen.getNodeNames())
+
+        for model in ('Sensor', 'Phasor', 'Smartmeter'):
+            self.banks[model] = SensorBank(model, self.dssObj, seed=self.noise_seed)
     
         sys.stdout.flush()
         return self.meta
@@ -471,27 +254,14 @@ class PFlowSim(mosaik_api.Simulator):
         self.data[eid] = {}     
         self.instances[eid] = {}
 
-        if (model == 'Phasor'): 
-            self.instances[eid] = PhasorSim(eid,
-                                            cktTerminal  = cktTerminal, 
-                                            cktPhase     = cktPhase,
-                                            step_size    = step_size,
-                                            objDSS       = self.dssObj,
-                                            cktElement   = cktElement,
-                                            error        = error,
-                                            verbose      = verbose
-                                           ) 
-                
-        if (model == 'Smartmeter'): 
-            self.instances[eid] = SmartmeterSim(eid,
-                                            cktTerminal  = cktTerminal, 
-                                            cktPhase     = cktPhase,
-                                            step_size    = step_size,
-                                            objDSS       = self.dssObj,
-                                            cktElement   = cktElement,
-                                            error        = error,
-                                            verbose      = verbose
-                                           )
+        if (model == 'Sensor') or (model == 'Phasor') or (model == 'Smartmeter'):
+            self.banks[model].add(eid,
+                                  cktTerminal  = cktTerminal,
+                                  cktPhase     = cktPhase,
+                                  step_size    = step_size,
+                                  cktElement   = cktElement,
+                                  error        = error)
+            self.instances[eid] = self.banks[model]
 
         if (model == 'Prober'):
             self.instances[eid] = ProberSim(eid,
@@ -502,15 +272,6 @@ class PFlowSim(mosaik_api.Simulator):
                                         phase     = cktPhase,
                                         verbose   = verbose)
 
-        if (model == 'Sensor'):
-            self.instances[eid] = SensorSim(eid,
-                                        step_size = step_size, 
-                                        objDSS    = self.dssObj,
-                                        element   = cktElement, 
-                                        terminal  = cktTerminal, 
-                                        phase     = cktPhase,
-                                        verbose   = verbose)
-            
         if (model == 'Actuator'):
             self.instances[eid] = ActuatorSim(eid, 
                                         step_size = step_size,
@@ -519,6 +280,13 @@ class PFlowSim(mosaik_api.Simulator):
                                         terminal  = cktTerminal, 
                                         phase     = cktPhase,
                                         verbose   = verbose)            
+
+        #--- sampling schedule of the instance
+        if (model == 'Prober'):
+            self.proberWheel.add(eid, step_size)
+        elif (model == 'Actuator'):
+            self.actuators.append(eid)
+        self.order[eid] = len(self.order)
         
         sys.stdout.flush()
         return [{'eid': eid, 'type': model}]
@@ -548,23 +316,34 @@ class PFlowSim(mosaik_api.Simulator):
             else:   loadGen_cnt = math.floor(time/self.loadgen_interval) \
                     - math.floor(self.prev_step/self.loadgen_interval)
 
+            #--- Catch-up: skip the samples of all but the last interval,
+            #--- the generator ends in the same state and the last loads are the same
+            loadGen_skip = 0
+            if (self.loadgen_catchup and loadGen_cnt > 1):
+                loadGen_skip = loadGen_cnt - 1
+                #-- IEEE13 randomized loads
+                self.objLoadGen.skipLoadVectors(loadGen_skip)
+                #-- IEEE33 load profile
+                # self.objLoadGen.skipLoadProfile(loadGen_skip)
+
             #--- Activate load generator
-            for i in range(0, loadGen_cnt):
+            for i in range(loadGen_skip, loadGen_cnt):
                 if (self.verbose > 1): print("Generating load for: ", \
                     self.loadgen_interval * ( math.ceil( (self.prev_step+1)/self.loadgen_interval ) + i))
                 #-- get a new sample from loadgen
 
                 #-- IEEE13 Generate new randomized loads
-                ePQ = self.objLoadGen.createLoads()
+                (P, Q) = self.objLoadGen.createLoadVector()
 
                 #-- IEEE33 Get loads for standard FULL dataset
-                # ePQ = self.objLoadGen.readLoads(False)
+                #-- (setLoadOrder with the nodeNames of readLoadProfiles)
+                # (P, Q) = self.objLoadGen.readLoadVector(False)
 
                 #-- IEEE33 Get loads for standard TEST dataset
-                # ePQ = self.objLoadGen.readLoads(True)
+                # (P, Q) = self.objLoadGen.readLoadVector(True)
 
                 #-- execute processing of the the new elastic load
-                self.dssObj.setLoads(ePQ)
+                self.dssObj.setLoadVector(P, Q)
 
         #--- Create step load on Bus 611
 #         if (time > 50 and time < 350):
@@ -612,29 +391,25 @@ class PFlowSim(mosaik_api.Simulator):
             
         #--- 
         #--- get new set of sensor data from OpenDSS
+        #--- only the sensors due at this time are sampled, one pass per model
         #---   
-        for instance_eid in self.instances:
-            if (instance_eid.find("Sensor") > -1) or \
-                (instance_eid.find("Phasor") > -1) or \
-                (instance_eid.find("SmartMeter") > -1):
-                self.next_step = self.instances[instance_eid].updateValues(time)
-                if self.next_step != -1:
-                    self.next_steps.put(self.next_step)
+        sensors = []
+        for bank in self.banks.values():
+            sensors.extend(bank.getEids(bank.step(time)))
 
         #--- 
         #--- get new set of prober data from OpenDSS
         #---   
-        for instance_eid in self.instances:
-            if instance_eid.find("Prober") > -1:
-                self.instances[instance_eid].updateValues(time)
-                    
-
-        #--- Filter the next time steps and return the earliest next time step
-        self.next_step = self.next_steps.queue[0]
-        #--- For a time-based simulator, there is always a next step
-        while(self.time >= self.next_steps.queue[0]):
-            self.next_step = self.next_steps.get()
-        self.next_step = self.next_steps.queue[0]
+        probers = self.proberWheel.advance(time)
+        for instance_eid in probers:
+            self.instances[instance_eid].updateValues(time)
+
+        #--- instances with data at this time, in creation order
+        self.due = sorted(sensors + probers, key=self.order.get)
+
+        #--- the earliest next sampling time of the sensors
+        next_steps = [bank.next() for bank in self.banks.values() if bank.next() is not None]
+        self.next_step = min(next_steps) if next_steps else None
 
         if(self.verbose > 1):
             print('simulator_pflow::step next_step = ', self.next_step)
@@ -650,9 +425,9 @@ class PFlowSim(mosaik_api.Simulator):
         if (self.verbose > 0): print('simulator_pflow::get_data INPUT', outputs)
         
         data = {}
-        for instance_eid in self.instances:
+        for instance_eid in sorted(self.actuators + self.due, key=self.order.get):
             # Acuators provide data only when there is actuation
-            if (instance_eid.find("Actuator") > -1):
+            if (instance_eid in self.actuators):
                 val_v, val_t = self.instances[instance_eid].getLastValue()
                 self.data[instance_eid]['v'] = val_v
                 self.data[instance_eid]['t'] = val_t
@@ -663,8 +438,14 @@ class PFlowSim(mosaik_api.Simulator):
                     data[instance_eid]['v'].append(self.data[instance_eid]['v'])
                     data[instance_eid]['t'].append(self.data[instance_eid]['t'])
             # All other models provide data at their own fixed intervals
-            elif (self.time % self.instances[instance_eid].step_size == 0):
-                val_v, val_t = self.instances[instance_eid].getLastValue()
+            else:
+                if isinstance(self.instances[instance_eid], SensorBank):
+                    #--- sensor samples are sent as encoded Measurement records
+                    val_v, val_t = self.instances[instance_eid].getLastValue(instance_eid)
+                    if (val_v != None):
+                        val_v = val_v.encode()
+                else:
+                    val_v, val_t = self.instances[instance_eid].getLastValue()
                 self.data[instance_eid]['v'] = val_v
                 self.data[instance_eid]['t'] = val_t
                 data[instance_eid] = {}
@@ -692,5 +473,7 @@ class PFlowSim(mosaik_api.Simulator):
         # self.dssObj.showIinout()
         print("simulator_pflow::finalize:total execution time = ", self.total_exec_time)
         print("simulator_pflow::finalize:total steps = ", self.step_count)
+        print("simulator_pflow::finalize:skipped solves = ", self.dssObj.getSkippedSolves())
+        print("simulator_pflow::finalize:solve stats = ", self.dssObj.getSolveStats())
         sys.stdout.flush()
 
@@ -0,0 +1,30 @@
+import unittest
+import math
+
+from Measurement import Measurement
+from simulator_influxdb import InfluxDB
+
+
+class TestInfluxDB(unittest.TestCase):
+
+    def setUp(self):
+        self.sim = InfluxDB()
+        self.sim.init('InfluxDB', 1.0, 'http://localhost:8086', 'token', 'org', 'bucket')
+        #--- no client: the points are only sent after 500 samples
+        self.sim.eid = 'InfluxDB_1'
+
+
+    def test_step(self):
+        sample = Measurement('Sensor_1', 'Sensor', 0b100, 10.000000001, (math.nan, math.nan, 2401.5)).encode()
+        inputs = {'InfluxDB_1': {'v': {'Sensor_1': [sample], 'Tap_1': ['3']},
+                                 't': {'Sensor_1': [10], 'Tap_1': [10]}}}
+        self.sim.step(10, inputs, 20)
+        lines = [point.to_line_protocol() for point in self.sim.sequence]
+        #--- the encoded sample is written as its value
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('my_measurement,equipment=Sensor_1 output=2401.5 '))
+        self.assertTrue(lines[1].startswith('my_measurement,equipment=Tap_1 output=3 '))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,11 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def ClearAll():
+    columns_cache.clear()
     lib.DSS_ClearAll()
 
 
@@ -90,6 +92,7 @@ def ShowPanel():
 
 
 def NewCircuit(name):
+    columns_cache.clear()
     if type(name) is not bytes:
         name = name.encode(codec)
 
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Reset():
@@ -20,6 +21,7 @@ def CTRatio(*args):
         return lib.CapControls_Get_CTratio()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_CTratio(Value)
 
@@ -31,6 +33,7 @@ def Capacitor(*args):
         return get_string(lib.CapControls_Get_Capacitor())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -49,6 +52,7 @@ def DeadTime(*args):
         return lib.CapControls_Get_DeadTime()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_DeadTime(Value)
 
@@ -60,6 +64,7 @@ def Delay(*args):
         return lib.CapControls_Get_Delay()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_Delay(Value)
 
@@ -71,6 +76,7 @@ def DelayOff(*args):
         return lib.CapControls_Get_DelayOff()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_DelayOff(Value)
 
@@ -87,6 +93,7 @@ def Mode(*args):
         return lib.CapControls_Get_Mode()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_Mode(Value)
 
@@ -98,6 +105,7 @@ def MonitoredObj(*args):
         return get_string(lib.CapControls_Get_MonitoredObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -112,6 +120,7 @@ def MonitoredTerm(*args):
         return lib.CapControls_Get_MonitoredTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_MonitoredTerm(Value)
 
@@ -142,6 +151,7 @@ def OFFSetting(*args):
         return lib.CapControls_Get_OFFSetting()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_OFFSetting(Value)
 
@@ -153,6 +163,7 @@ def ONSetting(*args):
         return lib.CapControls_Get_ONSetting()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_ONSetting(Value)
 
@@ -164,6 +175,7 @@ def PTRatio(*args):
         return lib.CapControls_Get_PTratio()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_PTratio(Value)
 
@@ -175,6 +187,7 @@ def UseVoltOverride(*args):
         return lib.CapControls_Get_UseVoltOverride() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_UseVoltOverride(Value)
 
@@ -186,6 +199,7 @@ def Vmax(*args):
         return lib.CapControls_Get_Vmax()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_Vmax(Value)
 
@@ -197,6 +211,7 @@ def Vmin(*args):
         return lib.CapControls_Get_Vmin()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CapControls_Set_Vmin(Value)
 
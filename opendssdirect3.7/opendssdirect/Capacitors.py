@@ -8,21 +8,26 @@ from ._utils import (
     prepare_int32_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AddStep():
+    columns_cache.clear()
     return lib.Capacitors_AddStep() != 0
 
 
 def Close():
+    columns_cache.clear()
     lib.Capacitors_Close()
 
 
 def Open():
+    columns_cache.clear()
     lib.Capacitors_Open()
 
 
 def SubtractStep():
+    columns_cache.clear()
     return lib.Capacitors_SubtractStep() != 0
 
 
@@ -53,6 +58,7 @@ def IsDelta(*args):
         return lib.Capacitors_Get_IsDelta() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Capacitors_Set_IsDelta(Value)
 
@@ -83,6 +89,7 @@ def NumSteps(*args):
         return lib.Capacitors_Get_NumSteps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Capacitors_Set_NumSteps(Value)
 
@@ -97,6 +104,7 @@ def States(*args):
         return get_int32_array(lib.Capacitors_Get_States)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_int32_array(Value)
     lib.Capacitors_Set_States(ValuePtr, ValueCount)
@@ -109,6 +117,7 @@ def kV(*args):
         return lib.Capacitors_Get_kV()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Capacitors_Set_kV(Value)
 
@@ -120,6 +129,7 @@ def kvar(*args):
         return lib.Capacitors_Get_kvar()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Capacitors_Set_kvar(Value)
 
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
-from ._utils import lib, get_string, get_string_array, get_float64_array
+from ._utils import Float64Buffer, lib, get_string, get_string_array, get_float64_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Capacity(Start, Increment):
@@ -9,6 +10,7 @@ def Capacity(Start, Increment):
 
 
 def Disable(Name):
+    columns_cache.clear()
     if type(Name) is not bytes:
         Name = Name.encode(codec)
 
@@ -16,6 +18,7 @@ def Disable(Name):
 
 
 def Enable(Name):
+    columns_cache.clear()
     if type(Name) is not bytes:
         Name = Name.encode(codec)
 
@@ -212,8 +215,14 @@ def YNodeOrder():
     return get_string_array(lib.Circuit_Get_YNodeOrder)
 
 
+_YNodeVArray = Float64Buffer(lib.Circuit_Get_YNodeVarray)
+
+
 def YNodeVArray():
     """(read-only) Complex array of actual node voltages in same order as SystemY matrix."""
+    if Float64Buffer.enabled:
+        return _YNodeVArray()
+
     return get_float64_array(lib.Circuit_Get_YNodeVarray)
 
 
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 from ._utils import (
+    Float64Buffer,
     lib,
     get_string,
     get_string_array,
@@ -9,9 +10,11 @@ from ._utils import (
     prepare_string_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Close(Term, Phs):
+    columns_cache.clear()
     lib.CktElement_Close(Term, Phs)
 
 
@@ -38,6 +41,7 @@ def IsOpen(Term, Phs):
 
 
 def Open(Term, Phs):
+    columns_cache.clear()
     lib.CktElement_Open(Term, Phs)
 
 
@@ -66,6 +70,7 @@ def BusNames(*args):
         return get_string_array(lib.CktElement_Get_BusNames)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_string_array(Value)
     lib.CktElement_Set_BusNames(ValuePtr, ValueCount)
@@ -81,8 +86,14 @@ def CplxSeqVoltages():
     return get_float64_array(lib.CktElement_Get_CplxSeqVoltages)
 
 
+_Currents = Float64Buffer(lib.CktElement_Get_Currents)
+
+
 def Currents():
     """(read-only) Complex array of currents into each conductor of each terminal"""
+    if Float64Buffer.enabled:
+        return _Currents()
+
     return get_float64_array(lib.CktElement_Get_Currents)
 
 
@@ -98,6 +109,7 @@ def DisplayName(*args):
         return get_string(lib.CktElement_Get_DisplayName())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -115,6 +127,7 @@ def EmergAmps(*args):
         return lib.CktElement_Get_EmergAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CktElement_Set_EmergAmps(Value)
 
@@ -126,6 +139,7 @@ def Enabled(*args):
         return lib.CktElement_Get_Enabled() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CktElement_Set_Enabled(Value)
 
@@ -185,6 +199,7 @@ def NormalAmps(*args):
         return lib.CktElement_Get_NormalAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.CktElement_Set_NormalAmps(Value)
 
@@ -229,8 +244,14 @@ def PhaseLosses():
     return get_float64_array(lib.CktElement_Get_PhaseLosses)
 
 
+_Powers = Float64Buffer(lib.CktElement_Get_Powers)
+
+
 def Powers():
     """(read-only) Complex array of powers into each conductor of each terminal"""
+    if Float64Buffer.enabled:
+        return _Powers()
+
     return get_float64_array(lib.CktElement_Get_Powers)
 
 
@@ -254,8 +275,14 @@ def SeqVoltages():
     return get_float64_array(lib.CktElement_Get_SeqVoltages)
 
 
+_Voltages = Float64Buffer(lib.CktElement_Get_Voltages)
+
+
 def Voltages():
     """(read-only) Complex array of voltages at terminals"""
+    if Float64Buffer.enabled:
+        return _Voltages()
+
     return get_float64_array(lib.CktElement_Get_Voltages)
 
 
@@ -2,9 +2,11 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Close():
+    columns_cache.clear()
     lib.Fuses_Close()
 
 
@@ -13,6 +15,7 @@ def IsBlown():
 
 
 def Open():
+    columns_cache.clear()
     lib.Fuses_Open()
 
 
@@ -36,6 +39,7 @@ def Delay(*args):
         return lib.Fuses_Get_Delay()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Fuses_Set_Delay(Value)
 
@@ -52,6 +56,7 @@ def MonitoredObj(*args):
         return get_string(lib.Fuses_Get_MonitoredObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -69,6 +74,7 @@ def MonitoredTerm(*args):
         return lib.Fuses_Get_MonitoredTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Fuses_Set_MonitoredTerm(Value)
 
@@ -110,6 +116,7 @@ def RatedCurrent(*args):
         return lib.Fuses_Get_RatedCurrent()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Fuses_Set_RatedCurrent(Value)
 
@@ -124,6 +131,7 @@ def SwitchedObj(*args):
         return get_string(lib.Fuses_Get_SwitchedObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -141,6 +149,7 @@ def SwitchedTerm(*args):
         return lib.Fuses_Get_SwitchedTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Fuses_Set_SwitchedTerm(Value)
 
@@ -152,6 +161,7 @@ def TCCCurve(*args):
         return get_string(lib.Fuses_Get_TCCcurve())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array, get_float64_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -26,6 +27,7 @@ def ForcedON(*args):
         return lib.Generators_Get_ForcedON() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_ForcedON(Value)
 
@@ -37,6 +39,7 @@ def Model(*args):
         return lib.Generators_Get_Model()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_Model(Value)
 
@@ -67,6 +70,7 @@ def PF(*args):
         return lib.Generators_Get_PF()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_PF(Value)
 
@@ -78,6 +82,7 @@ def Phases(*args):
         return lib.Generators_Get_Phases()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_Phases(Value)
 
@@ -99,6 +104,7 @@ def Vmaxpu(*args):
         return lib.Generators_Get_Vmaxpu()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_Vmaxpu(Value)
 
@@ -110,6 +116,7 @@ def Vminpu(*args):
         return lib.Generators_Get_Vminpu()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_Vminpu(Value)
 
@@ -132,6 +139,7 @@ def kV(*args):
         return lib.Generators_Get_kV()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_kV(Value)
 
@@ -143,6 +151,7 @@ def kVARated(*args):
         return lib.Generators_Get_kVArated()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_kVArated(Value)
 
@@ -154,6 +163,7 @@ def kW(*args):
         return lib.Generators_Get_kW()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_kW(Value)
 
@@ -165,6 +175,7 @@ def kvar(*args):
         return lib.Generators_Get_kvar()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Generators_Set_kvar(Value)
 
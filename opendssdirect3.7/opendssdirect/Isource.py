@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -16,6 +17,7 @@ def Amps(*args):
         return lib.ISources_Get_Amps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.ISources_Set_Amps(Value)
 
@@ -27,6 +29,7 @@ def AngleDeg(*args):
         return lib.ISources_Get_AngleDeg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.ISources_Set_AngleDeg(Value)
 
@@ -48,6 +51,7 @@ def Frequency(*args):
         return lib.ISources_Get_Frequency()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.ISources_Set_Frequency(Value)
 
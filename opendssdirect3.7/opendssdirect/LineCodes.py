@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -22,6 +23,7 @@ def C0(*args):
         return lib.LineCodes_Get_C0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_C0(Value)
 
@@ -33,6 +35,7 @@ def C1(*args):
         return lib.LineCodes_Get_C1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_C1(Value)
 
@@ -44,6 +47,7 @@ def Cmatrix(*args):
         return get_float64_array(lib.LineCodes_Get_Cmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LineCodes_Set_Cmatrix(ValuePtr, ValueCount)
@@ -61,6 +65,7 @@ def EmergAmps(*args):
         return lib.LineCodes_Get_EmergAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_EmergAmps(Value)
 
@@ -99,6 +104,7 @@ def NormAmps(*args):
         return lib.LineCodes_Get_NormAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_NormAmps(Value)
 
@@ -110,6 +116,7 @@ def Phases(*args):
         return lib.LineCodes_Get_Phases()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_Phases(Value)
 
@@ -121,6 +128,7 @@ def R0(*args):
         return lib.LineCodes_Get_R0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_R0(Value)
 
@@ -132,6 +140,7 @@ def R1(*args):
         return lib.LineCodes_Get_R1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_R1(Value)
 
@@ -143,6 +152,7 @@ def Rmatrix(*args):
         return get_float64_array(lib.LineCodes_Get_Rmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LineCodes_Set_Rmatrix(ValuePtr, ValueCount)
@@ -154,6 +164,7 @@ def Units(*args):
         return lib.LineCodes_Get_Units()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_Units(Value)
 
@@ -165,6 +176,7 @@ def X0(*args):
         return lib.LineCodes_Get_X0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_X0(Value)
 
@@ -176,6 +188,7 @@ def X1(*args):
         return lib.LineCodes_Get_X1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LineCodes_Set_X1(Value)
 
@@ -187,6 +200,7 @@ def Xmatrix(*args):
         return get_float64_array(lib.LineCodes_Get_Xmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LineCodes_Set_Xmatrix(ValuePtr, ValueCount)
@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def New(Name):
@@ -29,6 +30,7 @@ def Bus1(*args):
         return get_string(lib.Lines_Get_Bus1())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -43,6 +45,7 @@ def Bus2(*args):
         return get_string(lib.Lines_Get_Bus2())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -57,6 +60,7 @@ def C0(*args):
         return lib.Lines_Get_C0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_C0(Value)
 
@@ -68,6 +72,7 @@ def C1(*args):
         return lib.Lines_Get_C1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_C1(Value)
 
@@ -78,6 +83,7 @@ def CMatrix(*args):
         return get_float64_array(lib.Lines_Get_Cmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Lines_Set_Cmatrix(ValuePtr, ValueCount)
@@ -95,6 +101,7 @@ def EmergAmps(*args):
         return lib.Lines_Get_EmergAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_EmergAmps(Value)
 
@@ -111,6 +118,7 @@ def Geometry(*args):
         return get_string(lib.Lines_Get_Geometry())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -125,6 +133,7 @@ def Length(*args):
         return lib.Lines_Get_Length()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Length(Value)
 
@@ -136,6 +145,7 @@ def LineCode(*args):
         return get_string(lib.Lines_Get_LineCode())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -169,6 +179,7 @@ def NormAmps(*args):
         return lib.Lines_Get_NormAmps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_NormAmps(Value)
 
@@ -190,6 +201,7 @@ def Phases(*args):
         return lib.Lines_Get_Phases()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Phases(Value)
 
@@ -201,6 +213,7 @@ def R0(*args):
         return lib.Lines_Get_R0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_R0(Value)
 
@@ -212,6 +225,7 @@ def R1(*args):
         return lib.Lines_Get_R1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_R1(Value)
 
@@ -223,6 +237,7 @@ def Rg(*args):
         return lib.Lines_Get_Rg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Rg(Value)
 
@@ -234,6 +249,7 @@ def Rho(*args):
         return lib.Lines_Get_Rho()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Rho(Value)
 
@@ -245,6 +261,7 @@ def RMatrix(*args):
         return get_float64_array(lib.Lines_Get_Rmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Lines_Set_Rmatrix(ValuePtr, ValueCount)
@@ -257,6 +274,7 @@ def Spacing(*args):
         return get_string(lib.Lines_Get_Spacing())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -275,6 +293,7 @@ def Units(*args):
         return lib.Lines_Get_Units()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Units(Value)
 
@@ -286,6 +305,7 @@ def X0(*args):
         return lib.Lines_Get_X0()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_X0(Value)
 
@@ -297,6 +317,7 @@ def X1(*args):
         return lib.Lines_Get_X1()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_X1(Value)
 
@@ -308,6 +329,7 @@ def Xg(*args):
         return lib.Lines_Get_Xg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Lines_Set_Xg(Value)
 
@@ -318,6 +340,7 @@ def XMatrix(*args):
         return get_float64_array(lib.Lines_Get_Xmatrix)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Lines_Set_Xmatrix(ValuePtr, ValueCount)
@@ -330,6 +353,7 @@ def Yprim(*args):
         return get_float64_array(lib.Lines_Get_Yprim)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Lines_Set_Yprim(ValuePtr, ValueCount)
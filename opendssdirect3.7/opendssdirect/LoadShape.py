@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def New(Name):
@@ -43,6 +44,7 @@ def HrInterval(*args):
         return lib.LoadShapes_Get_HrInterval()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_HrInterval(Value)
 
@@ -54,6 +56,7 @@ def MinInterval(*args):
         return lib.LoadShapes_Get_MinInterval()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_MinInterval(Value)
 
@@ -90,6 +93,7 @@ def Npts(*args):
         return lib.LoadShapes_Get_Npts()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_Npts(Value)
 
@@ -100,6 +104,7 @@ def PBase(*args):
         return lib.LoadShapes_Get_PBase()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_PBase(Value)
 
@@ -114,6 +119,7 @@ def PMult(*args):
         return get_float64_array(lib.LoadShapes_Get_Pmult)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LoadShapes_Set_Pmult(ValuePtr, ValueCount)
@@ -126,6 +132,7 @@ def QBase(*args):
         return lib.LoadShapes_Get_Qbase()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_Qbase(Value)
 
@@ -137,6 +144,7 @@ def QMult(*args):
         return get_float64_array(lib.LoadShapes_Get_Qmult)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LoadShapes_Set_Qmult(ValuePtr, ValueCount)
@@ -149,6 +157,7 @@ def TimeArray(*args):
         return get_float64_array(lib.LoadShapes_Get_TimeArray)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.LoadShapes_Set_TimeArray(ValuePtr, ValueCount)
@@ -161,6 +170,7 @@ def UseActual(*args):
         return lib.LoadShapes_Get_UseActual() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_UseActual(Value)
 
@@ -171,6 +181,7 @@ def SInterval(*args):
         return lib.LoadShapes_Get_sInterval()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.LoadShapes_Set_Sinterval(Value)
 
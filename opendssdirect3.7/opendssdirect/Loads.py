@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -22,6 +23,7 @@ def AllocationFactor(*args):
         return lib.Loads_Get_AllocationFactor()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_AllocationFactor(Value)
 
@@ -33,6 +35,7 @@ def CVRCurve(*args):
         return get_string(lib.Loads_Get_CVRcurve())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -47,6 +50,7 @@ def CVRvars(*args):
         return lib.Loads_Get_CVRvars()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_CVRvars(Value)
 
@@ -58,6 +62,7 @@ def CVRwatts(*args):
         return lib.Loads_Get_CVRwatts()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_CVRwatts(Value)
 
@@ -69,6 +74,7 @@ def CFactor(*args):
         return lib.Loads_Get_Cfactor()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Cfactor(Value)
 
@@ -79,6 +85,7 @@ def Class(*args):
         return lib.Loads_Get_Class_()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Class_(Value)
 
@@ -100,6 +107,7 @@ def Growth(*args):
         return get_string(lib.Loads_Get_Growth())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -114,6 +122,7 @@ def IsDelta(*args):
         return lib.Loads_Get_IsDelta() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_IsDelta(Value)
 
@@ -125,6 +134,7 @@ def Model(*args):
         return lib.Loads_Get_Model()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Model(Value)
 
@@ -155,6 +165,7 @@ def NumCust(*args):
         return lib.Loads_Get_NumCust()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_NumCust(Value)
 
@@ -169,6 +180,7 @@ def PF(*args):
         return lib.Loads_Get_PF()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_PF(Value)
 
@@ -180,6 +192,7 @@ def PctMean(*args):
         return lib.Loads_Get_PctMean()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_PctMean(Value)
 
@@ -191,6 +204,7 @@ def PctStdDev(*args):
         return lib.Loads_Get_PctStdDev()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_PctStdDev(Value)
 
@@ -202,6 +216,7 @@ def RelWeighting(*args):
         return lib.Loads_Get_RelWeight()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_RelWeight(Value)
 
@@ -213,6 +228,7 @@ def Rneut(*args):
         return lib.Loads_Get_Rneut()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Rneut(Value)
 
@@ -224,6 +240,7 @@ def Spectrum(*args):
         return get_string(lib.Loads_Get_Spectrum())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -238,6 +255,7 @@ def Status(*args):
         return lib.Loads_Get_Status()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Status(Value)
 
@@ -249,6 +267,7 @@ def Vmaxpu(*args):
         return lib.Loads_Get_Vmaxpu()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Vmaxpu(Value)
 
@@ -260,6 +279,7 @@ def VminEmerg(*args):
         return lib.Loads_Get_Vminemerg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Vminemerg(Value)
 
@@ -271,6 +291,7 @@ def VminNorm(*args):
         return lib.Loads_Get_Vminnorm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Vminnorm(Value)
 
@@ -282,6 +303,7 @@ def Vminpu(*args):
         return lib.Loads_Get_Vminpu()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Vminpu(Value)
 
@@ -293,6 +315,7 @@ def Xneut(*args):
         return lib.Loads_Get_Xneut()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_Xneut(Value)
 
@@ -304,6 +327,7 @@ def Yearly(*args):
         return get_string(lib.Loads_Get_Yearly())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -322,6 +346,7 @@ def ZipV(*args):
         return result
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Loads_Set_ZIPV(ValuePtr, ValueCount)
@@ -334,6 +359,7 @@ def Daily(*args):
         return get_string(lib.Loads_Get_daily())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -348,6 +374,7 @@ def Duty(*args):
         return get_string(lib.Loads_Get_duty())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -372,6 +399,7 @@ def kV(*args):
         return lib.Loads_Get_kV()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kV(Value)
 
@@ -383,6 +411,7 @@ def kW(*args):
         return lib.Loads_Get_kW()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kW(Value)
 
@@ -394,6 +423,7 @@ def kVABase(*args):
         return lib.Loads_Get_kva()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kva(Value)
 
@@ -405,6 +435,7 @@ def kvar(*args):
         return lib.Loads_Get_kvar()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kvar(Value)
 
@@ -416,6 +447,7 @@ def kWh(*args):
         return lib.Loads_Get_kwh()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kwh(Value)
 
@@ -427,6 +459,7 @@ def kWhDays(*args):
         return lib.Loads_Get_kwhdays()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_kwhdays(Value)
 
@@ -438,6 +471,7 @@ def puSeriesRL(*args):
         return lib.Loads_Get_pctSeriesRL()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_pctSeriesRL(Value)
 
@@ -449,6 +483,7 @@ def XfkVA(*args):
         return lib.Loads_Get_xfkVA()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Loads_Set_xfkVA(Value)
 
@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def CloseAllDIFiles():
@@ -72,6 +73,7 @@ def AllocFactors(*args):
         return get_float64_array(lib.Meters_Get_AllocFactors)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Meters_Set_AllocFactors(ValuePtr, ValueCount)
@@ -89,6 +91,7 @@ def CalcCurrent(*args):
         return get_float64_array(lib.Meters_Get_CalcCurrent)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Meters_Set_CalcCurrent(ValuePtr, ValueCount)
@@ -136,6 +139,7 @@ def MeteredElement(*args):
         return get_string(lib.Meters_Get_MeteredElement())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -150,6 +154,7 @@ def MeteredTerminal(*args):
         return lib.Meters_Get_MeteredTerminal()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Meters_Set_MeteredTerminal(Value)
 
@@ -207,6 +212,7 @@ def PeakCurrent(*args):
         return get_float64_array(lib.Meters_Get_Peakcurrent)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Meters_Set_Peakcurrent(ValuePtr, ValueCount)
@@ -259,6 +265,7 @@ def SequenceList(*args):
         return lib.Meters_Get_SequenceIndex()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Meters_Set_SequenceIndex(Value)
 
@@ -8,6 +8,7 @@ from ._utils import (
     get_int8_array,
     codec,
 )
+from ._utils import columns_cache
 
 def Channel(Index):
     """(read-only) Array of doubles for the specified channel  (usage: MyArray = DSSMonitor.Channel(i)) A Save or SaveAll  should be executed first. Done automatically by most standard solution modes."""
@@ -80,6 +81,7 @@ def Element(*args):
         return result
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -114,6 +116,7 @@ def Mode(*args):
         return lib.Monitors_Get_Mode()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Monitors_Set_Mode(Value)
 
@@ -159,6 +162,7 @@ def Terminal(*args):
         return lib.Monitors_Get_Terminal()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Monitors_Set_Terminal(Value)
 
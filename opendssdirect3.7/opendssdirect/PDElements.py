@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
-from ._utils import lib, get_string
+from ._utils import Float64Buffer, lib, get_string, get_string_array, get_float64_array, get_int32_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AccumulatedL():
@@ -9,6 +10,32 @@ def AccumulatedL():
     return lib.PDElements_Get_AccumulatedL()
 
 
+def AllNames():
+    """(read-only) Array of strings containing the full names of all PD elements (including disabled elements)"""
+    return get_string_array(lib.PDElements_Get_AllNames)
+
+
+_AllCurrents = Float64Buffer(lib.PDElements_Get_AllCurrents)
+
+
+def AllCurrents():
+    """(read-only) Complex array of currents for all conductors of all terminals, for each PD element (in AllNames order). Disabled elements are returned as zeros."""
+    if Float64Buffer.enabled:
+        return _AllCurrents()
+
+    return get_float64_array(lib.PDElements_Get_AllCurrents)
+
+
+def AllNumConductors():
+    """(read-only) Number of conductors per terminal for each PD element (in AllNames order)"""
+    return get_int32_array(lib.PDElements_Get_AllNumConductors)
+
+
+def AllNumTerminals():
+    """(read-only) Number of terminals for each PD element (in AllNames order)"""
+    return get_int32_array(lib.PDElements_Get_AllNumTerminals)
+
+
 def Count():
     """(read-only) Number of PD elements (including disabled elements)"""
     return lib.PDElements_Get_Count()
@@ -21,6 +48,7 @@ def FaultRate(*args):
         return lib.PDElements_Get_FaultRate()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PDElements_Set_FaultRate(Value)
 
@@ -81,6 +109,7 @@ def RepairTime(*args):
         return lib.PDElements_Get_RepairTime()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PDElements_Set_RepairTime(Value)
 
@@ -107,6 +136,7 @@ def PctPermanent(*args):
         return lib.PDElements_Get_pctPermanent()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PDElements_Set_pctPermanent(Value)
 
@@ -128,6 +158,10 @@ _columns = [
 ]
 __all__ = [
     "AccumulatedL",
+    "AllNames",
+    "AllCurrents",
+    "AllNumConductors",
+    "AllNumTerminals",
     "Count",
     "FaultRate",
     "First",
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array, get_float64_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -29,6 +30,7 @@ def Irradiance(*args):
         return lib.PVSystems_Get_Irradiance()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PVSystems_Set_Irradiance(Value)
 
@@ -65,6 +67,7 @@ def pf(*args):
         return lib.PVSystems_Get_PF()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PVSystems_Set_PF(Value)
 
@@ -103,6 +106,7 @@ def kVARated(*args):
         return lib.PVSystems_Get_kVArated()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PVSystems_Set_kVArated(Value)
 
@@ -122,6 +126,7 @@ def kvar(*args):
         return lib.PVSystems_Get_kvar()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.PVSystems_Set_kvar(Value)
 
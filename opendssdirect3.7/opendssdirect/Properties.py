@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Description():
@@ -51,6 +52,7 @@ def Value(*args):
         Value = Value.encode(codec)
 
     _setCurrentProperty(argIndex_or_Name)
+    columns_cache.clear()
     lib.DSSProperty_Set_Val(Value)
 
 
@@ -2,13 +2,16 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array, get_float64_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Close():
+    columns_cache.clear()
     lib.Reclosers_Close()
 
 
 def Open():
+    columns_cache.clear()
     lib.Reclosers_Open()
 
 
@@ -37,6 +40,7 @@ def GroundInst(*args):
         return lib.Reclosers_Get_GroundInst()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_GroundInst(Value)
 
@@ -48,6 +52,7 @@ def GroundTrip(*args):
         return lib.Reclosers_Get_GroundTrip()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_GroundTrip(Value)
 
@@ -62,6 +67,7 @@ def MonitoredObj(*args):
         return get_string(lib.Reclosers_Get_MonitoredObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -76,6 +82,7 @@ def MonitoredTerm(*args):
         return lib.Reclosers_Get_MonitoredTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_MonitoredTerm(Value)
 
@@ -106,6 +113,7 @@ def NumFast(*args):
         return lib.Reclosers_Get_NumFast()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_NumFast(Value)
 
@@ -117,6 +125,7 @@ def PhaseInst(*args):
         return lib.Reclosers_Get_PhaseInst()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_PhaseInst(Value)
 
@@ -131,6 +140,7 @@ def PhaseTrip(*args):
         return lib.Reclosers_Get_PhaseTrip()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_PhaseTrip(Value)
 
@@ -147,6 +157,7 @@ def Shots(*args):
         return lib.Reclosers_Get_Shots()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_Shots(Value)
 
@@ -158,6 +169,7 @@ def SwitchedObj(*args):
         return get_string(lib.Reclosers_Get_SwitchedObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -172,6 +184,7 @@ def SwitchedTerm(*args):
         return lib.Reclosers_Get_SwitchedTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Reclosers_Set_SwitchedTerm(Value)
 
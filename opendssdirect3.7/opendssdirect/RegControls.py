@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Reset():
@@ -20,6 +21,7 @@ def CTPrimary(*args):
         return lib.RegControls_Get_CTPrimary()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_CTPrimary(Value)
 
@@ -36,6 +38,7 @@ def Delay(*args):
         return lib.RegControls_Get_Delay()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_Delay(Value)
 
@@ -52,6 +55,7 @@ def ForwardBand(*args):
         return lib.RegControls_Get_ForwardBand()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ForwardBand(Value)
 
@@ -63,6 +67,7 @@ def ForwardR(*args):
         return lib.RegControls_Get_ForwardR()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ForwardR(Value)
 
@@ -74,6 +79,7 @@ def ForwardVreg(*args):
         return lib.RegControls_Get_ForwardVreg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ForwardVreg(Value)
 
@@ -85,6 +91,7 @@ def ForwardX(*args):
         return lib.RegControls_Get_ForwardX()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ForwardX(Value)
 
@@ -96,6 +103,7 @@ def IsInverseTime(*args):
         return lib.RegControls_Get_IsInverseTime() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_IsInverseTime(Value)
 
@@ -107,6 +115,7 @@ def IsReversible(*args):
         return lib.RegControls_Get_IsReversible() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_IsReversible(Value)
 
@@ -118,6 +127,7 @@ def MaxTapChange(*args):
         return lib.RegControls_Get_MaxTapChange()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_MaxTapChange(Value)
 
@@ -129,6 +139,7 @@ def MonitoredBus(*args):
         return get_string(lib.RegControls_Get_MonitoredBus())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -165,6 +176,7 @@ def PTRatio(*args):
         return lib.RegControls_Get_PTratio()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_PTratio(Value)
 
@@ -176,6 +188,7 @@ def ReverseBand(*args):
         return lib.RegControls_Get_ReverseBand()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ReverseBand(Value)
 
@@ -187,6 +200,7 @@ def ReverseR(*args):
         return lib.RegControls_Get_ReverseR()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ReverseR(Value)
 
@@ -198,6 +212,7 @@ def ReverseVreg(*args):
         return lib.RegControls_Get_ReverseVreg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ReverseVreg(Value)
 
@@ -209,6 +224,7 @@ def ReverseX(*args):
         return lib.RegControls_Get_ReverseX()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_ReverseX(Value)
 
@@ -220,6 +236,7 @@ def TapDelay(*args):
         return lib.RegControls_Get_TapDelay()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_TapDelay(Value)
 
@@ -231,6 +248,7 @@ def TapNumber(*args):
         return lib.RegControls_Get_TapNumber()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_TapNumber(Value)
 
@@ -242,6 +260,7 @@ def TapWinding(*args):
         return lib.RegControls_Get_TapWinding()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_TapWinding(Value)
 
@@ -253,6 +272,7 @@ def Transformer(*args):
         return get_string(lib.RegControls_Get_Transformer())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -267,6 +287,7 @@ def VoltageLimit(*args):
         return lib.RegControls_Get_VoltageLimit()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_VoltageLimit(Value)
 
@@ -278,6 +299,7 @@ def Winding(*args):
         return lib.RegControls_Get_Winding()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.RegControls_Set_Winding(Value)
 
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -26,6 +27,7 @@ def MonitoredObj(*args):
         return get_string(lib.Relays_Get_MonitoredObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -40,6 +42,7 @@ def MonitoredTerm(*args):
         return lib.Relays_Get_MonitoredTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Relays_Set_MonitoredTerm(Value)
 
@@ -73,6 +76,7 @@ def SwitchedObj(*args):
         return get_string(lib.Relays_Get_SwitchedObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -87,6 +91,7 @@ def SwitchedTerm(*args):
         return lib.Relays_Get_SwitchedTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Relays_Set_SwitchedTerm(Value)
 
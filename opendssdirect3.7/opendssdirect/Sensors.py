@@ -8,6 +8,7 @@ from ._utils import (
     prepare_float64_array,
 )
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Reset():
@@ -35,6 +36,7 @@ def Currents(*args):
         return get_float64_array(lib.Sensors_Get_Currents)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Sensors_Set_Currents(ValuePtr, ValueCount)
@@ -52,6 +54,7 @@ def IsDelta(*args):
         return lib.Sensors_Get_IsDelta() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_IsDelta(Value)
 
@@ -63,6 +66,7 @@ def MeteredElement(*args):
         return get_string(lib.Sensors_Get_MeteredElement())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -77,6 +81,7 @@ def MeteredTerminal(*args):
         return lib.Sensors_Get_MeteredTerminal()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_MeteredTerminal(Value)
 
@@ -110,6 +115,7 @@ def PctError(*args):
         return lib.Sensors_Get_PctError()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_PctError(Value)
 
@@ -121,6 +127,7 @@ def ReverseDelta(*args):
         return lib.Sensors_Get_ReverseDelta() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_ReverseDelta(Value)
 
@@ -132,6 +139,7 @@ def Weight(*args):
         return lib.Sensors_Get_Weight()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_Weight(Value)
 
@@ -143,6 +151,7 @@ def kvar(*args):
         return get_float64_array(lib.Sensors_Get_kVARS)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Sensors_Set_kVARS(ValuePtr, ValueCount)
@@ -155,6 +164,7 @@ def kVS(*args):
         return get_float64_array(lib.Sensors_Get_kVS)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Sensors_Set_kVS(ValuePtr, ValueCount)
@@ -167,6 +177,7 @@ def kVBase(*args):
         return lib.Sensors_Get_kVbase()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Sensors_Set_kVbase(Value)
 
@@ -178,6 +189,7 @@ def kW(*args):
         return get_float64_array(lib.Sensors_Get_kWS)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.Sensors_Set_kWS(ValuePtr, ValueCount)
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def BuildYMatrix(BuildOption, AllocateVI):
@@ -21,6 +22,7 @@ def Cleanup():
 
 
 def DoControlActions():
+    columns_cache.clear()
     lib.Solution_DoControlActions()
 
 
@@ -37,14 +39,17 @@ def SampleControlDevices():
 
 
 def SampleDoControlActions():
+    columns_cache.clear()
     lib.Solution_Sample_DoControlActions()
 
 
 def Solve():
+    columns_cache.clear()
     lib.Solution_Solve()
 
 
 def SolveDirect():
+    columns_cache.clear()
     lib.Solution_SolveDirect()
 
 
@@ -53,14 +58,17 @@ def SolveNoControl():
 
 
 def SolvePFlow():
+    columns_cache.clear()
     lib.Solution_SolvePflow()
 
 
 def SolvePlusControl():
+    columns_cache.clear()
     lib.Solution_SolvePlusControl()
 
 
 def SolveSnap():
+    columns_cache.clear()
     lib.Solution_SolveSnap()
 
 
@@ -2,9 +2,11 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Reset():
+    columns_cache.clear()
     lib.SwtControls_Reset()
 
 
@@ -15,6 +17,7 @@ def Action(*args):
         return lib.SwtControls_Get_Action()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_Action(Value)
 
@@ -35,6 +38,7 @@ def Delay(*args):
         return lib.SwtControls_Get_Delay()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_Delay(Value)
 
@@ -51,6 +55,7 @@ def IsLocked(*args):
         return lib.SwtControls_Get_IsLocked() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_IsLocked(Value)
 
@@ -84,6 +89,7 @@ def NormalState(*args):
         return lib.SwtControls_Get_NormalState()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_NormalState(Value)
 
@@ -98,6 +104,7 @@ def State(*args):
         return lib.SwtControls_Get_State()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_State(Value)
 
@@ -109,6 +116,7 @@ def SwitchedObj(*args):
         return get_string(lib.SwtControls_Get_SwitchedObj())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -123,6 +131,7 @@ def SwitchedTerm(*args):
         return lib.SwtControls_Get_SwitchedTerm()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.SwtControls_Set_SwitchedTerm(Value)
 
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, CheckForError
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Command(*args):
@@ -11,6 +12,7 @@ def Command(*args):
         return get_string(lib.Text_Get_Command())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
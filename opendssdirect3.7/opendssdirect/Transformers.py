@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -25,6 +26,7 @@ def IsDelta(*args):
         return lib.Transformers_Get_IsDelta() != 0
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_IsDelta(Value)
 
@@ -36,6 +38,7 @@ def MaxTap(*args):
         return lib.Transformers_Get_MaxTap()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_MaxTap(Value)
 
@@ -47,6 +50,7 @@ def MinTap(*args):
         return lib.Transformers_Get_MinTap()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_MinTap(Value)
 
@@ -77,6 +81,7 @@ def NumTaps(*args):
         return lib.Transformers_Get_NumTaps()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_NumTaps(Value)
 
@@ -88,6 +93,7 @@ def NumWindings(*args):
         return lib.Transformers_Get_NumWindings()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_NumWindings(Value)
 
@@ -99,6 +105,7 @@ def R(*args):
         return lib.Transformers_Get_R()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_R(Value)
 
@@ -110,6 +117,7 @@ def Rneut(*args):
         return lib.Transformers_Get_Rneut()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Rneut(Value)
 
@@ -121,6 +129,7 @@ def Tap(*args):
         return lib.Transformers_Get_Tap()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Tap(Value)
 
@@ -143,6 +152,7 @@ def XfmrCode(*args):
         return get_string(lib.Transformers_Get_XfmrCode())
 
     # Setter
+    columns_cache.clear()
     Value, = args
     if type(Value) is not bytes:
         Value = Value.encode(codec)
@@ -157,6 +167,7 @@ def Xhl(*args):
         return lib.Transformers_Get_Xhl()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Xhl(Value)
 
@@ -168,6 +179,7 @@ def Xht(*args):
         return lib.Transformers_Get_Xht()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Xht(Value)
 
@@ -179,6 +191,7 @@ def Xlt(*args):
         return lib.Transformers_Get_Xlt()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Xlt(Value)
 
@@ -190,6 +203,7 @@ def Xneut(*args):
         return lib.Transformers_Get_Xneut()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_Xneut(Value)
 
@@ -201,6 +215,7 @@ def kV(*args):
         return lib.Transformers_Get_kV()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_kV(Value)
 
@@ -212,6 +227,7 @@ def kVA(*args):
         return lib.Transformers_Get_kVA()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Transformers_Set_kVA(Value)
 
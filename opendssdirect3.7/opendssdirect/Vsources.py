@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_string_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def AllNames():
@@ -19,6 +20,7 @@ def AngleDeg(*args):
         return lib.Vsources_Get_AngleDeg()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Vsources_Set_AngleDeg(Value)
 
@@ -30,6 +32,7 @@ def BasekV(*args):
         return lib.Vsources_Get_BasekV()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Vsources_Set_BasekV(Value)
 
@@ -51,6 +54,7 @@ def Frequency(*args):
         return lib.Vsources_Get_Frequency()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Vsources_Set_Frequency(Value)
 
@@ -84,6 +88,7 @@ def Phases(*args):
         return lib.Vsources_Get_Phases()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Vsources_Set_Phases(Value)
 
@@ -98,6 +103,7 @@ def PU(*args):
         return lib.Vsources_Get_pu()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.Vsources_Set_pu(Value)
 
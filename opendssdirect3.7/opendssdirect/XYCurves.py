@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 from ._utils import lib, get_string, get_float64_array, prepare_float64_array
 from ._utils import codec
+from ._utils import columns_cache
 
 
 def Count():
@@ -43,6 +44,7 @@ def Npts(*args):
         return lib.XYCurves_Get_Npts()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_Npts(Value)
 
@@ -54,6 +56,7 @@ def XArray(*args):
         return get_float64_array(lib.XYCurves_Get_Xarray)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.XYCurves_Set_Xarray(ValuePtr, ValueCount)
@@ -66,6 +69,7 @@ def XScale(*args):
         return lib.XYCurves_Get_Xscale()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_Xscale(Value)
 
@@ -77,6 +81,7 @@ def XShift(*args):
         return lib.XYCurves_Get_Xshift()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_Xshift(Value)
 
@@ -88,6 +93,7 @@ def YArray(*args):
         return get_float64_array(lib.XYCurves_Get_Yarray)
 
     # Setter
+    columns_cache.clear()
     Value, = args
     Value, ValuePtr, ValueCount = prepare_float64_array(Value)
     lib.XYCurves_Set_Yarray(ValuePtr, ValueCount)
@@ -103,6 +109,7 @@ def YScale(*args):
         return lib.XYCurves_Get_Yscale()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_Yscale(Value)
 
@@ -114,6 +121,7 @@ def YShift(*args):
         return lib.XYCurves_Get_Yshift()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_Yshift(Value)
 
@@ -125,6 +133,7 @@ def X(*args):
         return lib.XYCurves_Get_x()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_x(Value)
 
@@ -139,6 +148,7 @@ def Y(*args):
         return lib.XYCurves_Get_y()
 
     # Setter
+    columns_cache.clear()
     Value, = args
     lib.XYCurves_Set_y(Value)
 
@@ -8,6 +8,7 @@ from ._version import __version__
 from . import dss, utils
 from .dss import (
     run_command,
+    run_commands,
     ActiveClass,
     Basic,
     Bus,
@@ -14,6 +14,11 @@ api_util = dss_py.v7.api_util
 codec = api_util.codec
 CheckForError = dss_py.v7.DSS.CheckForError
 
+# Cache of utils.class_to_columns. Cleared by the functions that change the
+# circuit: the Text commands, the property setters of the elements (not the
+# selection by Name/Idx), switching, and the solutions with control actions
+columns_cache = dict()
+
 # Currently, we prefer the functions that return lists (suffix 2)
 # to keep higher compatibility with previous versions of OpenDSSDirect.py.
 
@@ -25,3 +30,46 @@ get_string_array = api_util.get_string_array2
 prepare_float64_array = api_util.prepare_float64_array
 prepare_int32_array = api_util.prepare_int32_array
 prepare_string_array = api_util.prepare_string_array
+
+
+# Optional numpy mode for the hot getters (see set_numpy_buffers). The
+# engine fills the same allocation on every call of a getter, as long as
+# the size does not grow, and the values are copied into a float64 array
+# owned by the getter. No list is built and no array is allocated per call.
+
+
+class Float64Buffer(object):
+    """Reused result buffers of one float64 array getter of the engine"""
+
+    enabled = False
+
+    def __init__(self, func):
+        self.func = func
+        self.ptr = ffi.new("double**")
+        self.cnt = ffi.new("int32_t[4]")
+        self.array = np.zeros(0, dtype=np.float64)
+
+    def __call__(self, *args):
+        self.func(self.ptr, self.cnt, *args)
+        count = self.cnt[0]
+        if count != len(self.array):
+            self.array = np.empty(count, dtype=np.float64)
+        if count:
+            ffi.memmove(ffi.from_buffer(self.array), self.ptr[0], count * 8)
+        return self.array
+
+
+def set_numpy_buffers(enable=True):
+    """
+    Enable/disable the numpy mode of the hot getters (CktElement.Voltages,
+    CktElement.Currents, CktElement.Powers, Circuit.YNodeVArray and
+    PDElements.AllCurrents). In numpy mode they return float64 arrays that
+    are overwritten by the next call of the same getter: copy the array to
+    keep the values.
+    """
+    Float64Buffer.enabled = bool(enable)
+
+
+def numpy_buffers():
+    """Return True if the numpy mode of the hot getters is enabled"""
+    return Float64Buffer.enabled
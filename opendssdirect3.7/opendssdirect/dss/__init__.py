@@ -1,7 +1,7 @@
 from __future__ import absolute_import
 from .._utils import lib as dss_lib
 from .._utils import ffi as dss_ffi
-from ..utils import run_command
+from ..utils import run_command, run_commands
 from .. import ActiveClass
 from .. import Basic
 from .. import Bus
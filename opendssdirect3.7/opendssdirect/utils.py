@@ -3,7 +3,10 @@ from __future__ import absolute_import
 import inspect
 import warnings
 
-from ._utils import get_string
+import numpy as np
+
+from ._utils import lib, ffi, codec, get_string, set_numpy_buffers, numpy_buffers
+from ._utils import columns_cache
 
 is_pandas_installed = True
 
@@ -32,11 +35,17 @@ class Iterator(object):
                 break
 
 
+# Cache of class_to_columns, cleared by run_command, clear_columns_cache and
+# the functions of the other modules that change the circuit
+_columns_cache = columns_cache
+
+
 def run_command(text, dss=None):
     """Use Text interface of OpenDSS"""
     if dss is None:
         import opendssdirect as dss
 
+    _columns_cache.clear()
     r = []
     for l in text.splitlines():
         dss.dss_lib.Text_Set_Command(l.encode("ascii"))
@@ -45,6 +54,63 @@ def run_command(text, dss=None):
     return "\n".join(r).strip()
 
 
+def run_commands(commands, dss=None, stop_on_error=False):
+    """
+    Run a list (or any iterable) of commands through the Text interface of
+    OpenDSS with as few engine calls as possible. Multi-line strings are
+    split into lines, as in run_command.
+
+    The lines are sent in blocks (Text_CommandArray). The engine stops a
+    block at the first line reporting an error, warnings included (e.g. 266,
+    an element redefined), and the rest of the block is sent again from the
+    next line, without encoding it again. A block never contains the same
+    line twice, so the failing line is always identified by its text.
+
+    Warnings never stop the run, not even with `stop_on_error`.
+
+    Returns a list with an (index, command, error number, error description)
+    tuple for each failed line, warnings included, empty if all the lines
+    succeeded
+    """
+    if dss is None:
+        import opendssdirect as dss
+
+    _columns_cache.clear()
+    lines = [l for text in commands for l in text.splitlines()]
+    errors = []
+
+    # discard an error left by a previous call
+    dss.dss_lib.Error_Get_Number()
+
+    start = 0
+    while start < len(lines):
+        position = dict()
+        end = start
+        while end < len(lines) and lines[end] not in position:
+            position[lines[end]] = end
+            end += 1
+
+        encoded = [ffi.new("char[]", l.encode(codec)) for l in lines[start:end]]
+        block = ffi.new("char*[]", encoded)
+        first = start
+        while first < end:
+            dss.dss_lib.Text_CommandArray(block + (first - start), end - first)
+            number = dss.dss_lib.Error_Get_Number()
+            if number == 0:
+                break
+
+            failed = position[get_string(dss.dss_lib.Text_Get_Command())]
+            description = get_string(dss.dss_lib.Error_Get_Description())
+            errors.append((failed, lines[failed], number, description))
+            if stop_on_error and not description.startswith("Warning"):
+                return errors
+            first = failed + 1
+
+        start = end
+
+    return errors
+
+
 def to_dataframe(module):
     data = dict()
 
@@ -97,7 +163,22 @@ def _clean_data(data, class_name):
     return data
 
 
-def class_to_dataframe(class_name, dss=None, transform_string=None, clean_data=None):
+def class_to_dataframe(class_name, dss=None, transform_string=None, clean_data=None, properties=None, columnar=False):
+
+    if columnar:
+        # one read per property for all the elements, see class_to_columns
+        columns = class_to_columns(class_name, properties, dss, transform_string)
+        index = [
+            "{class_name}.{element}".format(class_name=class_name, element=element)
+            for element in columns.pop("name")
+        ]
+        if is_pandas_installed:
+            return pd.DataFrame(columns, index=index)
+        else:
+            warnings.warn(
+                "Pandas is not installed. Please see documentation for how to install extra dependencies."
+            )
+            return columns
 
     if transform_string is None:
         transform_string = _evaluate_expression
@@ -144,6 +225,181 @@ def class_to_dataframe(class_name, dss=None, transform_string=None, clean_data=N
         return data
 
 
+def clear_columns_cache():
+    """Discard the columns cached by class_to_columns"""
+    _columns_cache.clear()
+
+
+def _batch_strings(batch, count, index):
+    """Read property `index` (1-based) of all the elements of a batch as strings"""
+    ptr = ffi.new("char***")
+    cnt = ffi.new("int32_t[4]")
+    lib.Batch_GetAsString(ptr, cnt, batch, count, index)
+    res = [ffi.string(ptr[0][i]).decode(codec) for i in range(cnt[0])]
+    lib.DSS_Dispose_PPAnsiChar(ptr, cnt[1])
+    return res
+
+
+def _to_column(strings, transform_string=None):
+    """Convert the strings of a property to a typed numpy column"""
+    try:
+        return np.array(strings, dtype=np.float64)
+    except ValueError:
+        pass
+
+    lower = set(x.lower() for x in strings)
+    if lower and lower <= {"true", "false"}:
+        return np.array([x.lower() == "true" for x in strings], dtype=bool)
+
+    if transform_string is None:
+        return np.array(strings, dtype=str)
+
+    column = np.empty(len(strings), dtype=object)
+    for i, x in enumerate(strings):
+        column[i] = transform_string(x)
+    return column
+
+
+def class_to_columns(class_name, properties=None, dss=None, transform_string=None, cache=True):
+    """
+    Read the properties of all the elements of a class into numpy columns.
+    Each property is read for all the elements at once (Batch API), and the
+    column is float64 if all the values are numbers, bool if all the values
+    are true/false, and str otherwise (or object, with the values returned
+    by `transform_string`, if given).
+
+    The result is cached until the circuit changes: a command, a property
+    setter of the element modules, switching, a solution with control
+    actions, an ElementBatch or clear_columns_cache. Changes made through
+    dss_lib directly are not tracked: call clear_columns_cache after them.
+    The cached columns are shared by the callers, so they are read-only:
+    copy a column before changing it.
+
+    Returns a dict with the element names ("name") and one column per property
+    """
+    if dss is None:
+        import opendssdirect as dss
+
+    if transform_string is not None and not callable(transform_string):
+        raise TypeError(
+            "The `transform_string` must be a callable. Please check the documentation or contact the developer."
+        )
+
+    dss.Circuit.SetActiveClass("{class_name}".format(class_name=class_name))
+    if class_name.lower() != dss.ActiveClass.ActiveClassName().lower():
+        raise NotImplementedError(
+            "`{class_name}` is not supported by the `class_to_columns` interface, please contact the developer for more information.".format(
+                class_name=class_name
+            )
+        )
+
+    ctx = lib.ctx_Get_Prime()
+    key = (
+        int(ffi.cast("uintptr_t", ctx)),
+        class_name.lower(),
+        None if properties is None else tuple(p.lower() for p in properties),
+        transform_string,
+    )
+    if cache and key in _columns_cache:
+        return dict(_columns_cache[key])
+
+    names = dss.ActiveClass.AllNames()
+    if len(names) == 0:
+        warnings.warn("Empty element type ({class_name})".format(class_name=class_name))
+        return {"name": np.array([], dtype=str)}
+
+    dss.ActiveClass.Name(names[0])
+    allProperties = dss.Element.AllPropertyNames()
+    index = {n.lower(): i + 1 for i, n in enumerate(allProperties)}
+    if properties is None:
+        properties = allProperties
+    for n in properties:
+        if n.lower() not in index:
+            raise ValueError(
+                "`{n}` is not a property of `{class_name}`".format(n=n, class_name=class_name)
+            )
+
+    columns = {"name": np.array(names, dtype=str)}
+    bptr = ffi.new("void***")
+    bcnt = ffi.new("int32_t[4]")
+    lib.Batch_CreateByClassS(ctx, bptr, bcnt, class_name.encode(codec))
+    try:
+        for n in properties:
+            strings = _batch_strings(bptr[0], bcnt[0], index[n.lower()])
+            columns[n] = _to_column(strings, transform_string)
+    finally:
+        lib.Batch_Dispose(bptr[0])
+
+    if cache:
+        for column in columns.values():
+            column.setflags(write=False)
+        _columns_cache[key] = columns
+    return dict(columns)
+
+
+class ElementBatch(object):
+    """
+    A fixed list of elements of a class (Batch API), to set a property of all
+    the elements with one engine call, as in
+
+        batch = ElementBatch("Load", [3, 1, 5])
+        batch.set_float64("kW", [10.0, 20.0, 30.0])
+
+    The elements are given by their 1-based index in the class (e.g. Loads.Idx),
+    all of them if None, and the batch keeps that order. The batch belongs to the
+    circuit of the engine context active at creation: create it again after
+    elements of the class are removed, and call dispose when done.
+    """
+
+    def __init__(self, class_name, indexes=None):
+        ctx = lib.ctx_Get_Prime()
+        self.pointer = ffi.new("void***")
+        self.count = ffi.new("int32_t[4]")
+        if indexes is None:
+            lib.Batch_CreateByClassS(ctx, self.pointer, self.count, class_name.encode(codec))
+            return
+
+        self._indexes = np.ascontiguousarray(indexes, dtype=np.int32)
+        lib.Batch_CreateByIndexS(
+            ctx,
+            self.pointer,
+            self.count,
+            class_name.encode(codec),
+            ffi.cast("int32_t*", self._indexes.ctypes.data),
+            len(self._indexes),
+        )
+        if self.count[0] != len(self._indexes):
+            self.dispose()
+            raise ValueError(
+                "Invalid `{class_name}` element indexes: {n} elements found of {m}".format(
+                    class_name=class_name, n=self.count[0], m=len(self._indexes)
+                )
+            )
+
+    def __len__(self):
+        return 0 if self.pointer is None else self.count[0]
+
+    def set_float64(self, name, values):
+        """Set the float property `name` of each element to the value at the same position"""
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.shape != (len(self),):
+            raise ValueError("Number of values must match: {} (expected {})".format(values.shape, len(self)))
+        if len(self) == 0:
+            return
+
+        _columns_cache.clear()
+        lib.Batch_SetFloat64ArrayS(
+            self.pointer[0], self.count[0], name.encode(codec), ffi.cast("double*", values.ctypes.data)
+        )
+
+    def dispose(self):
+        """Release the batch. The elements are not affected"""
+        if self.pointer is not None:
+            if self.pointer[0] != ffi.NULL:
+                lib.Batch_Dispose(self.pointer[0])
+            self.pointer = None
+
+
 def _evaluate_expression(string):
 
     if "[" in string and "]" in string: